@@ -10,6 +10,7 @@ import types
 
 from contracts import TL_Blacklist
 from contracts.utils import EnvUtils
+from tz1and_contracts_smartpy.utils import Utils
 
 
 #########
@@ -85,6 +86,11 @@ t_adhoc_operator_permission = sp.TRecord(
     operator=sp.TAddress, token_id=sp.TNat
 ).layout(("operator", "token_id"))
 
+# Adhoc operators are bucketed per block level and owner.
+t_adhoc_operator_bucket_key = sp.TRecord(
+    level=sp.TNat, owner=sp.TAddress
+).layout(("level", "owner"))
+
 t_adhoc_operator_params = sp.TVariant(
     add_adhoc_operators = sp.TSet(t_adhoc_operator_permission),
     clear_adhoc_operators = sp.TUnit
@@ -151,8 +157,12 @@ class NoTransfer:
         self.name = "no-transfer"
         self.supports_transfer = False
         self.supports_operator = False
+        self.supports_batch_check = False
+
+    def check_batch_transfer_permissions(self, contract, addresses):
+        pass
 
-    def check_tx_transfer_permissions(self, contract, from_, to_, token_id):
+    def check_tx_transfer_permissions(self, contract, from_, to_, token_id, batch_checked=False):
         pass
 
     def check_operator_add_permissions(self, contract, operator_permission):
@@ -173,8 +183,12 @@ class OwnerTransfer:
         self.name = "owner-transfer"
         self.supports_transfer = True
         self.supports_operator = False
+        self.supports_batch_check = False
 
-    def check_tx_transfer_permissions(self, contract, from_, to_, token_id):
+    def check_batch_transfer_permissions(self, contract, addresses):
+        pass
+
+    def check_tx_transfer_permissions(self, contract, from_, to_, token_id, batch_checked=False):
         sp.verify(sp.sender == from_, "FA2_NOT_OWNER")
 
     def check_operator_add_permissions(self, contract, operator_permission):
@@ -200,11 +214,15 @@ class OwnerOrOperatorTransfer:
         self.name = "owner-or-operator-transfer"
         self.supports_transfer = True
         self.supports_operator = True
+        self.supports_batch_check = False
         contract.update_initial_storage(
             operators=sp.big_map(tkey=t_operator_permission, tvalue=sp.TUnit)
         )
 
-    def check_tx_transfer_permissions(self, contract, from_, to_, token_id):
+    def check_batch_transfer_permissions(self, contract, addresses):
+        pass
+
+    def check_tx_transfer_permissions(self, contract, from_, to_, token_id, batch_checked=False):
         sp.verify(
             (sp.sender == from_)
             | contract.data.operators.contains(
@@ -236,6 +254,12 @@ class OwnerOrOperatorAdhocTransfer:
     They are supposed to apply only to the current operation group.
     They are only valid in the current block level.
 
+    Adhoc operators are stored in a big_map bucket per block level and
+    owner, each owner can have up to 100 adhoc operators per level.
+    Only the buckets of the last level adhoc operators were added in are
+    kept, they are removed when operators are added in a new level.
+    Transfers only load the bucket of `from_` in the current level.
+
     By default, adhoc operators aren't checked in the is_operator view.
 
     For long-lasting operators, use standard operators.
@@ -252,9 +276,12 @@ class OwnerOrOperatorAdhocTransfer:
         self.name = "owner-or-operator-transfer"
         self.supports_transfer = True
         self.supports_operator = True
+        self.supports_batch_check = False
         contract.update_initial_storage(
             operators=sp.big_map(tkey=t_operator_permission, tvalue=sp.TUnit),
-            adhoc_operators = sp.set(t = sp.TBytes)
+            adhoc_operators = sp.big_map(tkey=t_adhoc_operator_bucket_key, tvalue=sp.TSet(sp.TBytes)),
+            adhoc_operators_owners = sp.big_map(tkey=sp.TNat, tvalue=sp.TSet(sp.TAddress)),
+            adhoc_operators_level = sp.nat(0)
         )
 
         # Add make_adhoc_operator_key to contract.
@@ -275,6 +302,23 @@ class OwnerOrOperatorAdhocTransfer:
 
         contract.make_adhoc_operator_key = types.MethodType(make_adhoc_operator_key, contract)
 
+        # Add is_adhoc_operator to contract.
+        def is_adhoc_operator(self, owner, operator, token_id):
+            return self.data.adhoc_operators.get(sp.record(level=sp.level, owner=owner),
+                sp.set(t=sp.TBytes)).contains(self.make_adhoc_operator_key(owner, operator, token_id))
+
+        contract.is_adhoc_operator = types.MethodType(is_adhoc_operator, contract)
+
+        # Add remove_adhoc_operator_buckets to contract.
+        def remove_adhoc_operator_buckets(self):
+            # Remove all buckets of the last level adhoc operators were added in.
+            with sp.for_("owner", self.data.adhoc_operators_owners.get(
+                self.data.adhoc_operators_level, sp.set(t=sp.TAddress)).elements()) as owner:
+                del self.data.adhoc_operators[sp.record(level=self.data.adhoc_operators_level, owner=owner)]
+            del self.data.adhoc_operators_owners[self.data.adhoc_operators_level]
+
+        contract.remove_adhoc_operator_buckets = types.MethodType(remove_adhoc_operator_buckets, contract)
+
         # Add update_adhoc_operators entrypoint to contract.
         def update_adhoc_operators(self, params):
             # Supports add_adhoc_operators, and clear_adhoc_operators.
@@ -282,42 +326,52 @@ class OwnerOrOperatorAdhocTransfer:
 
             with params.match_cases() as arg:
                 with arg.match("add_adhoc_operators") as updates:
-                    num_additions = sp.compute(sp.len(updates))
-                    sp.verify(num_additions <= 100, "ADHOC_LIMIT")
-
-                    # Remove as many adhoc operators as we added.
-                    # We do this to make sure the storage diffs aren't lost
-                    # on minting tokens. And to make sure the set doesn't grow larger
-                    # than the adhoc operator limit.
-                    counter = sp.local("counter", sp.nat(0))
-                    with sp.for_("op", self.data.adhoc_operators.elements()) as op:
-                        with sp.if_(counter.value < num_additions):
-                            self.data.adhoc_operators.remove(op)
-                            counter.value += 1
-
-                    # Add adhoc ops from temp set.
+                    sp.verify(sp.len(updates) <= 100, "ADHOC_LIMIT")
+
+                    # Remove the buckets of the previous level adhoc operators
+                    # were added in. This keeps storage bounded to the buckets
+                    # of a single level. The owners of that level are only
+                    # loaded when the level changes.
+                    with sp.if_(self.data.adhoc_operators_level != sp.level):
+                        self.remove_adhoc_operator_buckets()
+                        self.data.adhoc_operators_level = sp.level
+
+                    # Add adhoc ops to the senders bucket of the current level.
+                    bucket_key = sp.compute(sp.record(level=sp.level, owner=sp.sender)) # Sender must be the owner
+                    bucket = sp.local("bucket", self.data.adhoc_operators.get(bucket_key, sp.set(t=sp.TBytes)))
                     with sp.for_("upd", updates.elements()) as upd:
-                        self.data.adhoc_operators.add(self.make_adhoc_operator_key(
-                            sp.sender, # Sender must be the owner
+                        bucket.value.add(self.make_adhoc_operator_key(
+                            sp.sender,
                             upd.operator,
                             upd.token_id))
 
+                    # Make sure the senders bucket doesn't grow larger than the
+                    # adhoc operator limit. Other owners aren't affected.
+                    sp.verify(sp.len(bucket.value) <= 100, "ADHOC_LIMIT")
+                    self.data.adhoc_operators[bucket_key] = bucket.value
+
+                    # Track the owner, so the bucket can be removed.
+                    owners = sp.local("owners", self.data.adhoc_operators_owners.get(sp.level, sp.set(t=sp.TAddress)))
+                    owners.value.add(sp.sender)
+                    self.data.adhoc_operators_owners[sp.level] = owners.value
+
                 with arg.match("clear_adhoc_operators"):
                     # Only admin is allowed to do this.
                     # Otherwise someone could sneakily get storage diffs at
                     # the cost of everyone else.
                     self.onlyAdministrator()
                     # Clear adhoc operators.
-                    self.data.adhoc_operators = sp.set(t = sp.TBytes)
+                    self.remove_adhoc_operator_buckets()
 
         contract.update_adhoc_operators = sp.entry_point(update_adhoc_operators, parameter_type=t_adhoc_operator_params)
 
-    def check_tx_transfer_permissions(self, contract, from_, to_, token_id):
+    def check_batch_transfer_permissions(self, contract, addresses):
+        pass
+
+    def check_tx_transfer_permissions(self, contract, from_, to_, token_id, batch_checked=False):
         sp.verify(
             (sp.sender == from_)
-            | contract.data.adhoc_operators.contains(
-                contract.make_adhoc_operator_key(from_, sp.sender, token_id)
-            )
+            | contract.is_adhoc_operator(from_, sp.sender, token_id)
             | contract.data.operators.contains(
                 sp.record(owner=from_, operator=sp.sender, token_id=token_id)
             ),
@@ -335,8 +389,7 @@ class OwnerOrOperatorAdhocTransfer:
 
     def is_operator(self, contract, operator_permission):
         if self.check_adhoc_in_operator_view:
-            adhoc_key = contract.make_adhoc_operator_key(operator_permission.owner, operator_permission.operator, operator_permission.token_id)
-            return contract.data.adhoc_operators.contains(adhoc_key) | contract.data.operators.contains(operator_permission)
+            return contract.is_adhoc_operator(operator_permission.owner, operator_permission.operator, operator_permission.token_id) | contract.data.operators.contains(operator_permission)
         else:
             return contract.data.operators.contains(operator_permission)
 
@@ -361,6 +414,7 @@ class PauseTransfer:
         self.name = "pauseable-" + self.policy.name
         self.supports_transfer = self.policy.supports_transfer
         self.supports_operator = self.policy.supports_operator
+        self.supports_batch_check = self.policy.supports_batch_check
         contract.update_initial_storage(paused=False)
 
         # Add a set_pause entrypoint
@@ -371,9 +425,12 @@ class PauseTransfer:
 
         contract.set_pause = sp.entry_point(set_pause, lazify=False, parameter_type=sp.TBool)
 
-    def check_tx_transfer_permissions(self, contract, from_, to_, token_id):
+    def check_batch_transfer_permissions(self, contract, addresses):
+        self.policy.check_batch_transfer_permissions(contract, addresses)
+
+    def check_tx_transfer_permissions(self, contract, from_, to_, token_id, batch_checked=False):
         sp.verify(~contract.data.paused, message=sp.pair("FA2_TX_DENIED", "FA2_PAUSED"))
-        self.policy.check_tx_transfer_permissions(contract, from_, to_, token_id)
+        self.policy.check_tx_transfer_permissions(contract, from_, to_, token_id, batch_checked)
 
     def check_operator_add_permissions(self, contract, operator_param):
         sp.verify(
@@ -393,13 +450,13 @@ class PauseTransfer:
         return self.policy.is_operator(contract, operator_param)
 
 
-# TODO: test blacklist transfer!
-
 class BlacklistTransfer:
     """(Transfer Policy) Decorate any policy to add a blacklist mechanism.
 
     Optionally adds a `set_blacklist` entrypoint. Checks that a to/from
-    address is not blacklisted before doing a transfer.
+    address is not blacklisted before doing a transfer. Addresses are
+    checked once per batch in `check_batch_transfer_permissions`, or per
+    tx if the caller didn't do the batch check.
 
     Needs the `Administrable` mixin in order to work if ep is generated.
     """
@@ -418,6 +475,7 @@ class BlacklistTransfer:
         self.name = "blacklist-" + self.policy.name
         self.supports_transfer = self.policy.supports_transfer
         self.supports_operator = self.policy.supports_operator
+        self.supports_batch_check = (not self.dormant) or self.policy.supports_batch_check
         # NOTE: Probably Not needed, blacklist address is compiled into the code.
         #contract.update_initial_storage(blacklist=sp.set_type_expr(self.blacklist_address, sp.TAddress))
 
@@ -430,14 +488,21 @@ class BlacklistTransfer:
 
         #    contract.set_blacklist = sp.entry_point(set_blacklist, lazify=False, parameter_type=sp.TAddress)
 
-    # TODO: this isn't really optimal: calls view for every tx in the transfer. optimise!
-    # + maybe add a check_tx_transfer_permissions_batch or so?
-    def check_tx_transfer_permissions(self, contract, from_, to_, token_id):
+    def check_batch_transfer_permissions(self, contract, addresses):
         if not self.dormant:
-            # Call view to check blacklist. Fails if blacklisted.
+            # Call view once for all addresses in the batch. Fails if blacklisted.
+            print(f"\x1b[35;20mWARNING: Blacklist was awoken!\x1b[0m")
+            sp.compute(TL_Blacklist.checkBlacklisted(self.blacklist_address, addresses).open_some(sp.unit))
+        self.policy.check_batch_transfer_permissions(contract, addresses)
+
+    def check_tx_transfer_permissions(self, contract, from_, to_, token_id, batch_checked=False):
+        # If the caller already passed from_ and to_ to
+        # check_batch_transfer_permissions, don't check them again.
+        # Otherwise fall back to checking them per tx.
+        if not self.dormant and not batch_checked:
             print(f"\x1b[35;20mWARNING: Blacklist was awoken!\x1b[0m")
             sp.compute(TL_Blacklist.checkBlacklisted(self.blacklist_address, sp.set([from_, to_])).open_some(sp.unit))
-        self.policy.check_tx_transfer_permissions(contract, from_, to_, token_id)
+        self.policy.check_tx_transfer_permissions(contract, from_, to_, token_id, batch_checked)
 
     def check_operator_add_permissions(self, contract, operator_param):
         # Blacklisted addresses can set operators if they want
@@ -489,15 +554,54 @@ class Common(sp.Contract):
             """
             sp.set_type(batch, t_transfer_params)
             if self.policy.supports_transfer:
+                if self.policy.supports_batch_check:
+                    # Collect all addresses in the batch to check them at once.
+                    # Tokens are checked first, to keep the error ordering.
+                    addresses = sp.local("addresses", sp.set(t=sp.TAddress))
+                    defined_token_ids = sp.local("defined_token_ids", sp.set(t=sp.TNat))
+                    with sp.for_("transfer", batch) as transfer:
+                        addresses.value.add(transfer.from_)
+                        with sp.for_("tx", transfer.txs) as tx:
+                            addresses.value.add(tx.to_)
+                            with sp.if_(~defined_token_ids.value.contains(tx.token_id)):
+                                sp.verify(self.is_defined(tx.token_id), "FA2_TOKEN_UNDEFINED")
+                                defined_token_ids.value.add(tx.token_id)
+                    self.policy.check_batch_transfer_permissions(self, addresses.value)
+
                 with sp.for_("transfer", batch) as transfer:
+                    # Check each token_id once per transfer and collapse
+                    # txs to the same to_ and token_id.
+                    # NOTE: apart from the batch check, policies don't depend
+                    # on to_, so permissions only need to be checked once per
+                    # from_ and token_id.
+                    checked_token_ids = sp.local("checked_token_ids", sp.set(t=sp.TNat))
+                    collapsed_txs = sp.local("collapsed_txs", sp.map(tkey=sp.TPair(sp.TAddress, sp.TNat), tvalue=sp.TNat))
                     with sp.for_("tx", transfer.txs) as tx:
-                        # The ordering of sp.verify is important: 1) token_undefined, 2) transfer permission 3) balance
-                        sp.verify(self.is_defined(tx.token_id), "FA2_TOKEN_UNDEFINED")
-                        self.policy.check_tx_transfer_permissions(
-                            self, transfer.from_, tx.to_, tx.token_id
-                        )
-                        with sp.if_(tx.amount > 0):
-                            self.transfer_tx_(transfer.from_, tx)
+                        with sp.if_(~checked_token_ids.value.contains(tx.token_id)):
+                            # The ordering of sp.verify is important: 1) token_undefined, 2) transfer permission 3) balance
+                            if not self.policy.supports_batch_check:
+                                sp.verify(self.is_defined(tx.token_id), "FA2_TOKEN_UNDEFINED")
+                            self.policy.check_tx_transfer_permissions(
+                                self, transfer.from_, tx.to_, tx.token_id,
+                                batch_checked=self.policy.supports_batch_check
+                            )
+                            checked_token_ids.value.add(tx.token_id)
+
+                        tx_key = sp.compute(sp.pair(tx.to_, tx.token_id))
+                        with sp.if_(tx.to_ == transfer.from_):
+                            # Self-transfers don't change balances, they're
+                            # not summed. Only the largest amount is checked.
+                            collapsed_txs.value[tx_key] = sp.max(collapsed_txs.value.get(tx_key, sp.nat(0)), tx.amount)
+                        with sp.else_():
+                            collapsed_txs.value[tx_key] = collapsed_txs.value.get(tx_key, sp.nat(0)) + tx.amount
+
+                    # Balances are checked after all txs of a transfer were validated.
+                    with sp.for_("collapsed_tx", collapsed_txs.value.items()) as collapsed_tx:
+                        with sp.if_(collapsed_tx.value > 0):
+                            self.transfer_tx_(transfer.from_, sp.record(
+                                to_=sp.fst(collapsed_tx.key),
+                                token_id=sp.snd(collapsed_tx.key),
+                                amount=collapsed_tx.value))
             else:
                 sp.failwith("FA2_TX_DENIED")
 
@@ -539,6 +643,31 @@ class Common(sp.Contract):
                 sp.result(self.balance_(params.owner, params.token_id))
             self.get_balance = sp.onchain_view(pure=True)(get_balance)
 
+            def get_balances(self, requests):
+                """Non-standard onchain view allowing batch retrieval of
+                balances.
+
+                Return a map of `owner` and `token_id` to balance."""
+                sp.set_type(requests, sp.TSet(t_balance_of_request))
+                balances = sp.local("balances", sp.map(tkey=t_balance_of_request, tvalue=sp.TNat))
+                with sp.for_("req", requests.elements()) as req:
+                    balances.value[req] = self.balance_(req.owner, req.token_id)
+                sp.result(balances.value)
+            self.get_balances = sp.onchain_view(pure=True)(get_balances)
+
+            def are_operators(self, params):
+                """Non-standard onchain view allowing batch retrieval of
+                operator permissions.
+
+                Return a map of operator permission to whether `operator`
+                is allowed to transfer `token_id` tokens owned by `owner`."""
+                sp.set_type(params, sp.TSet(t_operator_permission))
+                operators = sp.local("operators", sp.map(tkey=t_operator_permission, tvalue=sp.TBool))
+                with sp.for_("permission", params.elements()) as permission:
+                    operators.value[permission] = self.policy.is_operator(self, permission)
+                sp.result(operators.value)
+            self.are_operators = sp.onchain_view(pure=True)(are_operators)
+
             def total_supply(self, params):
                 """Return the total number of tokens for the given `token_id`."""
                 sp.result(sp.set_type_expr(self.supply_(params.token_id), sp.TNat))
@@ -549,6 +678,11 @@ class Common(sp.Contract):
     def is_defined(self, token_id):
         return self.data.token_metadata.contains(token_id)
 
+    def compress_token_info_(self, token_info):
+        """Returns the token_info to store for a new token. Overridden by
+        `CompressedTokenMetadata`."""
+        return token_info
+
     def generate_contract_metadata(self, name, description, nonstandard_transfer, filename, metadata_base=None):
         """Generate a metadata json file with all the contract's offchain views
         and standard TZIP-126 and TZIP-016 key/values."""
@@ -686,6 +820,18 @@ class Fa2Nft(Common):
                     sp.TAddress))
             self.get_owner = sp.onchain_view(pure=True)(get_owner)
 
+            def get_owners(self, token_ids):
+                """Non-standard onchain view allowing batch retrieval of
+                owners for Nft type ledgers.
+
+                Return a map of `token_id` to owner for the given `token_ids`."""
+                sp.set_type(token_ids, sp.TSet(sp.TNat))
+                owners = sp.local("owners", sp.map(tkey=sp.TNat, tvalue=sp.TAddress))
+                with sp.for_("token_id", token_ids.elements()) as token_id:
+                    owners.value[token_id] = self.data.ledger.get(token_id, message = "FA2_TOKEN_UNDEFINED")
+                sp.result(owners.value)
+            self.get_owners = sp.onchain_view(pure=True)(get_owners)
+
     def initial_mint(self, token_metadata=[], ledger={}, has_royalties=False):
         """Perform a mint before the origination.
 
@@ -744,9 +890,7 @@ class Fa2Fungible(Common):
         self.allow_mint_existing = allow_mint_existing
         ledger, token_extra, token_metadata = self.initial_mint(token_metadata, ledger, has_royalties)
         self.init(
-            ledger=sp.big_map(
-                ledger, tkey=sp.TPair(sp.TAddress, sp.TNat), tvalue=sp.TNat
-            ),
+            ledger=self.initial_ledger_(ledger),
             metadata=metadata,
             last_token_id=sp.nat(len(token_metadata))
         )
@@ -797,9 +941,25 @@ class Fa2Fungible(Common):
             token_extra_dict[token_id].supply += amount
         return (ledger, token_extra_dict, token_metadata_dict)
 
+    def initial_ledger_(self, ledger):
+        return sp.big_map(
+            ledger, tkey=sp.TPair(sp.TAddress, sp.TNat), tvalue=sp.TNat
+        )
+
+    def ledger_get_(self, owner, token_id):
+        return self.data.ledger.get((owner, token_id), sp.nat(0))
+
+    def ledger_update_(self, owner, token_id, balance):
+        """Set the balance of `owner`. Removes the entry if it's 0."""
+        key = sp.compute((owner, token_id))
+        with sp.if_(balance == 0):
+            del self.data.ledger[key]
+        with sp.else_():
+            self.data.ledger[key] = balance
+
     def balance_(self, owner, token_id):
         sp.verify(self.is_defined(token_id), "FA2_TOKEN_UNDEFINED")
-        return self.data.ledger.get((owner, token_id), sp.nat(0))
+        return self.ledger_get_(owner, token_id)
 
     def supply_(self, token_id):
         return self.data.token_extra.get(token_id, message = "FA2_TOKEN_UNDEFINED").supply
@@ -820,6 +980,69 @@ class Fa2Fungible(Common):
         self.data.ledger[to_] = self.data.ledger.get(to_, 0) + tx.amount
 
 
+class Fa2FungibleGrouped(Fa2Fungible):
+    """Base class for a FA2 fungible contract with the ledger grouped per
+    token.
+
+    Same as Fa2Fungible, but the ledger maps `token_id` to a map of
+    holders and their balances. A new holder of an existing token adds
+    a map entry instead of a big_map key containing the address, which
+    reduces storage burn on mints and transfers to new holders. The
+    trade-off is that transfers deserialise the holders of a token.
+
+    NOTE: every transfer, mint and burn loads and stores the whole holder
+    map of the token, so gas grows linearly with the number of holders.
+    A token with many holders can make transfers expensive or exceed the
+    operation gas limit. Only use it for tokens with few holders.
+
+    Respects the FA2 standard, but indexers may not recognise the ledger.
+    """
+
+    ledger_type = "FungibleGrouped"
+
+    def initial_ledger_(self, ledger):
+        grouped = {}
+        for (address, token_id), amount in ledger.items():
+            grouped.setdefault(token_id, {})[address] = amount
+        return sp.big_map(
+            {token_id: sp.map(holders, tkey=sp.TAddress, tvalue=sp.TNat) for token_id, holders in grouped.items()},
+            tkey=sp.TNat, tvalue=sp.TMap(sp.TAddress, sp.TNat)
+        )
+
+    def ledger_get_(self, owner, token_id):
+        return self.data.ledger.get(token_id, sp.map(tkey=sp.TAddress, tvalue=sp.TNat)).get(owner, sp.nat(0))
+
+    def ledger_update_(self, owner, token_id, balance):
+        """Set the balance of `owner`. Removes the entry if it's 0, and
+        the token if it has no holders left."""
+        holders = sp.local("holders", self.data.ledger.get(token_id, sp.map(tkey=sp.TAddress, tvalue=sp.TNat)))
+        with sp.if_(balance == 0):
+            del holders.value[owner]
+        with sp.else_():
+            holders.value[owner] = balance
+
+        with sp.if_(sp.len(holders.value) == 0):
+            del self.data.ledger[token_id]
+        with sp.else_():
+            self.data.ledger[token_id] = holders.value
+
+    def transfer_tx_(self, from_, tx):
+        # Load holders once for both sides of the transfer.
+        holders = sp.local("holders", self.data.ledger.get(tx.token_id, sp.map(tkey=sp.TAddress, tvalue=sp.TNat)))
+        from_balance = sp.compute(sp.as_nat(
+            holders.value.get(from_, 0) - tx.amount,
+            message="FA2_INSUFFICIENT_BALANCE",
+        ))
+        with sp.if_(from_balance == 0):
+            del holders.value[from_]
+        with sp.else_():
+            holders.value[from_] = from_balance
+
+        # Do the transfer. NOTE: tx.amount > 0, so holders isn't empty.
+        holders.value[tx.to_] = holders.value.get(tx.to_, 0) + tx.amount
+        self.data.ledger[tx.token_id] = holders.value
+
+
 class Fa2SingleAsset(Common):
     """Base class for a FA2 single asset contract.
 
@@ -945,6 +1168,41 @@ class OffchainviewTokenMetadata:
         sp.result(self.data.token_metadata[token_id])
 
 
+class CompressedTokenMetadata:
+    """(Mixin) Only store the CID of a new token's metadata URI.
+
+    Minted tokens must have an ipfs metadata URI under the "" key. The
+    "ipfs://" prefix is stripped before storing it and rebuilt by the
+    `token_metadata` offchain view, which indexers use if present.
+
+    Use instead of `OffchainviewTokenMetadata`.
+
+    Tokens can't be minted before the origination, their metadata
+    wouldn't be compressed.
+    """
+
+    def initial_mint(self, token_metadata=[], ledger={}, *args, **kwargs):
+        if token_metadata:
+            raise Exception("CompressedTokenMetadata doesn't support minting before the origination")
+        return super().initial_mint(token_metadata, ledger, *args, **kwargs)
+
+    def compress_token_info_(self, token_info):
+        uri = sp.compute(token_info.get("", message="FA2_INVALID_METADATA"))
+        Utils.validateIpfsUri(uri)
+        compressed_info = sp.local("compressed_info", token_info)
+        compressed_info.value[""] = sp.slice(uri, 7, abs(sp.len(uri) - 7)).open_some()
+        return compressed_info.value
+
+    @sp.offchain_view(pure=True)
+    def token_metadata(self, token_id):
+        """Returns the token-metadata URI for the given token, with the
+        full ipfs URI."""
+        sp.set_type(token_id, sp.TNat)
+        metadata = sp.local("metadata", self.data.token_metadata[token_id])
+        metadata.value.token_info[""] = sp.utils.bytes_of_string("ipfs://") + metadata.value.token_info[""]
+        sp.result(metadata.value)
+
+
 class OffchainviewBalanceOf:
     """(Mixin) Non-standard offchain view equivalent to `balance_of`.
 
@@ -980,7 +1238,7 @@ class MintNft:
             self.onlyAdministrator()
             with sp.for_("action", batch) as action:
                 token_id = sp.compute(self.data.last_token_id)
-                metadata = sp.record(token_id=token_id, token_info=action.metadata)
+                metadata = sp.record(token_id=token_id, token_info=self.compress_token_info_(action.metadata))
                 self.data.token_metadata[token_id] = metadata
                 self.data.ledger[token_id] = action.to_
                 if self.has_royalties:
@@ -1005,7 +1263,7 @@ class MintFungible:
                     with arg.match("new") as new:
                         token_id = sp.compute(self.data.last_token_id)
                         self.data.token_metadata[token_id] = sp.record(
-                            token_id=token_id, token_info=new.metadata
+                            token_id=token_id, token_info=self.compress_token_info_(new.metadata)
                         )
                         if self.has_royalties:
                             self.data.token_extra[token_id] = sp.record(
@@ -1016,16 +1274,14 @@ class MintFungible:
                             self.data.token_extra[token_id] = sp.record(
                                 supply=action.amount
                             )
-                        self.data.ledger[(action.to_, token_id)] = action.amount
+                        self.ledger_update_(action.to_, token_id, action.amount)
                         self.data.last_token_id += 1
                     with arg.match("existing") as token_id:
                         if self.allow_mint_existing:
                             sp.verify(self.is_defined(token_id), "FA2_TOKEN_UNDEFINED")
                             self.data.token_extra[token_id].supply += action.amount
-                            from_ = sp.compute((action.to_, token_id))
-                            self.data.ledger[from_] = (
-                                self.data.ledger.get(from_, sp.nat(0)) + action.amount
-                            )
+                            self.ledger_update_(action.to_, token_id,
+                                self.ledger_get_(action.to_, token_id) + action.amount)
                         else:
                             sp.failwith("FA2_TX_DENIED")
 
@@ -1081,10 +1337,19 @@ class BurnNft:
         """
         sp.set_type(batch, t_burn_batch)
         sp.verify(self.policy.supports_transfer, "FA2_TX_DENIED")
+        if self.policy.supports_batch_check:
+            # Tokens are checked first, to keep the error ordering.
+            addresses = sp.local("addresses", sp.set(t=sp.TAddress))
+            with sp.for_("action", batch) as action:
+                sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
+                addresses.value.add(action.from_)
+            self.policy.check_batch_transfer_permissions(self, addresses.value)
         with sp.for_("action", batch) as action:
-            sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
+            if not self.policy.supports_batch_check:
+                sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
             self.policy.check_tx_transfer_permissions(
-                self, action.from_, action.from_, action.token_id
+                self, action.from_, action.from_, action.token_id,
+                batch_checked=self.policy.supports_batch_check
             )
             with sp.if_(action.amount > 0):
                 sp.verify(
@@ -1110,21 +1375,26 @@ class BurnFungible:
         permission."""
         sp.set_type(batch, t_burn_batch)
         sp.verify(self.policy.supports_transfer, "FA2_TX_DENIED")
+        if self.policy.supports_batch_check:
+            # Tokens are checked first, to keep the error ordering.
+            addresses = sp.local("addresses", sp.set(t=sp.TAddress))
+            with sp.for_("action", batch) as action:
+                sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
+                addresses.value.add(action.from_)
+            self.policy.check_batch_transfer_permissions(self, addresses.value)
         with sp.for_("action", batch) as action:
-            sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
+            if not self.policy.supports_batch_check:
+                sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
             self.policy.check_tx_transfer_permissions(
-                self, action.from_, action.from_, action.token_id
+                self, action.from_, action.from_, action.token_id,
+                batch_checked=self.policy.supports_batch_check
             )
-            from_ = sp.compute((action.from_, action.token_id))
             # Burn from.
             from_balance = sp.compute(sp.as_nat(
-                self.data.ledger.get(from_, sp.nat(0)) - action.amount,
+                self.ledger_get_(action.from_, action.token_id) - action.amount,
                 message="FA2_INSUFFICIENT_BALANCE",
             ))
-            with sp.if_(from_balance == 0):
-                del self.data.ledger[from_]
-            with sp.else_():
-                self.data.ledger[from_] = from_balance
+            self.ledger_update_(action.from_, action.token_id, from_balance)
 
             # Decrease supply or delete of it becomes 0.
             extra = sp.local("extra", self.data.token_extra.get(action.token_id, self.token_extra_default))
@@ -1159,10 +1429,19 @@ class BurnSingleAsset:
         permission."""
         sp.set_type(batch, t_burn_batch)
         sp.verify(self.policy.supports_transfer, "FA2_TX_DENIED")
+        if self.policy.supports_batch_check:
+            # Tokens are checked first, to keep the error ordering.
+            addresses = sp.local("addresses", sp.set(t=sp.TAddress))
+            with sp.for_("action", batch) as action:
+                sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
+                addresses.value.add(action.from_)
+            self.policy.check_batch_transfer_permissions(self, addresses.value)
         with sp.for_("action", batch) as action:
-            sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
+            if not self.policy.supports_batch_check:
+                sp.verify(self.is_defined(action.token_id), "FA2_TOKEN_UNDEFINED")
             self.policy.check_tx_transfer_permissions(
-                self, action.from_, action.from_, action.token_id
+                self, action.from_, action.from_, action.token_id,
+                batch_checked=self.policy.supports_batch_check
             )
             # Burn the tokens
             from_balance = sp.compute(sp.as_nat(
@@ -1237,6 +1516,13 @@ def getOwner(fa2, token_id) -> sp.Expr:
         sp.set_type_expr(token_id, sp.TNat),
         t = sp.TAddress)
 
+# Get owners
+@EnvUtils.view_helper
+def getOwners(fa2, token_ids) -> sp.Expr:
+    return sp.view("get_owners", sp.set_type_expr(fa2, sp.TAddress),
+        sp.set_type_expr(token_ids, sp.TSet(sp.TNat)),
+        t = sp.TMap(sp.TNat, sp.TAddress))
+
 # Validating royalties
 def validateRoyalties(royalties, max_royalties, max_contributors):
     """Inline function to validate royalties."""
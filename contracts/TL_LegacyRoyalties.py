@@ -69,6 +69,13 @@ def getRoyalties(legacy_royalties, token_key) -> sp.Expr:
         t = FA2.t_royalties_interop)
 
 
+@EnvUtils.view_helper
+def getRoyaltiesBatch(legacy_royalties, token_keys) -> sp.Expr:
+    return sp.view("get_royalties_batch", sp.set_type_expr(legacy_royalties, sp.TAddress),
+        sp.set_type_expr(token_keys, sp.TSet(t_token_key)),
+        t = sp.TMap(t_token_key, FA2.t_royalties_interop))
+
+
 #
 # Token registry contract.
 class TL_LegacyRoyalties(
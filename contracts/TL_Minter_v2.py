@@ -11,6 +11,17 @@ from contracts.utils import ErrorMessages
 from tz1and_contracts_smartpy.utils import Utils
 
 
+# Tokens to mint in a batch, per collection.
+t_mint_batch_item = sp.TRecord(
+    to_ = sp.TAddress,
+    amount = sp.TNat,
+    royalties = FA2.t_royalties_shares,
+    metadata = sp.TBytes
+).layout(("to_", ("amount", ("royalties", "metadata"))))
+
+t_mint_batch = sp.TMap(sp.TAddress, sp.TList(t_mint_batch_item))
+
+
 #
 # Minter contract.
 # NOTE: should be pausable for code updates.
@@ -67,6 +78,30 @@ class TL_Minter_v2(
             .open_some().collection_type == TL_TokenRegistry.collectionPublic, ErrorMessages.not_public())
 
 
+    def mintBatchInline(self, collection, tokens):
+        """Validates tokens and mints them with a single call to the
+        collection's mint entrypoint."""
+        sp.set_type(collection, sp.TAddress)
+        sp.set_type(tokens, sp.TList(t_mint_batch_item))
+
+        mint_batch = sp.local("mint_batch", [], t = FA2.t_mint_fungible_royalties_batch)
+        with sp.for_("token", tokens) as token:
+            sp.verify((token.amount > 0) & (token.amount <= 10000), message = ErrorMessages.parameter_error())
+
+            FA2.validateRoyalties(token.royalties, self.data.settings.max_royalties, self.data.settings.max_contributors)
+
+            mint_batch.value.push(sp.record(
+                to_=token.to_,
+                amount=token.amount,
+                token=sp.variant("new", sp.record(
+                    metadata={ '' : token.metadata },
+                    royalties=token.royalties))
+            ))
+
+        # NOTE: reverse to mint tokens in the order they were passed.
+        FA2.fa2_fungible_royalties_mint(mint_batch.value.rev(), collection)
+
+
     #
     # Admin-only/owner-only entry points
     #
@@ -170,6 +205,18 @@ class TL_Minter_v2(
             params.collection)
 
 
+    @sp.entry_point(lazify = True, parameter_type = t_mint_batch)
+    def mint_public_batch(self, params):
+        """Minting multiple items in public collections.
+
+        Checks each collection once and sends one mint per collection."""
+        self.onlyUnpaused()
+
+        with sp.for_("collection_item", params.items()) as collection_item:
+            self.onlyPublicCollection(collection_item.key)
+            self.mintBatchInline(collection_item.key, collection_item.value)
+
+
     #
     # Private entry points
     #
@@ -213,3 +260,15 @@ class TL_Minter_v2(
                     royalties=params.royalties))
             )],
             params.collection)
+
+
+    @sp.entry_point(lazify = True, parameter_type = t_mint_batch)
+    def mint_private_batch(self, params):
+        """Minting multiple items in private collections.
+
+        Checks each collection once and sends one mint per collection."""
+        self.onlyUnpaused()
+
+        with sp.for_("collection_item", params.items()) as collection_item:
+            self.onlyOwnerOrCollaboratorPrivate(collection_item.key, sp.sender)
+            self.mintBatchInline(collection_item.key, collection_item.value)
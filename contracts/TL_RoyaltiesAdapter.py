@@ -6,6 +6,19 @@ from contracts.utils import EnvUtils, ErrorMessages, TokenTransfer
 
 def sendValueRoyaltiesFeesInline(fees, fees_to, rate, issuer, item_royalty_info, primary):
     """Inline function for sending royalties, fees, etc."""
+    # Collect amounts to send in a map.
+    sendMap = TokenTransfer.TokenSendMap()
+
+    addValueRoyaltiesFeesInline(sendMap, fees, fees_to, rate, issuer, item_royalty_info, primary)
+
+    # Transfer.
+    sendMap.transfer()
+
+
+def addValueRoyaltiesFeesInline(sendMap: TokenTransfer.TokenSendMap, fees, fees_to, rate, issuer, item_royalty_info, primary):
+    """Inline function for adding royalties, fees, etc. to a TokenSendMap.
+
+    Allows merging the payouts of many items into one transfer per address."""
     sp.set_type(fees, sp.TNat)
     sp.set_type(fees_to, sp.TAddress)
     sp.set_type(rate, sp.TMutez)
@@ -13,9 +26,6 @@ def sendValueRoyaltiesFeesInline(fees, fees_to, rate, issuer, item_royalty_info,
     sp.set_type(item_royalty_info, FA2.t_royalties_interop)
     sp.set_type(primary, sp.TBool)
 
-    # Collect amounts to send in a map.
-    sendMap = TokenTransfer.TokenSendMap()
-
     # First, we take our fees are in permille.
     fees_amount = sp.compute(sp.split_tokens(rate, fees, sp.nat(1000)))
     sendMap.add(fees_to, fees_amount)
@@ -44,9 +54,6 @@ def sendValueRoyaltiesFeesInline(fees, fees_to, rate, issuer, item_royalty_info,
     # Make sure it all adds up correctly!
     sp.verify((fees_amount + total_royalties.value + left_amount) == rate, ErrorMessages.royalties_error())
 
-    # Transfer.
-    sendMap.transfer()
-
 
 @EnvUtils.view_helper
 def getRoyalties(royalties_adaper, token_key) -> sp.Expr:
@@ -55,6 +62,13 @@ def getRoyalties(royalties_adaper, token_key) -> sp.Expr:
         t = FA2.t_royalties_interop)
 
 
+@EnvUtils.view_helper
+def getRoyaltiesBatch(royalties_adaper, token_keys) -> sp.Expr:
+    return sp.view("get_royalties_batch", sp.set_type_expr(royalties_adaper, sp.TAddress),
+        sp.set_type_expr(token_keys, sp.TSet(TL_LegacyRoyalties.t_token_key)),
+        t = sp.TMap(TL_LegacyRoyalties.t_token_key, FA2.t_royalties_interop))
+
+
 #
 # Royalties adapter contract.
 class TL_RoyaltiesAdapter(sp.Contract):
@@ -92,3 +106,38 @@ class TL_RoyaltiesAdapter(sp.Contract):
             # Call the V1 and legacy adapter.
             sp.result(TL_RoyaltiesAdapterLegacyAndV1.getRoyalties(self.data.v1_and_legacy_adapter,
                 token_key, royalties_type).open_some(sp.unit))
+
+
+    @sp.onchain_view(pure=True)
+    def get_royalties_batch(self, token_keys):
+        """Gets royalties for a batch of tokens.
+
+        The royalties type is only looked up once per fa2 and
+        the V1 and legacy adapter is only called once."""
+        sp.set_type(token_keys, sp.TSet(TL_LegacyRoyalties.t_token_key))
+
+        result_map = sp.local("result_map", sp.map(tkey=TL_LegacyRoyalties.t_token_key, tvalue=FA2.t_royalties_interop))
+        royalties_types = sp.local("royalties_types", sp.map(tkey=sp.TAddress, tvalue=TL_TokenRegistry.t_royalties_bounded))
+        adapter_keys = sp.local("adapter_keys", sp.map(tkey=TL_LegacyRoyalties.t_token_key, tvalue=TL_TokenRegistry.t_royalties_bounded))
+
+        with sp.for_("token_key", token_keys.elements()) as token_key:
+            # Get the royalties type, if we don't know it yet.
+            with sp.if_(~royalties_types.value.contains(token_key.fa2)):
+                royalties_types.value[token_key.fa2] = TL_TokenRegistry.getRoyaltiesType(self.data.registry, token_key.fa2).open_some(sp.unit)
+
+            royalties_type = sp.compute(royalties_types.value[token_key.fa2])
+
+            with sp.if_(royalties_type == TL_TokenRegistry.royaltiesTz1andV2):
+                # Just get V2 royalties.
+                result_map.value[token_key] = FA2.getRoyalties(token_key.fa2, token_key.id).open_some(sp.unit)
+            with sp.else_():
+                # Collect for the V1 and legacy adapter.
+                adapter_keys.value[token_key] = royalties_type
+
+        # Call the V1 and legacy adapter.
+        with sp.if_(sp.len(adapter_keys.value) > 0):
+            with sp.for_("adapter_item", TL_RoyaltiesAdapterLegacyAndV1.getRoyaltiesBatch(self.data.v1_and_legacy_adapter,
+                adapter_keys.value).open_some(sp.unit).items()) as adapter_item:
+                result_map.value[adapter_item.key] = adapter_item.value
+
+        sp.result(result_map.value)
@@ -2,7 +2,7 @@ import smartpy as sp
 
 from contracts import TL_LegacyRoyalties, TL_TokenRegistry, FA2
 from contracts.legacy import FA2_legacy
-from contracts.utils import EnvUtils
+from contracts.utils import EnvUtils, ErrorMessages
 
 
 t_get_royalties_type = sp.TRecord(
@@ -18,6 +18,16 @@ def getRoyalties(royalties_adaper, token_key, royalties_type) -> sp.Expr:
         t = FA2.t_royalties_interop)
 
 
+t_get_royalties_batch = sp.TMap(TL_LegacyRoyalties.t_token_key, TL_TokenRegistry.t_royalties_bounded)
+
+
+@EnvUtils.view_helper
+def getRoyaltiesBatch(royalties_adaper, token_keys) -> sp.Expr:
+    return sp.view("get_royalties_batch", sp.set_type_expr(royalties_adaper, sp.TAddress),
+        sp.set_type_expr(token_keys, t_get_royalties_batch),
+        t = sp.TMap(TL_LegacyRoyalties.t_token_key, FA2.t_royalties_interop))
+
+
 #
 # Royalties adapter contract.
 class TL_RoyaltiesAdapterLegacyAndV1(sp.Contract):
@@ -39,6 +49,21 @@ class TL_RoyaltiesAdapterLegacyAndV1(sp.Contract):
         sp.failwith(sp.unit)
 
 
+    def getV1RoyaltiesInline(self, token_key):
+        """Inline function to get V1 royalties and convert them to V2."""
+        sp.set_type(token_key, TL_LegacyRoyalties.t_token_key)
+
+        royalties = sp.compute(FA2_legacy.getRoyalties(token_key.fa2, token_key.id).open_some(sp.unit))
+        royalties_v2 = sp.local("royalties_v2", sp.record(total = 1000, shares = {}), FA2.t_royalties_interop)
+
+        with sp.for_("contributor", royalties.contributors) as contributor:
+            existing_share = royalties_v2.value.shares.get(contributor.address, sp.nat(0))
+            new_share = existing_share + (contributor.relative_royalties * royalties.royalties / 1000)
+            royalties_v2.value.shares[contributor.address] = new_share
+
+        return royalties_v2.value
+
+
     @sp.onchain_view(pure=True)
     def get_royalties(self, params):
         """Gets token royalties and/or validate signed royalties."""
@@ -47,15 +72,7 @@ class TL_RoyaltiesAdapterLegacyAndV1(sp.Contract):
         # Type 1 = tz1and v1 royalties.
         with sp.if_(params.royalties_type == TL_TokenRegistry.royaltiesTz1andV1):
             # Convert V1 royalties to V2.
-            royalties = sp.compute(FA2_legacy.getRoyalties(params.token_key.fa2, params.token_key.id).open_some(sp.unit))
-            royalties_v2 = sp.local("royalties_v2", sp.record(total = 1000, shares = {}), FA2.t_royalties_interop)
-
-            with sp.for_("contributor", royalties.contributors) as contributor:
-                existing_share = royalties_v2.value.shares.get(contributor.address, sp.nat(0))
-                new_share = existing_share + (contributor.relative_royalties * royalties.royalties / 1000)
-                royalties_v2.value.shares[contributor.address] = new_share
-
-            sp.result(royalties_v2.value)
+            sp.result(self.getV1RoyaltiesInline(params.token_key))
         with sp.else_():
             # Type 0 = Registry does not know about this token's royalties.
             with sp.if_(params.royalties_type == TL_TokenRegistry.royaltiesLegacy):
@@ -63,3 +80,36 @@ class TL_RoyaltiesAdapterLegacyAndV1(sp.Contract):
                 sp.result(TL_LegacyRoyalties.getRoyalties(self.data.legacy_royalties, params.token_key).open_some(sp.unit))
             with sp.else_():
                 sp.failwith(sp.unit)
+
+
+    @sp.onchain_view(pure=True)
+    def get_royalties_batch(self, params):
+        """Gets royalties for a batch of tokens.
+
+        Legacy royalties are fetched with a single view call.
+
+        Fails if any royalties are unknown."""
+        sp.set_type(params, t_get_royalties_batch)
+
+        result_map = sp.local("result_map", sp.map(tkey=TL_LegacyRoyalties.t_token_key, tvalue=FA2.t_royalties_interop))
+        legacy_keys = sp.local("legacy_keys", sp.set(t=TL_LegacyRoyalties.t_token_key))
+
+        with sp.for_("token_item", params.items()) as token_item:
+            # Type 1 = tz1and v1 royalties.
+            with sp.if_(token_item.value == TL_TokenRegistry.royaltiesTz1andV1):
+                # Convert V1 royalties to V2.
+                result_map.value[token_item.key] = self.getV1RoyaltiesInline(token_item.key)
+            with sp.else_():
+                # Type 0 = Registry does not know about this token's royalties.
+                with sp.if_(token_item.value == TL_TokenRegistry.royaltiesLegacy):
+                    legacy_keys.value.add(token_item.key)
+                with sp.else_():
+                    sp.failwith(sp.unit)
+
+        # Get legacy royalties from legacy royalties contract.
+        with sp.if_(sp.len(legacy_keys.value) > 0):
+            legacy_royalties = sp.compute(TL_LegacyRoyalties.getRoyaltiesBatch(self.data.legacy_royalties, legacy_keys.value).open_some(sp.unit))
+            with sp.for_("token_key", legacy_keys.value.elements()) as token_key:
+                result_map.value[token_key] = legacy_royalties.get(token_key, message=ErrorMessages.unknown_royalties())
+
+        sp.result(result_map.value)
@@ -79,7 +79,9 @@ class TL_TokenFactory(
             administrator = self.data.settings.minter,
             metadata = sp.big_map({"": metadata_uri}),
             # Just the default values
-            adhoc_operators = sp.set(),
+            adhoc_operators = sp.big_map(),
+            adhoc_operators_level = 0,
+            adhoc_operators_owners = sp.big_map(),
             last_token_id = 0,
             ledger = sp.big_map(),
             operators = sp.big_map(),
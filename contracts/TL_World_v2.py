@@ -15,7 +15,7 @@ from contracts.mixins.Fees import Fees
 from contracts.mixins.Moderation import Moderation
 from contracts.mixins.AllowedPlaceTokens import AllowedPlaceTokens
 
-from contracts import TL_TokenRegistry, TL_RoyaltiesAdapter, FA2
+from contracts import TL_TokenRegistry, TL_LegacyRoyalties, TL_RoyaltiesAdapter, FA2
 from contracts.utils import TokenTransfer, FA2Utils, ErrorMessages
 from tz1and_contracts_smartpy.utils import Utils
 
@@ -38,12 +38,12 @@ from tz1and_contracts_smartpy.utils import Utils
 
 # Some time
 # TODO: special permission for sending items to place? Might be good.
-# TODO: delete empty chunks? chunk store remove_if_empty. make sure to delete them from place as well.
 # TODO: so many empty FAILWITHs. Optimise... What still can be.
 
 
 # Other
 # TODO: think of some more tests for permission.
+# NOTE: wildcard permissions are keyed by (owner, permittee, place fa2) and only apply if there are no place permissions.
 # TODO: DAO token drop with signed drops. Based on collections or royalties. Sign, record if paid.
 # TODO: sorting out the splitting of dao and team (probably with a proxy contract)
 # TODO: proxy contract will also be some kind of multisig for all the only-admin things (pausing operation)
@@ -59,9 +59,16 @@ from tz1and_contracts_smartpy.utils import Utils
 # - Item data is stored in half floats, usually, there are two formats as of now
 #   + 0: 1 byte format, 3 floats pos = 7 bytes (this is also the minimum item data length)
 #   + 1: 1 byte format, 3 floats for euler angles, 3 floats pos, 1 float scale = 15 bytes
+#   set_item_data also takes batches: a template shared by all items in the batch with a per-item
+#   delta replacing the template bytes at offset. e.g. moving a group of items only sends the positions.
 #   NOTE: could store an animation index and all kinds of other stuff in data
+# - Chunks can have optional bounds, an AABB in half floats (min xyz, max xyz = 12 bytes), computed by clients.
+#   They are set on place_items and set_item_data by passing a packed map of chunk id to bounds in ext under
+#   "chunk_bounds". Empty bytes clear the bounds. Used by clients to only fetch chunks in view. Only the encoding and
+#   length are validated, the bounds themselves are asserted by the client that sets them.
 # - Regarding chunk item storage efficiency: you can easily have up to 2000-3000 items (depending on issuer and token keys)
-#   per map before gas becomes *expensive*.
+#   per map before gas becomes *expensive*. That's why items are stored in a flat big_map now and chunks only
+#   keep counters. Touching an item doesn't depend on the number of items in the chunk, but the item keys are larger.
 # - use of inline_result. and bound blocks in general. can help with gas.
 # - why switching to sigend royalties has such a large impact on perf:
 #   + So I just wasted a day trying to figure out why having a public key in a contract's storage adds 30 mutez of gas
@@ -97,7 +104,9 @@ extensibleVariantItemType = sp.TVariant(
 ).layout(("item", "ext"))
 
 #
-# Item storage
+# Item data
+# NOTE: items aren't stored in these maps, see itemMapType.
+# The nested maps are used to return items from views.
 # map from item id to item
 tokenStoreType = sp.TMap(sp.TNat, extensibleVariantItemType)
 tokenStoreLiteral = sp.map(tkey=sp.TNat, tvalue=extensibleVariantItemType)
@@ -114,18 +123,24 @@ placePropsType = sp.TMap(sp.TBytes, sp.TBytes)
 # only set color by default.
 defaultPlaceProps = sp.map({sp.bytes("0x00"): sp.bytes('0x82b881')}, tkey=sp.TBytes, tvalue=sp.TBytes)
 
+# map from chunk id to pair(counter, next_id) of the chunk.
+chunkSeqsType = sp.TMap(sp.TNat, sp.TPair(sp.TNat, sp.TNat))
+chunkSeqsLiteral = sp.map(tkey=sp.TNat, tvalue=sp.TPair(sp.TNat, sp.TNat))
+
 placeStorageType = sp.TRecord(
     counter = sp.TNat, # interaction counter for seq number generation
     props = placePropsType, # place properties
     chunks = sp.TSet(sp.TNat), # set of active/existing chunks
+    chunk_seqs = chunkSeqsType, # chunk counters and next ids, mirrored for get_place_seqnum
     value_to = sp.TOption(sp.TAddress), # value for place owned items is sent to, if set
     items_to = sp.TOption(sp.TAddress) # where place owned items are sent to when removed, if set
-).layout(("counter", ("props", ("chunks", ("value_to", "items_to")))))
+).layout(("counter", ("props", ("chunks", ("chunk_seqs", ("value_to", "items_to"))))))
 
 placeStorageDefault = sp.record(
     counter = sp.nat(0),
     props = defaultPlaceProps,
     chunks = sp.set([]),
+    chunk_seqs = chunkSeqsLiteral,
     value_to = sp.none,
     items_to = sp.none)
 
@@ -171,24 +186,55 @@ class PlaceStorage:
     def value(self):
         return self.this_place.value
 
+
+class PlaceOwner:
+    """Resolves the owner of a place at most once per entrypoint
+    call, no matter how often it's used."""
+    def __init__(self, place_key):
+        self.place_key = sp.set_type_expr(place_key, placeKeyType)
+        self.place_owner = sp.local("place_owner", sp.none, sp.TOption(sp.TAddress))
+
+    def get(self):
+        with sp.if_(self.place_owner.value.is_none()):
+            self.place_owner.value = sp.some(FA2.getOwner(self.place_key.fa2, self.place_key.id).open_some())
+        return self.place_owner.value.open_some()
+
 #
 # Chunk storage
+# map from issuer to map from token address to the ids of the items in the store
+itemIdSetType = sp.TSet(sp.TNat)
+itemStoreIdsType = sp.TMap(sp.TOption(sp.TAddress), sp.TMap(sp.TAddress, itemIdSetType))
+itemStoreIdsLiteral = sp.map(tkey=sp.TOption(sp.TAddress), tvalue=sp.TMap(sp.TAddress, itemIdSetType))
+
 chunkStorageType = sp.TRecord(
     next_id = sp.TNat, # per chunk item ids
     counter = sp.TNat, # interaction counter for seq number generation
-    storage = chunkStoreType
-).layout(("next_id", ("counter", "storage")))
+    item_count = sp.TNat, # number of items stored in the chunk
+    stores = itemStoreIdsType, # ids of the items per item store
+    bounds = sp.TOption(sp.TBytes) # optional AABB in half floats, set by clients
+).layout(("next_id", ("counter", ("item_count", ("stores", "bounds")))))
 
 chunkStorageDefault = sp.record(
     next_id = sp.nat(0),
     counter = sp.nat(0),
-    storage = chunkStoreLiteral)
+    item_count = sp.nat(0),
+    stores = itemStoreIdsLiteral,
+    bounds = sp.none)
 
 chunkPlaceKeyType = sp.TRecord(
     place_key = placeKeyType,
     chunk_id = sp.TNat
 ).layout(("place_key", "chunk_id"))
 
+# The chunk as returned from views, including items.
+chunkDataType = sp.TRecord(
+    next_id = sp.TNat,
+    counter = sp.TNat,
+    item_count = sp.TNat,
+    bounds = sp.TOption(sp.TBytes),
+    storage = chunkStoreType
+).layout(("next_id", ("counter", ("item_count", ("bounds", "storage")))))
+
 placeDataParam = sp.TRecord(
     place_key = placeKeyType,
     chunk_ids = sp.TOption(sp.TSet(sp.TNat))
@@ -198,22 +244,44 @@ placeSeqNumParam = placeDataParam
 
 placeDataResultType = sp.TRecord(
     place = placeStorageType,
-    chunks = sp.TMap(sp.TNat, chunkStorageType)
+    chunks = sp.TMap(sp.TNat, chunkDataType)
 ).layout(("place", "chunks"))
 
+placeDataPagedParam = sp.TRecord(
+    place_key = placeKeyType,
+    chunk_id = sp.TNat,
+    issuer = sp.TOption(sp.TAddress),
+    fa2 = sp.TAddress,
+    from_item_id = sp.TNat,
+    limit = sp.TNat # number of item ids to look at, not number of items returned
+).layout(("place_key", ("chunk_id", ("issuer", ("fa2", ("from_item_id", "limit"))))))
+
+placeDataPagedResultType = sp.TRecord(
+    items = tokenStoreType,
+    cursor = sp.TOption(sp.TNat) # from_item_id for the next page, none if done
+).layout(("items", "cursor"))
+
 chunkMapType = sp.TBigMap(chunkPlaceKeyType, chunkStorageType)
 
+# Chunk bounds, as passed in ext.
+chunkBoundsMapType = sp.TMap(sp.TNat, sp.TBytes)
+chunkBoundsLen = sp.nat(12) # 6 half floats
+
 
 class ChunkStorage:
     @staticmethod
     def make():
         return sp.big_map(tkey=chunkPlaceKeyType, tvalue=chunkStorageType)
 
-    def __init__(self, map, key, create: bool = False):
+    def __init__(self, map, key, create: bool = False, place: PlaceStorage = None):
+        """If create is True, the place is required to restore the
+        sequence numbers of chunks that were removed when empty."""
         sp.set_type(map, chunkMapType) # set_type_expr gives compiler error
         self.data_map = map
         self.this_chunk_key = sp.set_type_expr(key, chunkPlaceKeyType)
         if create is True:
+            assert place is not None, "ChunkStorage: place is required to create chunks"
+            self.place = place
             self.this_chunk = sp.local("this_chunk", self.__get_or_default())
         else:
             self.this_chunk = sp.local("this_chunk", self.__get())
@@ -222,38 +290,60 @@ class ChunkStorage:
         return self.data_map.get(self.this_chunk_key)
 
     def __get_or_default(self):
-        return self.data_map.get(self.this_chunk_key, chunkStorageDefault)
-
-    def persist(self, place: PlaceStorage = None):
-        if place is not None:
-            place.value.chunks.add(self.this_chunk_key.chunk_id)
+        # Removed chunks start from the sequence numbers mirrored in the place.
+        chunk_seq = self.place.value.chunk_seqs.get(self.this_chunk_key.chunk_id, sp.pair(sp.nat(0), sp.nat(0)))
+        return self.data_map.get(self.this_chunk_key, sp.record(
+            next_id = sp.snd(chunk_seq),
+            counter = sp.fst(chunk_seq),
+            item_count = sp.nat(0),
+            stores = itemStoreIdsLiteral,
+            bounds = sp.none))
+
+    def persist(self, place: PlaceStorage):
+        """Persists the chunk and mirrors its sequence numbers
+        into the place. The place must be persisted as well."""
+        place.value.chunks.add(self.this_chunk_key.chunk_id)
+        place.value.chunk_seqs[self.this_chunk_key.chunk_id] = sp.pair(self.this_chunk.value.counter, self.this_chunk.value.next_id)
         self.data_map[self.this_chunk_key] = self.this_chunk.value
 
-    #def persist_or_remove(self, place: PlaceStorage = None):
-    #    with sp.if_(sp.len(self.this_chunk.value.storage) == 0):
-    #        if place is not None:
-    #            place.value.chunks.remove(self.this_chunk_key.chunk_id)
-    #        del self.data_map[self.this_chunk_key]
-    #    with sp.else_():
-    #        if place is not None:
-    #            place.value.chunks.add(self.this_chunk_key.chunk_id)
-    #        self.data_map[self.this_chunk_key] = self.this_chunk.value
+    def persist_or_remove(self, place: PlaceStorage):
+        """Persists the chunk or removes it if it's empty. Sequence
+        numbers of removed chunks are kept in the place, to keep
+        them monotonic. The place must be persisted as well."""
+        with sp.if_(self.this_chunk.value.item_count == 0):
+            place.value.chunks.remove(self.this_chunk_key.chunk_id)
+            place.value.chunk_seqs[self.this_chunk_key.chunk_id] = sp.pair(self.this_chunk.value.counter, self.this_chunk.value.next_id)
+            del self.data_map[self.this_chunk_key]
+        with sp.else_():
+            self.persist(place)
 
     def load(self, new_key, create: bool = False):
         self.this_chunk_key = sp.set_type_expr(new_key, chunkPlaceKeyType)
         if create is True:
+            assert hasattr(self, "place"), "ChunkStorage: place is required to create chunks"
             self.this_chunk.value = self.__get_or_default()
         else:
             self.this_chunk.value = self.__get()
 
     def count_items(self):
+        """Counts the items in the chunk's item stores. Only use
+        this to (re)compute item_count."""
         chunk_item_count = sp.local("chunk_item_count", sp.nat(0))
-        with sp.for_("issuer_map", self.this_chunk.value.storage.values()) as issuer_map:
-            with sp.for_("token_map", issuer_map.values()) as token_map:
-                chunk_item_count.value += sp.len(token_map)
+        with sp.for_("issuer_map", self.this_chunk.value.stores.values()) as issuer_map:
+            with sp.for_("store_ids", issuer_map.values()) as store_ids:
+                chunk_item_count.value += sp.len(store_ids)
         return chunk_item_count.value
 
-    # TODO: persist_or_remove
+    def set_bounds(self, chunk_bounds):
+        """Sets the chunk's bounds, if there are any for it in the
+        chunk_bounds map. Empty bytes clear the bounds."""
+        sp.set_type(chunk_bounds, chunkBoundsMapType)
+        with chunk_bounds.get_opt(self.this_chunk_key.chunk_id).match("Some") as bounds:
+            with sp.if_(sp.len(bounds) == 0):
+                self.this_chunk.value.bounds = sp.none
+            with sp.else_():
+                sp.verify(sp.len(bounds) == chunkBoundsLen, message = ErrorMessages.invalid_chunk_bounds())
+                self.this_chunk.value.bounds = sp.some(bounds)
 
     @property
     def value(self):
@@ -262,72 +352,131 @@ class ChunkStorage:
 
 #
 # Item storage
+# Items are stored flat, in a big_map keyed by chunk, issuer, fa2 and item id.
+# That way, touching an item doesn't (de)serialise all the other items in a chunk.
+itemKeyType = sp.TRecord(
+    chunk_key = chunkPlaceKeyType,
+    issuer = sp.TOption(sp.TAddress),
+    fa2 = sp.TAddress,
+    item_id = sp.TNat
+).layout(("chunk_key", ("issuer", ("fa2", "item_id"))))
+
+itemMapType = sp.TBigMap(itemKeyType, extensibleVariantItemType)
+
+
 # TODO: this kind of breaks ext type items... could maybe store them with a special contract address????
 # +++++ or maybe store ext type items in a special map???? or maybe it just doesn't matter under what token they are stored?
 # +++++ or maybe the issuer map could be a record(ext_items_map, tokens_map)
 class ItemStorage:
+    """Access to the items of an (issuer, fa2) store in a chunk.
+
+    Items are read and written directly in the items big_map,
+    only the ids of the items in the store are kept in the chunk.
+    The ids are only written back to the chunk if they changed."""
     @staticmethod
     def make():
-        return issuerStoreLiteral
+        return sp.big_map(tkey=itemKeyType, tvalue=extensibleVariantItemType)
 
-    def __init__(self, chunk_storage: ChunkStorage, issuer, fa2, create: bool = False):
+    def __init__(self, map, chunk_storage: ChunkStorage, issuer, fa2, create: bool = False):
+        sp.set_type(map, itemMapType) # set_type_expr gives compiler error
+        self.data_map = map
         self.chunk_storage = chunk_storage
         self.issuer = sp.set_type_expr(issuer, sp.TOption(sp.TAddress))
         self.fa2 = sp.set_type_expr(fa2, sp.TAddress)
         if create is True:
-            self.this_issuer_store = sp.local("this_issuer_store", self.__get_or_default_issuer())
-            self.this_fa2_store = sp.local("this_fa2_store", self.__get_or_default_fa2())
+            self.this_item_ids = sp.local("this_item_ids", self.__get_or_default_ids())
         else:
-            self.this_issuer_store = sp.local("this_issuer_store", self.__get_issuer())
-            self.this_fa2_store = sp.local("this_fa2_store", self.__get_fa2())
+            self.this_item_ids = sp.local("this_item_ids", self.__get_ids())
+        # Whether the ids changed, to skip writing back unchanged ids.
+        self.item_ids_changed = sp.local("item_ids_changed", False)
+
+    def __get_ids(self):
+        return self.chunk_storage.value.stores[self.issuer][self.fa2]
+
+    def __get_or_default_ids(self):
+        return self.chunk_storage.value.stores.get(self.issuer, sp.map(tkey=sp.TAddress, tvalue=itemIdSetType)).get(self.fa2, sp.set(t=sp.TNat))
+
+    def __make_key(self, item_id):
+        return sp.set_type_expr(sp.record(
+            chunk_key = self.chunk_storage.this_chunk_key,
+            issuer = self.issuer,
+            fa2 = self.fa2,
+            item_id = item_id), itemKeyType)
 
-    def __get_issuer(self):
-        return self.chunk_storage.value.storage.get(self.issuer)
+    def __getitem__(self, item_id):
+        return self.data_map[self.__make_key(item_id)]
 
-    def __get_or_default_issuer(self):
-        return self.chunk_storage.value.storage.get(self.issuer, issuerStoreLiteral)
+    def __setitem__(self, item_id, item):
+        """Updates an existing item. Use add() for new items."""
+        self.data_map[self.__make_key(item_id)] = item
 
-    def __get_fa2(self):
-        return self.this_issuer_store.value.get(self.fa2)
+    def __delitem__(self, item_id):
+        del self.data_map[self.__make_key(item_id)]
+        self.this_item_ids.value.remove(item_id)
+        self.item_ids_changed.value = True
 
-    def __get_or_default_fa2(self):
-        return self.this_issuer_store.value.get(self.fa2, tokenStoreLiteral)
+    def contains(self, item_id):
+        return self.this_item_ids.value.contains(item_id)
+
+    def add(self, item_id, item):
+        """Adds a new item."""
+        self.data_map[self.__make_key(item_id)] = item
+        self.this_item_ids.value.add(item_id)
+        self.item_ids_changed.value = True
 
     def persist(self):
-        self.this_issuer_store.value[self.fa2] = self.this_fa2_store.value
-        self.chunk_storage.value.storage[self.issuer] = self.this_issuer_store.value
+        with sp.if_(self.item_ids_changed.value):
+            self.chunk_storage.value.stores[self.issuer] = sp.update_map(
+                self.chunk_storage.value.stores.get(self.issuer, sp.map(tkey=sp.TAddress, tvalue=itemIdSetType)),
+                self.fa2, sp.some(self.this_item_ids.value))
+            self.item_ids_changed.value = False
 
     def persist_or_remove(self):
-        with sp.if_(sp.len(self.this_fa2_store.value) == 0):
-            del self.this_issuer_store.value[self.fa2]
-        with sp.else_():
-            self.this_issuer_store.value[self.fa2] = self.this_fa2_store.value
-
-        with sp.if_(sp.len(self.this_issuer_store.value) == 0):
-            del self.chunk_storage.value.storage[self.issuer]
+        with sp.if_(sp.len(self.this_item_ids.value) == 0):
+            issuer_store = sp.compute(sp.update_map(
+                self.chunk_storage.value.stores.get(self.issuer, sp.map(tkey=sp.TAddress, tvalue=itemIdSetType)),
+                self.fa2, sp.none))
+
+            with sp.if_(sp.len(issuer_store) == 0):
+                del self.chunk_storage.value.stores[self.issuer]
+            with sp.else_():
+                self.chunk_storage.value.stores[self.issuer] = issuer_store
         with sp.else_():
-            self.chunk_storage.value.storage[self.issuer] = self.this_issuer_store.value
+            self.persist()
 
     def load(self, new_issuer, new_fa2, create: bool = False):
         self.issuer = sp.set_type_expr(new_issuer, sp.TOption(sp.TAddress))
         self.fa2 = sp.set_type_expr(new_fa2, sp.TAddress)
         if create is True:
-            self.this_issuer_store.value = self.__get_or_default_issuer()
-            self.this_fa2_store.value = self.__get_or_default_fa2()
+            self.this_item_ids.value = self.__get_or_default_ids()
         else:
-            self.this_issuer_store.value = self.__get_issuer()
-            self.this_fa2_store.value = self.__get_fa2()
+            self.this_item_ids.value = self.__get_ids()
+        self.item_ids_changed.value = False
 
     @property
     def value(self):
-        # NOTE: always returns FA2 store.
-        return self.this_fa2_store.value
+        # NOTE: returns the store itself, items can be accessed with [].
+        return self
+
+    @property
+    def count(self):
+        return sp.len(self.this_item_ids.value)
 
 updateItemListType = sp.TRecord(
     item_id = sp.TNat,
     data = sp.TBytes
 ).layout(("item_id", "data"))
 
+permissionsQueryType = sp.TRecord(
+    place_key = placeKeyType,
+    permittee = sp.TAddress
+).layout(("place_key", "permittee"))
+
+ownerAndPermissionsType = sp.TRecord(
+    owner = sp.TAddress,
+    permissions = sp.TNat
+).layout(("owner", "permissions"))
+
 seqNumResultType = sp.TRecord(
     place_seq = sp.TBytes,
     chunk_seqs = sp.TMap(sp.TNat, sp.TBytes)
@@ -370,9 +519,21 @@ placeItemsType = sp.TRecord(
     ext = extensionArgType
 ).layout(("place_key", ("place_item_map", "ext")))
 
+updateItemBatchType = sp.TRecord(
+    item_ids = sp.TList(sp.TNat),
+    template = sp.TBytes,
+    offset = sp.TNat,
+    deltas = sp.TBytes
+).layout(("item_ids", ("template", ("offset", "deltas"))))
+
+updateItemsType = sp.TVariant(
+    items = sp.TList(updateItemListType),
+    batch = updateItemBatchType
+).layout(("items", "batch"))
+
 setItemDataType = sp.TRecord(
     place_key = placeKeyType,
-    update_map = sp.TMap(sp.TNat, sp.TMap(sp.TOption(sp.TAddress), sp.TMap(sp.TAddress, sp.TList(updateItemListType)))),
+    update_map = sp.TMap(sp.TNat, sp.TMap(sp.TOption(sp.TAddress), sp.TMap(sp.TAddress, updateItemsType))),
     ext = extensionArgType
 ).layout(("place_key", ("update_map", "ext")))
 
@@ -391,6 +552,20 @@ getItemType = sp.TRecord(
     ext = extensionArgType
 ).layout(("place_key", ("chunk_id", ("item_id", ("issuer", ("fa2", "ext"))))))
 
+getItemsType = sp.TRecord(
+    place_key = placeKeyType,
+    # chunk -> issuer -> fa2 -> item_id -> amount
+    item_map = sp.TMap(sp.TNat, sp.TMap(sp.TOption(sp.TAddress), sp.TMap(sp.TAddress, sp.TMap(sp.TNat, sp.TNat)))),
+    ext = extensionArgType
+).layout(("place_key", ("item_map", "ext")))
+
+# Used to merge payouts in get_items.
+payoutKeyType = sp.TRecord(
+    token_key = TL_LegacyRoyalties.t_token_key,
+    owner = sp.TAddress,
+    primary = sp.TBool
+).layout(("token_key", ("owner", "primary")))
+
 itemDataMinLen = sp.nat(7) # format 0 is 7 bytes
 placePropsColorLen = sp.nat(3) # 3 bytes for color
 
@@ -434,6 +609,34 @@ class Permission_map:
     def get_octal(self, set, owner, permittee, place_key):
         return set.get(self.make_key(owner, permittee, place_key), default_value = permissionNone)
 
+    def get_octal_opt(self, set, owner, permittee, place_key):
+        return set.get_opt(self.make_key(owner, permittee, place_key))
+
+    # Wildcard permissions apply to all of an owner's places in a place FA2.
+    def wildcard_key_type(self):
+        return sp.TRecord(owner = sp.TAddress,
+                          permittee = sp.TAddress,
+                          fa2 = sp.TAddress
+                          ).layout(("owner", ("permittee", "fa2")))
+
+    def make_wildcard(self):
+        return sp.big_map(tkey = self.wildcard_key_type(), tvalue = sp.TNat)
+
+    def make_wildcard_key(self, owner, permittee, fa2):
+        metakey = sp.record(owner = owner,
+                            permittee = permittee,
+                            fa2 = fa2)
+        return sp.set_type_expr(metakey, self.wildcard_key_type())
+
+    def add_wildcard(self, set, owner, permittee, fa2, perm):
+        set[self.make_wildcard_key(owner, permittee, fa2)] = perm
+
+    def remove_wildcard(self, set, owner, permittee, fa2):
+        del set[self.make_wildcard_key(owner, permittee, fa2)]
+
+    def get_octal_wildcard(self, set, owner, permittee, fa2):
+        return set.get(self.make_wildcard_key(owner, permittee, fa2), default_value = permissionNone)
+
 
 #
 # Like Operator_param from legacy Fa2. Defines type types for the set_permissions entry-point.
@@ -470,10 +673,44 @@ class PermissionParams:
             place_key = place_key)
         return sp.set_type_expr(r, cls.get_remove_type())
 
+    @classmethod
+    def get_add_wildcard_type(cls):
+        t = sp.TRecord(
+            owner = sp.TAddress,
+            permittee = sp.TAddress,
+            fa2 = sp.TAddress,
+            perm = sp.TNat).layout(("owner", ("permittee", ("fa2", "perm"))))
+        return t
+
+    @classmethod
+    def make_add_wildcard(cls, owner, permittee, fa2, perm):
+        r = sp.record(owner = owner,
+            permittee = permittee,
+            fa2 = fa2,
+            perm = perm)
+        return sp.set_type_expr(r, cls.get_add_wildcard_type())
+
+    @classmethod
+    def get_remove_wildcard_type(cls):
+        t = sp.TRecord(
+            owner = sp.TAddress,
+            permittee = sp.TAddress,
+            fa2 = sp.TAddress).layout(("owner", ("permittee", "fa2")))
+        return t
+
+    @classmethod
+    def make_remove_wildcard(cls, owner, permittee, fa2):
+        r = sp.record(owner = owner,
+            permittee = permittee,
+            fa2 = fa2)
+        return sp.set_type_expr(r, cls.get_remove_wildcard_type())
+
 setPermissionsType = sp.TList(sp.TVariant(
     add = PermissionParams.get_add_type(),
-    remove = PermissionParams.get_remove_type()
-).layout(("add", "remove")))
+    remove = PermissionParams.get_remove_type(),
+    add_wildcard = PermissionParams.get_add_wildcard_type(),
+    remove_wildcard = PermissionParams.get_remove_wildcard_type()
+).layout(("add", ("remove", ("add_wildcard", "remove_wildcard")))))
 
 
 #
@@ -490,7 +727,7 @@ class TL_World_v2(
     Upgradeable,
     sp.Contract):
     def __init__(self, administrator, registry, royalties_adapter, paused, items_tokens, metadata,
-        name, description, exception_optimization_level="default-line", debug_asserts=False, include_views=True):
+        name, description, version="2.0.0", exception_optimization_level="default-line", debug_asserts=False, include_views=True):
 
         sp.Contract.__init__(self)
 
@@ -511,8 +748,10 @@ class TL_World_v2(
 
         self.init_storage(
             permissions = self.permission_map.make(),
+            wildcard_permissions = self.permission_map.make_wildcard(),
             places = PlaceStorage.make(),
-            chunks = ChunkStorage.make()
+            chunks = ChunkStorage.make(),
+            items = ItemStorage.make()
         )
 
         self.addMetaSettings([
@@ -537,7 +776,7 @@ class TL_World_v2(
             authors=["852Kerfunkle <https://github.com/852Kerfunkle>"],
             source_location="https://github.com/tz1and",
             homepage="https://www.tz1and.com", license="UNLICENSED",
-            version="2.0.0")
+            version=version)
 
 
     #
@@ -571,28 +810,61 @@ class TL_World_v2(
                         upd.owner,
                         upd.permittee,
                         upd.place_key)
+                with arg.match("add_wildcard") as upd:
+                    # can only add permissions for allowed places
+                    self.onlyAllowedPlaceTokens(upd.fa2)
+                    # Sender must be the owner
+                    sp.verify(upd.owner == sp.sender, message = ErrorMessages.not_owner())
+                    sp.verify((upd.perm > permissionNone) & (upd.perm <= self.data.settings.max_permission), message = ErrorMessages.parameter_error())
+                    # Add wildcard permission
+                    self.permission_map.add_wildcard(self.data.wildcard_permissions,
+                        upd.owner,
+                        upd.permittee,
+                        upd.fa2,
+                        upd.perm)
+                with arg.match("remove_wildcard") as upd:
+                    # Sender must be the owner
+                    sp.verify(upd.owner == sp.sender, message = ErrorMessages.not_owner())
+                    # Remove wildcard permission
+                    self.permission_map.remove_wildcard(self.data.wildcard_permissions,
+                        upd.owner,
+                        upd.permittee,
+                        upd.fa2)
 
 
     # Don't use private lambda because we need to be able to update code
     # Also, duplicating code is cheaper at runtime.
     @sp.inline_result
-    def getPermissionsInline(self, place_key, permittee):
-        sp.set_type(place_key, placeKeyType)
+    def getPermissionsInline(self, place_owner: PlaceOwner, permittee):
         sp.set_type(permittee, sp.TAddress)
 
         # NOTE: no need to check if place contract is allowed in this world.
 
-        place_owner = sp.local("place_owner", FA2.getOwner(place_key.fa2, place_key.id).open_some())
+        owner = sp.compute(place_owner.get())
+
+        sp.result(sp.pair(owner, self.getPermissionsForOwnerInline(place_owner.place_key, owner, permittee)))
+
+
+    @sp.inline_result
+    def getPermissionsForOwnerInline(self, place_key, owner, permittee):
+        sp.set_type(place_key, placeKeyType)
+        sp.set_type(owner, sp.TAddress)
+        sp.set_type(permittee, sp.TAddress)
 
         # If permittee is the owner, he has full permission.
-        with sp.if_(place_owner.value == permittee):
-            sp.result(sp.pair(place_owner.value, self.data.settings.max_permission))
+        with sp.if_(owner == permittee):
+            sp.result(self.data.settings.max_permission)
         # Else, query permissions.
+        # NOTE: place permissions take precedence over wildcard permissions.
         with sp.else_():
-            sp.result(sp.pair(place_owner.value, self.permission_map.get_octal(self.data.permissions,
-                place_owner.value,
-                permittee,
-                place_key)))
+            with self.permission_map.get_octal_opt(self.data.permissions, owner, permittee, place_key).match_cases() as arg:
+                with arg.match("Some") as perm:
+                    sp.result(perm)
+                with arg.match("None"):
+                    sp.result(self.permission_map.get_octal_wildcard(self.data.wildcard_permissions,
+                        owner,
+                        permittee,
+                        place_key.fa2))
 
 
     @sp.entry_point(lazify = True, parameter_type=updatePlaceType)
@@ -602,7 +874,7 @@ class TL_World_v2(
         # Place token must be allowed
         self.onlyAllowedPlaceTokens(params.place_key.fa2)
 
-        permissions = sp.snd(self.getPermissionsInline(params.place_key, sp.sender))
+        permissions = sp.snd(self.getPermissionsInline(PlaceOwner(params.place_key), sp.sender))
 
         # Get or create the place.
         this_place = PlaceStorage(self.data.places, params.place_key, True)
@@ -651,6 +923,52 @@ class TL_World_v2(
         sp.verify(sp.len(data) >= itemDataMinLen, message = ErrorMessages.data_length())
 
 
+    def getChunkBoundsFromExt(self, ext):
+        """Returns the chunk bounds passed in ext, or an empty map.
+
+        Fails if they don't unpack to a map of chunk id to bounds."""
+        sp.set_type(ext, extensionArgType)
+        chunk_bounds = sp.local("chunk_bounds", sp.map(tkey=sp.TNat, tvalue=sp.TBytes))
+        with ext.match("Some") as ext_map:
+            with ext_map.get_opt("chunk_bounds").match("Some") as packed_bounds:
+                chunk_bounds.value = sp.unpack(packed_bounds, chunkBoundsMapType).open_some(ErrorMessages.invalid_chunk_bounds())
+        return chunk_bounds.value
+
+
+    @sp.inline_result
+    def expandItemDataBatch(self, batch):
+        """Inline function to expand a batch of item data updates.
+
+        Each item's data is the template with the bytes at offset
+        replaced by the item's delta. All deltas have the same length."""
+        sp.set_type(batch, updateItemBatchType)
+
+        # Deltas length must be a multiple of the number of items.
+        delta_len = sp.compute(sp.ediv(sp.len(batch.deltas), sp.len(batch.item_ids)).open_some(ErrorMessages.data_length()))
+        sp.verify(sp.snd(delta_len) == 0, message = ErrorMessages.data_length())
+
+        # Split the template around the delta.
+        delta_end = sp.compute(batch.offset + sp.fst(delta_len))
+        template_len = sp.compute(sp.len(batch.template))
+        sp.verify(delta_end <= template_len, message = ErrorMessages.data_length())
+        template_prefix = sp.compute(sp.slice(batch.template, 0, batch.offset).open_some())
+        # NOTE: fine to use abs here, delta_end is checked to be <= template_len.
+        template_suffix = sp.compute(sp.slice(batch.template, delta_end, abs(template_len - delta_end)).open_some())
+
+        batch_updates = sp.local("batch_updates", sp.list(t=updateItemListType))
+        delta_offset = sp.local("delta_offset", sp.nat(0))
+        with sp.for_("item_id", batch.item_ids) as item_id:
+            batch_updates.value.push(sp.record(
+                item_id = item_id,
+                data = sp.concat([
+                    template_prefix,
+                    sp.slice(batch.deltas, delta_offset.value, sp.fst(delta_len)).open_some(),
+                    template_suffix])))
+            delta_offset.value += sp.fst(delta_len)
+
+        sp.result(batch_updates.value)
+
+
     @sp.entry_point(lazify = True, parameter_type=placeItemsType)
     def place_items(self, params):
         self.onlyUnpaused()
@@ -659,7 +977,7 @@ class TL_World_v2(
         place_limits = self.getAllowedPlaceTokenLimits(params.place_key.fa2)
 
         # Caller must have PlaceItems permissions.
-        permissions = sp.snd(self.getPermissionsInline(params.place_key, sp.sender))
+        permissions = sp.snd(self.getPermissionsInline(PlaceOwner(params.place_key), sp.sender))
         sp.verify(permissions & permissionPlaceItems == permissionPlaceItems, message = ErrorMessages.no_permission())
         # TODO: special permission for sending items to place? Might be good.
 
@@ -680,6 +998,9 @@ class TL_World_v2(
         # Get or create the place and chunk.
         this_place = PlaceStorage(self.data.places, params.place_key, True)
 
+        # Optional chunk bounds.
+        chunk_bounds = sp.compute(self.getChunkBoundsFromExt(params.ext))
+
         # Our token transfer map.
         transferMap = TokenTransfer.FA2TokenTransferMap()
 
@@ -689,13 +1010,12 @@ class TL_World_v2(
         with sp.for_("chunk_item", params.place_item_map.items()) as chunk_item:
             chunk_key = sp.compute(sp.record(place_key = params.place_key, chunk_id = chunk_item.key))
 
-            this_chunk = ChunkStorage(self.data.chunks, chunk_key, True)
-
-            # Count items in place item storage.
-            chunk_item_count = this_chunk.count_items()
+            this_chunk = ChunkStorage(self.data.chunks, chunk_key, True, this_place)
+            this_chunk.set_bounds(chunk_bounds)
 
-            # Make sure chunk item limit is not exceeded.
-            sp.verify(chunk_item_count + chunk_add_item_count.value.get(chunk_item.key, sp.nat(0)) <= place_limits.chunk_item_limit, message = ErrorMessages.chunk_item_limit())
+            # Update the chunk's item count and make sure chunk item limit is not exceeded.
+            this_chunk.value.item_count += chunk_add_item_count.value.get(chunk_item.key, sp.nat(0))
+            sp.verify(this_chunk.value.item_count <= place_limits.chunk_item_limit, message = ErrorMessages.chunk_item_limit())
 
             # For each fa2 in the map.
             with sp.for_("send_to_place_item", chunk_item.value.items()) as send_to_place_item:
@@ -704,7 +1024,7 @@ class TL_World_v2(
 
                 with sp.for_("fa2_item", send_to_place_item.value.items()) as fa2_item:
                     # Get or create item storage.
-                    item_store = ItemStorage(this_chunk, issuer, fa2_item.key, True)
+                    item_store = ItemStorage(self.data.items, this_chunk, issuer, fa2_item.key, True)
 
                     transferMap.add_fa2(fa2_item.key)
 
@@ -725,7 +1045,7 @@ class TL_World_v2(
                                 sp.pair("Debug assert: Map already contains item", this_chunk.value.next_id))
 
                         # Add item to storage.
-                        item_store.value[this_chunk.value.next_id] = curr
+                        item_store.add(this_chunk.value.next_id, curr)
 
                         # Increment next_id.
                         this_chunk.value.next_id += 1
@@ -753,28 +1073,50 @@ class TL_World_v2(
         #self.onlyAllowedPlaceTokens(params.place_key.fa2)
 
         # Caller must have ModifyAll or ModifyOwn permissions.
-        permissions = sp.snd(self.getPermissionsInline(params.place_key, sp.sender))
+        permissions = sp.snd(self.getPermissionsInline(PlaceOwner(params.place_key), sp.sender))
         hasModifyAll = permissions & permissionModifyAll == permissionModifyAll
 
         # If ModifyAll permission is not given, make sure update map only contains sender items.
         with sp.if_(~hasModifyAll):
             with sp.for_("issuer_map", params.update_map.values()) as issuer_map:
+                # Empty issuer maps would skip the permission check.
+                sp.verify(sp.len(issuer_map) > 0, message = ErrorMessages.parameter_error())
                 with sp.for_("remove_key", issuer_map.keys()) as remove_key:
                     sp.verify(remove_key == sp.some(sp.sender), message = ErrorMessages.no_permission())
 
+        # Get the place - must exist.
+        this_place = PlaceStorage(self.data.places, params.place_key)
+
+        # Optional chunk bounds.
+        chunk_bounds = sp.compute(self.getChunkBoundsFromExt(params.ext))
+
+        # Setting chunk bounds requires ModifyAll or PlaceItems permissions.
+        # The place owner has all permissions.
+        with sp.if_(sp.len(chunk_bounds) > 0):
+            sp.verify(hasModifyAll | (permissions & permissionPlaceItems == permissionPlaceItems), message = ErrorMessages.no_permission())
+
         # Update items.
         with sp.for_("chunk_item", params.update_map.items()) as chunk_item:
             chunk_key = sp.compute(sp.record(place_key = params.place_key, chunk_id = chunk_item.key))
 
             # Get the chunk - must exist.
             this_chunk = ChunkStorage(self.data.chunks, chunk_key)
+            this_chunk.set_bounds(chunk_bounds)
 
             with sp.for_("issuer_item", chunk_item.value.items()) as issuer_item:
                 with sp.for_("fa2_item", issuer_item.value.items()) as fa2_item:
                     # Get item store - must exist.
-                    item_store = ItemStorage(this_chunk, issuer_item.key, fa2_item.key)
+                    item_store = ItemStorage(self.data.items, this_chunk, issuer_item.key, fa2_item.key)
+
+                    # Expand batched updates.
+                    updates = sp.local("updates", sp.list(t=updateItemListType))
+                    with fa2_item.value.match_cases() as arg:
+                        with arg.match("items") as items:
+                            updates.value = items
+                        with arg.match("batch") as batch:
+                            updates.value = self.expandItemDataBatch(batch)
 
-                    with sp.for_("update", fa2_item.value) as update:
+                    with sp.for_("update", updates.value) as update:
                         self.validateItemData(update.data)
 
                         with item_store.value[update.item_id].match_cases() as arg:
@@ -786,14 +1128,16 @@ class TL_World_v2(
                             with arg.match("ext"):
                                 item_store.value[update.item_id] = sp.variant("ext", update.data)
 
-                    # Persist item storage.
-                    item_store.persist()
+                    # NOTE: no need to persist item storage, item count doesn't change.
 
             # Increment chunk interaction counter, as next_id does not change.
             this_chunk.value.counter += 1
 
             # Persist chunk
-            this_chunk.persist()
+            this_chunk.persist(this_place)
+
+        # Persist place, for the chunk sequence numbers.
+        this_place.persist()
 
 
     @sp.inline_result
@@ -824,7 +1168,7 @@ class TL_World_v2(
         #self.onlyAllowedPlaceTokens(params.place_key.fa2)
 
         # Caller must have ModifyAll or ModifyOwn permissions.
-        owner, permissions = sp.match_pair(self.getPermissionsInline(params.place_key, sp.sender))
+        owner, permissions = sp.match_pair(self.getPermissionsInline(PlaceOwner(params.place_key), sp.sender))
         hasModifyAll = permissions & permissionModifyAll == permissionModifyAll
 
         # If ModifyAll permission is not given, make sure remove map only contains sender items.
@@ -853,7 +1197,7 @@ class TL_World_v2(
 
                 with sp.for_("fa2_item", issuer_item.value.items()) as fa2_item:
                     # Get item store - must exist.
-                    item_store = ItemStorage(this_chunk, issuer_item.key, fa2_item.key)
+                    item_store = ItemStorage(self.data.items, this_chunk, issuer_item.key, fa2_item.key)
 
                     transferMap.add_fa2(fa2_item.key)
                     
@@ -869,24 +1213,30 @@ class TL_World_v2(
                         # Delete item from storage.
                         del item_store.value[curr]
 
+                    # Update chunk item count.
+                    # NOTE: fine to use abs here, all items in the set must exist.
+                    this_chunk.value.item_count = abs(this_chunk.value.item_count - sp.len(fa2_item.value))
+
                     # Remove the item store if empty.
                     item_store.persist_or_remove()
 
             # Increment chunk interaction counter, as next_id does not change.
             this_chunk.value.counter += 1
 
-            # Persist chunk
-            this_chunk.persist()
+            # Persist chunk, or remove it if empty.
+            this_chunk.persist_or_remove(this_place)
+
+        # Persist place, for the chunk sequence numbers.
+        this_place.persist()
 
         # Transfer tokens.
         transferMap.transfer_tokens(sp.self_address)
 
 
     @sp.inline_result
-    def issuerOrValueToOrPlaceOwnerInline(self, place_key, issuer, value_to):
+    def issuerOrValueToOrPlaceOwnerInline(self, place_owner: PlaceOwner, issuer, value_to):
         """Inline function for getting where to send the value of an item to
         (either issuer, value_to or place owner)."""
-        sp.set_type(place_key, placeKeyType)
         sp.set_type(issuer, sp.TOption(sp.TAddress))
         sp.set_type(value_to, sp.TOption(sp.TAddress))
 
@@ -894,7 +1244,7 @@ class TL_World_v2(
             with arg.match("None", "issuer_none"):
                 with value_to.match_cases() as arg:
                     with arg.match("None", "value_to_none"):
-                        sp.result(FA2.getOwner(place_key.fa2, place_key.id).open_some())
+                        sp.result(place_owner.get())
                     with arg.match("Some") as open:
                         sp.result(open)
 
@@ -917,10 +1267,10 @@ class TL_World_v2(
 
         # If the issuer is none, the value_to or owner is the item owner.
         # Used for sending the value to the correct address.
-        item_owner = self.issuerOrValueToOrPlaceOwnerInline(params.place_key, params.issuer, this_place.value.value_to)
+        item_owner = self.issuerOrValueToOrPlaceOwnerInline(PlaceOwner(params.place_key), params.issuer, this_place.value.value_to)
 
         # Get item store - must exist.
-        item_store = ItemStorage(this_chunk, params.issuer, params.fa2)
+        item_store = ItemStorage(self.data.items, this_chunk, params.issuer, params.fa2)
 
         # Swap based on item type.
         with item_store.value[params.item_id].match_cases() as arg:
@@ -953,6 +1303,8 @@ class TL_World_v2(
                     item_store.value[params.item_id] = sp.variant("item", the_item.value)
                 with sp.else_():
                     del item_store.value[params.item_id]
+                    # NOTE: fine to use abs here, the item exists.
+                    this_chunk.value.item_count = abs(this_chunk.value.item_count - 1)
 
             # ext items are unswappable.
             with arg.match("ext"):
@@ -964,8 +1316,128 @@ class TL_World_v2(
         # Increment chunk interaction counter, as next_id does not change.
         this_chunk.value.counter += 1
 
-        # Persist chunk
-        this_chunk.persist()
+        # Persist chunk, or remove it if empty, and place.
+        this_chunk.persist_or_remove(this_place)
+        this_place.persist()
+
+
+    @sp.entry_point(lazify = True, parameter_type=getItemsType)
+    def get_items(self, params):
+        """Get (buy) multiple items, possibly more than one of each.
+
+        Each chunk is loaded once, token transfers are merged per FA2
+        and payouts are merged per recipient. Royalties are fetched
+        with a single view call."""
+        self.onlyUnpaused()
+
+        # NOTE: doesn't matter if place token is not allowed.
+        #self.onlyAllowedPlaceTokens(params.place_key.fa2)
+
+        # Get place - must exist.
+        this_place = PlaceStorage(self.data.places, params.place_key)
+
+        # Only resolve the place owner once.
+        place_owner = PlaceOwner(params.place_key)
+
+        # Token transfer and payout maps.
+        transferMap = TokenTransfer.FA2TokenTransferMap()
+        sendMap = TokenTransfer.TokenSendMap()
+
+        # The sum of the value of all items.
+        total_value = sp.local("total_value", sp.mutez(0))
+
+        # The value to pay out, merged by token, owner and primary.
+        payout_map = sp.local("payout_map", sp.map(tkey=payoutKeyType, tvalue=sp.TMutez))
+        token_keys = sp.local("token_keys", sp.set(t=TL_LegacyRoyalties.t_token_key))
+
+        with sp.for_("chunk_item", params.item_map.items()) as chunk_item:
+            chunk_key = sp.compute(sp.record(place_key = params.place_key, chunk_id = chunk_item.key))
+
+            # Get the chunk - must exist.
+            this_chunk = ChunkStorage(self.data.chunks, chunk_key)
+
+            with sp.for_("issuer_item", chunk_item.value.items()) as issuer_item:
+                # If the issuer is none, the value_to or owner is the item owner.
+                # Used for sending the value to the correct address.
+                item_owner = sp.compute(self.issuerOrValueToOrPlaceOwnerInline(place_owner, issuer_item.key, this_place.value.value_to))
+
+                with sp.for_("fa2_item", issuer_item.value.items()) as fa2_item:
+                    # Get item store - must exist.
+                    item_store = ItemStorage(self.data.items, this_chunk, issuer_item.key, fa2_item.key)
+
+                    transferMap.add_fa2(fa2_item.key)
+
+                    with sp.for_("get_entry", fa2_item.value.items()) as get_entry:
+                        sp.verify(get_entry.value > 0, message = ErrorMessages.parameter_error())
+
+                        # Swap based on item type.
+                        with item_store.value[get_entry.key].match_cases() as arg:
+                            # For tz1and native items.
+                            with arg.match("item") as immutable:
+                                # This is silly but required because match args are not mutable.
+                                the_item = sp.local("the_item", immutable)
+
+                                # Make sure it's for sale.
+                                sp.verify(the_item.value.rate > sp.mutez(0), message = ErrorMessages.not_for_sale())
+
+                                # The value of the items bought.
+                                item_value = sp.compute(sp.split_tokens(the_item.value.rate, get_entry.value, sp.nat(1)))
+                                total_value.value += item_value
+
+                                # Collect the value to pay out, royalties are fetched later.
+                                token_key = sp.compute(sp.record(fa2 = fa2_item.key, id = the_item.value.token_id))
+                                token_keys.value.add(token_key)
+                                payout_key = sp.compute(sp.record(token_key = token_key, owner = item_owner, primary = the_item.value.primary))
+                                payout_map.value[payout_key] = payout_map.value.get(payout_key, sp.mutez(0)) + item_value
+
+                                # Transfer items to buyer.
+                                transferMap.add_token(fa2_item.key, sp.sender, the_item.value.token_id, get_entry.value)
+
+                                # Reduce the item count in storage or remove it.
+                                with sp.if_(the_item.value.amount > get_entry.value):
+                                    # NOTE: fine to use abs here, token amout is checked to be > get amount.
+                                    the_item.value.amount = abs(the_item.value.amount - get_entry.value)
+                                    item_store.value[get_entry.key] = sp.variant("item", the_item.value)
+                                with sp.else_():
+                                    # Can't get more than there is.
+                                    sp.verify(the_item.value.amount == get_entry.value, message = ErrorMessages.parameter_error())
+                                    del item_store.value[get_entry.key]
+                                    # NOTE: fine to use abs here, the item exists.
+                                    this_chunk.value.item_count = abs(this_chunk.value.item_count - 1)
+
+                            # ext items are unswappable.
+                            with arg.match("ext"):
+                                sp.failwith(ErrorMessages.wrong_item_type())
+
+                    # Remove the item store if empty.
+                    item_store.persist_or_remove()
+
+            # Increment chunk interaction counter, as next_id does not change.
+            this_chunk.value.counter += 1
+
+            # Persist chunk, or remove it if empty.
+            this_chunk.persist_or_remove(this_place)
+
+        # Persist place, for the chunk sequence numbers.
+        this_place.persist()
+
+        # Make sure the transfered amount is correct.
+        sp.verify(total_value.value == sp.amount, message = ErrorMessages.wrong_amount())
+
+        # Get the royalties for all items.
+        royalties_map = sp.compute(TL_RoyaltiesAdapter.getRoyaltiesBatch(
+            self.data.settings.royalties_adapter, token_keys.value).open_some())
+
+        # Add fees, royalties, value.
+        with sp.for_("payout_item", payout_map.value.items()) as payout_item:
+            TL_RoyaltiesAdapter.addValueRoyaltiesFeesInline(sendMap, self.data.settings.fees, self.data.settings.fees_to, payout_item.value,
+                payout_item.key.owner, royalties_map[payout_item.key.token_key], payout_item.key.primary)
+
+        # Transfer items to buyer.
+        transferMap.transfer_tokens(sp.self_address)
+
+        # Send fees, royalties, value.
+        sendMap.transfer()
 
 
     #
@@ -1002,8 +1474,8 @@ class TL_World_v2(
 
         # If the migration map isn't empty
         with sp.if_(sp.len(params.item_map) > 0):
-            # Keep a running count of items, so we can switch chunks.
-            add_item_count = sp.local("add_item_count", sp.nat(0))
+            # NOTE: chunks are new, so the chunk's item_count
+            # is used as the running count to switch chunks.
             # The current chunk we're working on.
             chunk_key = sp.local("chunk_key", sp.record(place_key = params.place_key, chunk_id = sp.nat(0)))
 
@@ -1015,18 +1487,18 @@ class TL_World_v2(
             sp.compute(TL_TokenRegistry.onlyRegistered(self.data.settings.registry, fa2_set.value).open_some())
 
             # Get or create the current chunk.
-            this_chunk = ChunkStorage(self.data.chunks, chunk_key.value, True)
+            this_chunk = ChunkStorage(self.data.chunks, chunk_key.value, True, this_place)
 
             # For each fa2 in the map.
             with sp.for_("issuer_item", params.item_map.items()) as issuer_item:
                 with sp.for_("fa2_item", issuer_item.value.items()) as fa2_item:
                     # Get or create item storage.
-                    item_store = ItemStorage(this_chunk, sp.some(issuer_item.key), fa2_item.key, True)
+                    item_store = ItemStorage(self.data.items, this_chunk, sp.some(issuer_item.key), fa2_item.key, True)
 
                     # For each item in the list.
                     with sp.for_("curr", fa2_item.value) as curr:
                         # if we added more items than the chunk limit, switch chunks and reset add count to 0
-                        with sp.if_(add_item_count.value >= place_limits.chunk_item_limit):
+                        with sp.if_(this_chunk.value.item_count >= place_limits.chunk_item_limit):
                             # Remove itemstore if empty. Can happen in some cases,
                             # because the item store is created at the beginning of a token loop.
                             # Alternatively we could call item_store_map.get_or_create() inside the loop.
@@ -1035,8 +1507,7 @@ class TL_World_v2(
                             # Persist chunk
                             this_chunk.persist(this_place)
 
-                            # Reset counters and increment current chunk.
-                            add_item_count.value = sp.nat(0)
+                            # Increment current chunk.
                             chunk_key.value = sp.record(place_key = params.place_key, chunk_id = chunk_key.value.chunk_id + sp.nat(1))
                             sp.verify(chunk_key.value.chunk_id < place_limits.chunk_limit, message = ErrorMessages.chunk_limit())
 
@@ -1056,13 +1527,11 @@ class TL_World_v2(
                                 sp.pair("Debug assert: Map already contains item", this_chunk.value.next_id))
 
                         # Add item to storage.
-                        item_store.value[this_chunk.value.next_id] = curr
+                        item_store.add(this_chunk.value.next_id, curr)
 
-                        # Increment next_id.
+                        # Increment next_id and item count.
                         this_chunk.value.next_id += sp.nat(1)
-
-                        # Add to item add counter
-                        add_item_count.value += sp.nat(1)
+                        this_chunk.value.item_count += sp.nat(1)
 
                     item_store.persist()
 
@@ -1078,6 +1547,35 @@ class TL_World_v2(
     #
     # Views
     #
+    def getChunkData(self, chunk_key, this_chunk):
+        """Collects the items in a chunk into the nested
+        chunk data type returned from views."""
+        sp.set_type(chunk_key, chunkPlaceKeyType)
+        sp.set_type(this_chunk, chunkStorageType)
+
+        chunk_items = sp.local("chunk_items", chunkStoreLiteral)
+        with sp.for_("issuer_item", this_chunk.stores.items()) as issuer_item:
+            issuer_items = sp.local("issuer_items", issuerStoreLiteral)
+            with sp.for_("fa2_item", issuer_item.value.items()) as fa2_item:
+                # Only look up the ids of live items in the store.
+                fa2_items = sp.local("fa2_items", tokenStoreLiteral)
+                with sp.for_("item_id", fa2_item.value.elements()) as item_id:
+                    fa2_items.value[item_id] = self.data.items[sp.record(
+                        chunk_key = chunk_key,
+                        issuer = issuer_item.key,
+                        fa2 = fa2_item.key,
+                        item_id = item_id)]
+                issuer_items.value[fa2_item.key] = fa2_items.value
+            chunk_items.value[issuer_item.key] = issuer_items.value
+
+        return sp.record(
+            next_id = this_chunk.next_id,
+            counter = this_chunk.counter,
+            item_count = this_chunk.item_count,
+            bounds = this_chunk.bounds,
+            storage = chunk_items.value)
+
+
     def addViews(self):
         def get_place_data(self, params):
             sp.set_type(params, placeDataParam)
@@ -1087,14 +1585,65 @@ class TL_World_v2(
                     chunks = {}))
 
                 with sp.for_("chunk_id", Utils.openSomeOrDefault(params.chunk_ids, res.value.place.chunks).elements()) as chunk_id:
-                    this_chunk_opt = self.data.chunks.get_opt(sp.record(place_key = params.place_key, chunk_id = chunk_id))
+                    chunk_key = sp.compute(sp.record(place_key = params.place_key, chunk_id = chunk_id))
+                    this_chunk_opt = self.data.chunks.get_opt(chunk_key)
                     with this_chunk_opt.match("Some") as this_chunk:
-                        res.value.chunks[chunk_id] = this_chunk
+                        res.value.chunks[chunk_id] = self.getChunkData(chunk_key, this_chunk)
 
                 sp.result(res.value)
         self.get_place_data = sp.onchain_view(pure=True)(get_place_data)
 
 
+        def get_place_data_paged(self, params):
+            """Returns the items of an item store in a chunk, starting at
+            from_item_id and looking at no more than limit item ids. The
+            returned cursor is the from_item_id for the next page."""
+            sp.set_type(params, placeDataPagedParam)
+            with sp.set_result_type(placeDataPagedResultType):
+                res = sp.local("res", sp.record(
+                    items = tokenStoreLiteral,
+                    cursor = sp.none))
+
+                chunk_key = sp.compute(sp.record(place_key = params.place_key, chunk_id = params.chunk_id))
+                with self.data.chunks.get_opt(chunk_key).match("Some") as this_chunk:
+                    # Bound the item id range to look at, to bound gas use.
+                    end_item_id = sp.compute(sp.min(params.from_item_id + params.limit, this_chunk.next_id))
+
+                    # Walk the id range and only look up the ids of live
+                    # items in the store. Doesn't iterate the whole store.
+                    store_ids = sp.compute(this_chunk.stores.get(params.issuer, sp.map(tkey=sp.TAddress, tvalue=itemIdSetType)).get(params.fa2, sp.set(t=sp.TNat)))
+                    with sp.for_("item_id", sp.range(params.from_item_id, end_item_id)) as item_id:
+                        with sp.if_(store_ids.contains(item_id)):
+                            res.value.items[item_id] = self.data.items[sp.record(
+                                chunk_key = chunk_key,
+                                issuer = params.issuer,
+                                fa2 = params.fa2,
+                                item_id = item_id)]
+
+                    with sp.if_(end_item_id < this_chunk.next_id):
+                        res.value.cursor = sp.some(end_item_id)
+
+                sp.result(res.value)
+        self.get_place_data_paged = sp.onchain_view(pure=True)(get_place_data_paged)
+
+
+        def get_chunk_bounds(self, place_key):
+            """Returns the bounds of all chunks in a place. Allows
+            clients to only fetch the chunks in view.
+
+            NOTE: bounds are asserted by the client that placed or
+            updated items, only their length is validated. They may
+            not contain all items in the chunk."""
+            sp.set_type(place_key, placeKeyType)
+            with sp.set_result_type(sp.TMap(sp.TNat, sp.TOption(sp.TBytes))):
+                res = sp.local("res", sp.map(tkey=sp.TNat, tvalue=sp.TOption(sp.TBytes)))
+                with self.data.places.get_opt(place_key).match("Some") as this_place:
+                    with sp.for_("chunk_id", this_place.chunks.elements()) as chunk_id:
+                        res.value[chunk_id] = self.data.chunks[sp.record(place_key = place_key, chunk_id = chunk_id)].bounds
+                sp.result(res.value)
+        self.get_chunk_bounds = sp.onchain_view(pure=True)(get_chunk_bounds)
+
+
         def get_place_seqnum(self, params):
             sp.set_type(params, placeSeqNumParam)
 
@@ -1106,12 +1655,10 @@ class TL_World_v2(
                         # Collect chunk sequence numbers.
                         chunk_sequence_numbers_map = sp.local("chunk_sequence_numbers_map", {}, seqNumResultType.chunk_seqs)
 
+                        # NOTE: chunk sequence numbers are mirrored in the place, no need to load chunks.
                         with sp.for_("chunk_id", Utils.openSomeOrDefault(params.chunk_ids, this_place.chunks).elements()) as chunk_id:
-                            this_chunk_opt = self.data.chunks.get_opt(sp.record(place_key = params.place_key, chunk_id = chunk_id))
-                            with this_chunk_opt.match("Some") as this_chunk:
-                                chunk_sequence_numbers_map.value[chunk_id] = sp.sha3(sp.pack(sp.pair(
-                                    this_chunk.counter,
-                                    this_chunk.next_id)))
+                            with this_place.chunk_seqs.get_opt(chunk_id).match("Some") as chunk_seq:
+                                chunk_sequence_numbers_map.value[chunk_id] = sp.sha3(sp.pack(chunk_seq))
 
                         # Return the result.
                         sp.result(sp.record(
@@ -1126,10 +1673,45 @@ class TL_World_v2(
 
 
         def get_permissions(self, query):
-            sp.set_type(query, sp.TRecord(
-                place_key = placeKeyType,
-                permittee = sp.TAddress
-            ).layout(("place_key", "permittee")))
+            sp.set_type(query, permissionsQueryType)
             with sp.set_result_type(sp.TNat):
-                sp.result(sp.snd(self.getPermissionsInline(query.place_key, query.permittee)))
+                sp.result(sp.snd(self.getPermissionsInline(PlaceOwner(query.place_key), query.permittee)))
         self.get_permissions = sp.onchain_view(pure=True)(get_permissions)
+
+
+        def get_owner_and_permissions(self, query):
+            sp.set_type(query, permissionsQueryType)
+            with sp.set_result_type(ownerAndPermissionsType):
+                owner, permissions = sp.match_pair(self.getPermissionsInline(PlaceOwner(query.place_key), query.permittee))
+                sp.result(sp.record(owner = owner, permissions = permissions))
+        self.get_owner_and_permissions = sp.onchain_view(pure=True)(get_owner_and_permissions)
+
+
+        def get_permissions_batch(self, query):
+            sp.set_type(query, sp.TList(permissionsQueryType))
+            with sp.set_result_type(sp.TMap(permissionsQueryType, sp.TNat)):
+                # Group place token ids by place FA2.
+                place_token_ids = sp.local("place_token_ids", sp.map(tkey=sp.TAddress, tvalue=sp.TSet(sp.TNat)))
+                with sp.for_("q", query) as q:
+                    with sp.if_(~place_token_ids.value.contains(q.place_key.fa2)):
+                        place_token_ids.value[q.place_key.fa2] = sp.set([])
+                    place_token_ids.value[q.place_key.fa2].add(q.place_key.id)
+
+                # Resolve owners with one view per place FA2, if it supports
+                # get_owners. Otherwise fall back to get_owner per place.
+                place_owners = sp.local("place_owners", sp.map(tkey=placeKeyType, tvalue=sp.TAddress))
+                with sp.for_("fa2_item", place_token_ids.value.items()) as fa2_item:
+                    with FA2.getOwners(fa2_item.key, fa2_item.value).match_cases() as arg:
+                        with arg.match("Some", "owners") as owners:
+                            with sp.for_("owner_item", owners.items()) as owner_item:
+                                place_owners.value[sp.record(fa2 = fa2_item.key, id = owner_item.key)] = owner_item.value
+                        with arg.match("None"):
+                            with sp.for_("token_id", fa2_item.value.elements()) as token_id:
+                                place_owners.value[sp.record(fa2 = fa2_item.key, id = token_id)] = FA2.getOwner(fa2_item.key, token_id).open_some()
+
+                # Get permissions for each query.
+                result = sp.local("result", sp.map(tkey=permissionsQueryType, tvalue=sp.TNat))
+                with sp.for_("q", query) as q:
+                    result.value[q] = self.getPermissionsForOwnerInline(q.place_key, place_owners.value[q.place_key], q.permittee)
+                sp.result(result.value)
+        self.get_permissions_batch = sp.onchain_view(pure=True)(get_permissions_batch)
@@ -89,20 +89,22 @@ class tz1andItems_v2(
         Administrable.__init__(self, admin, include_views = False)
         Upgradeable.__init__(self)
 
-def generateItemCollectionProxy():
+def generateItemCollectionProxy(fungible_base=FA2.Fa2Fungible):
     # TODO: add name/description to args.
+    # NOTE: fungible_base selects the ledger backend,
+    # FA2.Fa2Fungible or FA2.Fa2FungibleGrouped.
     class ItemCollection(
         Administrable,
         FA2.ChangeMetadata,
         FA2.MintFungible,
         FA2.BurnFungible,
         FA2.Royalties,
-        FA2.Fa2Fungible
+        fungible_base
     ):
         """tz1and Collection"""
 
         def __init__(self, metadata, admin, blacklist, include_views=True):
-            FA2.Fa2Fungible.__init__(
+            fungible_base.__init__(
                 self, metadata=metadata,
                 name="tz1and Collection", description="A collection of tz1and Item NFTs.",
                 # NOTE: If proxied, the FA2 doesn't need to be pausable - can
@@ -125,6 +127,10 @@ def generateItemCollectionProxy():
 
 ItemCollectionProxyBase, ItemCollectionProxyParent, ItemCollectionProxyChild = generateItemCollectionProxy()
 
+# NOTE: Collection with the grouped ledger. Only used to compare gas and
+# storage of the fungible ledger backends in the gas test suite.
+ItemCollectionGroupedProxyBase, ItemCollectionGroupedProxyParent, ItemCollectionGroupedProxyChild = generateItemCollectionProxy(FA2.Fa2FungibleGrouped)
+
 
 def generatePlaceTokenProxy():
     class Place(
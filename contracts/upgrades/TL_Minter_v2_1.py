@@ -76,3 +76,43 @@ class TL_Minter_v2_1(TL_Minter_v2.TL_Minter_v2):
                     royalties=params.royalties))
             )],
             params.collection)
+
+
+    #
+    # Batch entry points
+    #
+    def checkBatchBlacklisted(self, params):
+        """Check sender and all recipients in the batch with a single view call."""
+        addresses = sp.local("addresses", sp.set([sp.sender]))
+        with sp.for_("tokens", params.values()) as tokens:
+            with sp.for_("token", tokens) as token:
+                addresses.value.add(token.to_)
+        sp.compute(TL_Blacklist.checkBlacklisted(self.blacklist, addresses.value).open_some(sp.unit))
+
+
+    @sp.entry_point(lazify = True, parameter_type = TL_Minter_v2.t_mint_batch)
+    def mint_public_batch(self, params):
+        """Minting multiple items in public collections.
+
+        Checks each collection once and sends one mint per collection."""
+        self.onlyUnpaused()
+
+        self.checkBatchBlacklisted(params)
+
+        with sp.for_("collection_item", params.items()) as collection_item:
+            self.onlyPublicCollection(collection_item.key)
+            self.mintBatchInline(collection_item.key, collection_item.value)
+
+
+    @sp.entry_point(lazify = True, parameter_type = TL_Minter_v2.t_mint_batch)
+    def mint_private_batch(self, params):
+        """Minting multiple items in private collections.
+
+        Checks each collection once and sends one mint per collection."""
+        self.onlyUnpaused()
+
+        self.checkBatchBlacklisted(params)
+
+        with sp.for_("collection_item", params.items()) as collection_item:
+            self.onlyOwnerOrCollaboratorPrivate(collection_item.key, sp.sender)
+            self.mintBatchInline(collection_item.key, collection_item.value)
@@ -0,0 +1,40 @@
+import smartpy as sp
+
+from contracts import TL_World_v2
+
+
+class TL_World_v2_1(TL_World_v2.TL_World_v2):
+    def __init__(self, administrator, registry, royalties_adapter, paused, items_tokens, metadata,
+        name, description, version="2.1.0", exception_optimization_level="default-line", debug_asserts=False, include_views=True):
+
+        TL_World_v2.TL_World_v2.__init__(self, administrator,
+            registry, royalties_adapter, paused, items_tokens, metadata,
+            name, description, version, exception_optimization_level,
+            debug_asserts, include_views)
+
+    @sp.entry_point(lazify = True, parameter_type=TL_World_v2.placeKeyType)
+    def recount_items(self, place_key):
+        """Admin only. Recomputes the item_count of all chunks
+        in a place from the item ids in the chunk's stores.
+
+        Kept separate from migration, which still recieves
+        migrations from v1."""
+        self.onlyAdministrator()
+
+        # Get the place - must exist.
+        this_place = TL_World_v2.PlaceStorage(self.data.places, place_key)
+
+        with sp.for_("chunk_id", this_place.value.chunks.elements()) as chunk_id:
+            # Get the chunk - must exist.
+            this_chunk = TL_World_v2.ChunkStorage(self.data.chunks, sp.record(place_key = place_key, chunk_id = chunk_id))
+
+            # Recount items in the chunk.
+            this_chunk.value.item_count = this_chunk.count_items()
+
+            # Don't increment chunk interaction counter, items don't change.
+
+            # Persist chunk, also mirrors chunk_seqs.
+            this_chunk.persist(this_place)
+
+        # Persist place.
+        this_place.persist()
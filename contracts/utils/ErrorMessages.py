@@ -16,6 +16,7 @@ def no_amount(prefix=""):        return make_error_msg(prefix, "NO_AMOUNT")
 def wrong_amount(prefix=""):     return make_error_msg(prefix, "WRONG_AMOUNT")
 def wrong_item_type(prefix=""):  return make_error_msg(prefix, "WRONG_ITEM_TYPE")
 def royalties_error(prefix=""):  return make_error_msg(prefix, "ROYALTIES_ERROR")
+def invalid_chunk_bounds(prefix=""): return make_error_msg(prefix, "INVALID_CHUNK_BOUNDS")
 
 # Migration related
 def migration_place_not_emptry(prefix=""):  return make_error_msg(prefix, "MIGRATION_PLACE_NOT_EMPTY")
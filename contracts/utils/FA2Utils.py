@@ -24,6 +24,30 @@ def fa2_is_operator(fa2, token_id, owner, operator):
             FA2.t_operator_permission),
         t = sp.TBool).open_some()
 
+def fa2_get_owner(fa2, token_id):
+    return sp.view("get_owner", fa2,
+        sp.set_type_expr(token_id, sp.TNat),
+        t = sp.TAddress).open_some()
+
+#
+# FA2 batch views
+#
+
+def fa2_get_balances(fa2, requests):
+    return sp.view("get_balances", fa2,
+        sp.set_type_expr(requests, sp.TSet(FA2.t_balance_of_request)),
+        t = sp.TMap(FA2.t_balance_of_request, sp.TNat)).open_some()
+
+def fa2_get_owners(fa2, token_ids):
+    return sp.view("get_owners", fa2,
+        sp.set_type_expr(token_ids, sp.TSet(sp.TNat)),
+        t = sp.TMap(sp.TNat, sp.TAddress)).open_some()
+
+def fa2_are_operators(fa2, permissions):
+    return sp.view("are_operators", fa2,
+        sp.set_type_expr(permissions, sp.TSet(FA2.t_operator_permission)),
+        t = sp.TMap(FA2.t_operator_permission, sp.TBool)).open_some()
+
 #
 # FA2 calls
 #
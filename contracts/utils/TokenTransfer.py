@@ -5,11 +5,16 @@ from tz1and_contracts_smartpy.utils import Utils
 from contracts.utils import FA2Utils
 
 
+# Transfers are keyed by (to_, token_id), so transfers of the same token
+# to different recipients aren't merged. The map keeps them sorted.
+t_transfer_key = sp.TPair(sp.TAddress, sp.TNat)
+
+
 #
 # Class for multi fa2 token transfers.
 class FA2TokenTransferMap:
     def __init__(self):
-        self.internal_map = sp.local("transferMap", sp.map(tkey = sp.TAddress, tvalue = sp.TMap(sp.TNat, FA2.t_transfer_tx)))
+        self.internal_map = sp.local("transferMap", sp.map(tkey = sp.TAddress, tvalue = sp.TMap(t_transfer_key, FA2.t_transfer_tx)))
 
     def add_fa2(self, fa2):
         sp.set_type(fa2, sp.TAddress)
@@ -25,9 +30,10 @@ class FA2TokenTransferMap:
 
         # NOTE: yes it seems silly to do it this way, but it generates much nicer code.
         fa2_map = sp.compute(self.internal_map.value.get(fa2, message=sp.unit))
-        entry = sp.compute(fa2_map.get(token_id, default_value=sp.record(amount=0, to_=to_, token_id=token_id)))
+        transfer_key = sp.compute(sp.pair(to_, token_id))
+        entry = sp.compute(fa2_map.get(transfer_key, default_value=sp.record(amount=0, to_=to_, token_id=token_id)))
         entry.amount += token_amount
-        fa2_map[token_id] = entry
+        fa2_map[transfer_key] = entry
         self.internal_map.value[fa2] = fa2_map
 
     def transfer_tokens(self, from_):
@@ -46,7 +52,7 @@ class FA2TokenTransferMap:
 # Class for single fa2 token transfers.
 class FA2TokenTransferMapSingle:
     def __init__(self, fa2):
-        self.internal_map = sp.local("transferMap", sp.map(tkey = sp.TNat, tvalue = FA2.t_transfer_tx))
+        self.internal_map = sp.local("transferMap", sp.map(tkey = t_transfer_key, tvalue = FA2.t_transfer_tx))
         self.internal_fa2 = sp.set_type_expr(fa2, sp.TAddress)
 
     def add_token(self, to_, token_id, token_amount):
@@ -55,9 +61,10 @@ class FA2TokenTransferMapSingle:
         sp.set_type(token_amount, sp.TNat)
 
         # NOTE: yes it seems silly to do it this way, but it generates much nicer code.
-        new_entry = sp.compute(self.internal_map.value.get(token_id, default_value=sp.record(amount=0, to_=to_, token_id=token_id)))
+        transfer_key = sp.compute(sp.pair(to_, token_id))
+        new_entry = sp.compute(self.internal_map.value.get(transfer_key, default_value=sp.record(amount=0, to_=to_, token_id=token_id)))
         new_entry.amount += token_amount
-        self.internal_map.value[token_id] = new_entry
+        self.internal_map.value[transfer_key] = new_entry
 
     def transfer_tokens(self, from_):
         sp.set_type(from_, sp.TAddress)
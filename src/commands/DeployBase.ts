@@ -19,9 +19,11 @@ import * as ipfs from '../ipfs'
 import path from "path";
 
 
-type FeeResult = {
+export type FeeResult = {
     storage: string;
     fee: string;
+    gas: string;
+    paid_storage: string;
 }
 
 export const sleep = promisify(setTimeout);
@@ -115,6 +117,8 @@ export default abstract class DeployBase {
     protected network: string;
     protected isSandboxNet: boolean;
     protected cleanDeploymentsInSandbox: boolean;
+    protected updateBaseline: boolean;
+    protected sizeReport: boolean;
 
     public tezos?: TezosToolkit;
     protected accountAddress?: string;
@@ -133,6 +137,8 @@ export default abstract class DeployBase {
 
         this.isSandboxNet = this.network === "sandbox";
         this.cleanDeploymentsInSandbox = !is_upgrade;
+        this.updateBaseline = !!options.updateBaseline;
+        this.sizeReport = !!options.sizeReport || this.updateBaseline;
 
         // get and validate network config.
         this.networkConfig = config.networks[this.network];
@@ -245,7 +251,7 @@ export default abstract class DeployBase {
         }
 
         // Compile contract.
-        const [code_path, storage_path] = smartpy.compile_code_substep(target_out_dir, target_name, file_name, contract_name, used_target_args);
+        const [code_path, storage_path] = smartpy.compile_code_substep(target_out_dir, target_name, file_name, contract_name, used_target_args, this.sizeReport, this.updateBaseline);
 
         console.log()
 
@@ -337,7 +343,8 @@ export default abstract class DeployBase {
         // totalStorageBurn is paid storage diff + allocation burn + origination burn
         const paidStorage = receipt.totalStorageBurn.toNumber() / 1000000;
         const totalFee = receipt.totalFee.toNumber() / 1000000;
-        return { storage: paidStorage.toFixed(6), fee: totalFee.toFixed(6) };
+        return { storage: paidStorage.toFixed(6), fee: totalFee.toFixed(6),
+            gas: receipt.totalGas.toFixed(0), paid_storage: receipt.totalPaidStorageDiff.toFixed(0) };
     }
 
     protected async feesToString(op: TransactionWalletOperation|BatchWalletOperation): Promise<string> {
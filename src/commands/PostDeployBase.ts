@@ -1,8 +1,11 @@
 import kleur from "kleur";
-import { ContractAbstraction, OpKind, TransactionWalletOperation, Wallet } from "@taquito/taquito";
+import { ContractAbstraction, MichelCodecPacker, OpKind, TransactionWalletOperation, Wallet } from "@taquito/taquito";
+import { MichelsonV1Expression, MichelsonV1ExpressionExtended } from "@taquito/rpc";
 import { DeployMode } from "../config/config";
-import DeployBase from "./DeployBase";
+import DeployBase, { FeeResult } from "./DeployBase";
 import { BatchWalletOperation } from "@taquito/taquito/dist/types/wallet/batch-operation";
+import fs from 'fs';
+import * as smartpy from './smartpy';
 
 
 export type PostDeployContracts = Map<string, ContractAbstraction<Wallet>>;
@@ -10,10 +13,7 @@ export type PostDeployContracts = Map<string, ContractAbstraction<Wallet>>;
 /**
  * Some types and functions for gas tests and resutls
  */
-type GasResultRow = {
-    storage: string;
-    fee: string;
-}
+type GasResultRow = FeeResult;
 
 type GasResultsRows = {
     [id: string]: GasResultRow | undefined;
@@ -24,6 +24,19 @@ export type GasResultsTable = {
     rows: GasResultsRows;
 }
 
+type ContractSizeRow = {
+    code_size: number;
+    storage_size: number;
+}
+
+type GasResultsReport = {
+    tables: GasResultsTable[];
+    contracts: { [name: string]: ContractSizeRow };
+}
+
+// Where gas results are written to and the committed baselines are read from.
+const gas_results_dir = "./gas_results"
+
 
 export default abstract class PostDeployBase extends DeployBase {
     public async runPostDeploy(deploy_mode: DeployMode, contracts: PostDeployContracts) {
@@ -109,6 +122,122 @@ export default abstract class PostDeployBase extends DeployBase {
         }
     }
 
+    // Prints the gas results, writes them as JSON and CSV to gas_results_dir
+    // and compares them against the committed baseline for the suite, if any.
+    protected async reportGasResults(suite_name: string, gas_results_tables: GasResultsTable[], contracts: PostDeployContracts) {
+        this.printGasResults(gas_results_tables);
+
+        const report: GasResultsReport = {
+            tables: gas_results_tables,
+            contracts: await this.getContractSizes(contracts)
+        };
+
+        if (!fs.existsSync(gas_results_dir)) fs.mkdirSync(gas_results_dir, { recursive: true });
+
+        const json_out_path = `${gas_results_dir}/${suite_name}.json`;
+        fs.writeFileSync(json_out_path, JSON.stringify(report, null, 4));
+
+        const csv_out_path = `${gas_results_dir}/${suite_name}.csv`;
+        fs.writeFileSync(csv_out_path, this.gasResultsToCsv(report));
+
+        console.log();
+        console.log(kleur.green(`Gas results written to ${json_out_path} and ${csv_out_path}`));
+
+        const baseline_path = `${gas_results_dir}/${suite_name}.baseline.json`;
+        if (this.updateBaseline) {
+            fs.writeFileSync(baseline_path, JSON.stringify(report, null, 4) + "\n");
+            console.log(kleur.green(`Updated gas results baseline ${baseline_path}`));
+        }
+        else if (fs.existsSync(baseline_path)) {
+            const baseline: GasResultsReport = JSON.parse(fs.readFileSync(baseline_path, { encoding: 'utf-8' }));
+            this.printGasResultsDiff(baseline, report);
+        }
+        else console.log(kleur.yellow(`No baseline found at ${baseline_path}. Use --update-baseline to store one.`));
+    }
+
+    // Code size is the binary size of the script's code, storage size
+    // the size of the packed storage.
+    // NOTE: storage size doesn't include big_map contents.
+    private async getContractSizes(contracts: PostDeployContracts): Promise<{ [name: string]: ContractSizeRow }> {
+        const packer = new MichelCodecPacker();
+        const sizes: { [name: string]: ContractSizeRow } = {};
+
+        for (const [name, contract] of contracts) {
+            try {
+                const script = await this.tezos!.rpc.getScript(contract.address);
+                const storage_section = (script.code as MichelsonV1ExpressionExtended[]).find(e => e.prim === "storage")!;
+                const packed_storage = await packer.packData({ data: script.storage, type: storage_section.args![0] as MichelsonV1Expression });
+                // Strip the pack prefix byte.
+                const storage_size = packed_storage.packed.length / 2 - 1;
+
+                sizes[name] = { code_size: smartpy.michelsonSize(script.code), storage_size: storage_size };
+            } catch(error) {
+                console.log(kleur.red(`Failed to get size of '${name}'`));
+            }
+        }
+
+        return sizes;
+    }
+
+    private gasResultsToCsv(report: GasResultsReport): string {
+        const lines = ["table,row,gas,fee,paid_storage,storage"];
+        for (const table of report.tables)
+            for (const row_key of Object.keys(table.rows)) {
+                const row = table.rows[row_key];
+                if (row) lines.push(`"${table.name}","${row_key}",${row.gas},${row.fee},${row.paid_storage},${row.storage}`);
+                else lines.push(`"${table.name}","${row_key}",,,,`);
+            }
+
+        lines.push("");
+        lines.push("contract,code_size,storage_size");
+        for (const [name, size] of Object.entries(report.contracts))
+            lines.push(`"${name}",${size.code_size},${size.storage_size}`);
+
+        return lines.join("\n") + "\n";
+    }
+
+    private printGasResultsDiff(baseline: GasResultsReport, report: GasResultsReport) {
+        const formatDiff = (base: number, current: number) => {
+            const diff = current - base;
+            const str = `${base} -> ${current} (${diff > 0 ? "+" : ""}${diff})`;
+            if (diff > 0) return kleur.red(str);
+            if (diff < 0) return kleur.green(str);
+            return str;
+        }
+
+        console.log();
+        console.log(kleur.magenta("Diff against baseline"));
+
+        for (const table of report.tables) {
+            const base_table = baseline.tables.find(t => t.name === table.name);
+            if (!base_table) continue;
+
+            console.log();
+            console.log(kleur.blue(table.name));
+            for (const row_key of Object.keys(table.rows)) {
+                const row = table.rows[row_key];
+                const base_row = base_table.rows[row_key];
+                if (!row || !base_row) {
+                    console.log(`${(row_key + ":").padEnd(32)}` + kleur.yellow("no comparison"));
+                    continue;
+                }
+
+                console.log(`${(row_key + ":").padEnd(32)}gas: ${formatDiff(parseInt(base_row.gas), parseInt(row.gas))}, ` +
+                    `paid storage: ${formatDiff(parseInt(base_row.paid_storage), parseInt(row.paid_storage))}`);
+            }
+        }
+
+        console.log();
+        console.log(kleur.blue("Contract sizes"));
+        for (const [name, size] of Object.entries(report.contracts)) {
+            const base_size = baseline.contracts[name];
+            if (!base_size) continue;
+
+            console.log(`${(name + ":").padEnd(32)}code: ${formatDiff(base_size.code_size, size.code_size)}, ` +
+                `storage: ${formatDiff(base_size.storage_size, size.storage_size)}`);
+        }
+    }
+
     // Utils
     // TODO: should properly batch the operator adds per contact
     protected async fa2_add_operators(contracts: PostDeployContracts, operators: Map<string, Map<string, number[]>>) {
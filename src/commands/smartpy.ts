@@ -1,6 +1,8 @@
 import * as child from 'child_process';
 import kleur from 'kleur';
 import * as fs from 'fs';
+import * as path from 'path';
+import * as crypto from 'crypto';
 import config from '../user.config';
 
 // Expected location of SmartPy CLI.
@@ -10,29 +12,54 @@ type SmartPyTask = "compile" | "test"
 const smartPyCli = (task: SmartPyTask, command: string) => `source .venv/bin/activate && PYTHONPATH="./" SMARTPY_NODE_DEV=${task} ${SMART_PY_CLI} ${command}`
 const test_out_dir = "./tests/test_output"
 
-type TestResult = "success" | "failed" | "skipped"
+type TestResult = "success" | "failed" | "skipped" | "cached"
 
 const CHECK_MARK = "\u2713"
 const CROSS_MARK = "\u2717"
 
-export function test(contract_names: string[], dir?: string) {
-    if(contract_names.length > 0)
-        contract_names.forEach(contract_name => test_single('./tests', contract_name));
+// Maps test file paths to the hash of their module graph on the last successful run.
+const test_cache_path = `${test_out_dir}/test_cache.json`
+
+export async function test(contract_names: string[], dir?: string, jobs: number = 1, use_cache: boolean = true) {
+    // Collect test files.
+    const test_files: [string, string][] = []
+    if(contract_names.length > 0) {
+        contract_names.forEach(contract_name => test_files.push(['./tests', contract_name]));
+        // Tests named explicitly are always run.
+        use_cache = false;
+    }
     else {
         const test_dirs = dir ? new Set([dir]) : config.smartpy.test_dirs;
-        const test_results = new Map<TestResult, number>()
         for (const test_dir of test_dirs) {
-            console.log(`\nIn dir: ${test_dir}`)
             if (fs.existsSync(test_dir) && fs.lstatSync(test_dir).isDirectory())
                 fs.readdirSync(test_dir).forEach(file => {
-                    if(fs.lstatSync(test_dir + '/' + file).isFile() && file.endsWith('_tests.py')) {
-                        const res = test_single(test_dir, file.slice(0, -9));
-                        test_results.set(res, (test_results.get(res) || 0) + 1);
-                    }
+                    if(fs.lstatSync(test_dir + '/' + file).isFile() && file.endsWith('_tests.py'))
+                        test_files.push([test_dir, file.slice(0, -9)]);
                 });
             else console.warn(kleur.red(`'${test_dir}' does not exist or is not a directory.`));
         }
-        // Print test results
+    }
+
+    const test_cache: { [test_path: string]: string } = fs.existsSync(test_cache_path) ?
+        JSON.parse(fs.readFileSync(test_cache_path, "utf-8")) : {};
+
+    // Run the tests in a pool of workers.
+    const test_results = new Map<TestResult, number>()
+    let next_test = 0;
+    const worker = async () => {
+        while (next_test < test_files.length) {
+            const [test_dir, contract_name] = test_files[next_test++];
+            const res = await test_single(test_dir, contract_name, jobs > 1, test_cache, use_cache);
+            test_results.set(res, (test_results.get(res) || 0) + 1);
+        }
+    }
+    await Promise.all([...Array(Math.max(1, jobs)).keys()].map(() => worker()));
+
+    if (!fs.existsSync(test_out_dir)) fs.mkdirSync(test_out_dir, { recursive: true });
+    fs.writeFileSync(test_cache_path, JSON.stringify(test_cache, null, 4));
+
+    // Print test results
+    if (test_files.length > 1) {
         console.log();
         for (const [k,v] of test_results) console.log(`${k}: ${v}`)
     }
@@ -40,29 +67,237 @@ export function test(contract_names: string[], dir?: string) {
     console.log(`\nTest results are in ${test_out_dir}`)
 }
 
-export function test_single(dir: string, contract_name: string): TestResult {
+// Resolves the local modules imported by a python file.
+function local_imports(file_path: string): string[] {
+    const source = fs.readFileSync(file_path, "utf-8");
+    const imports: string[] = [];
+
+    const resolve = (module_path: string) => {
+        for (const candidate of [`./${module_path}.py`, `./${module_path}/__init__.py`])
+            if (fs.existsSync(candidate)) return candidate;
+        return undefined;
+    }
+
+    for (const match of source.matchAll(/^\s*from\s+([\w.]+)\s+import\s+(\(([^)]*)\)|.+)$/gm)) {
+        const module_path = match[1].replace(/\./g, '/');
+        const module_file = resolve(module_path);
+        if (module_file) imports.push(module_file);
+
+        // Imported names may be modules as well.
+        for (const name of (match[3] || match[2]).split(',')) {
+            const submodule_file = resolve(`${module_path}/${name.trim().split(/\s+/)[0]}`);
+            if (submodule_file) imports.push(submodule_file);
+        }
+    }
+
+    for (const match of source.matchAll(/^\s*import\s+([\w.]+)/gm)) {
+        const module_file = resolve(match[1].replace(/\./g, '/'));
+        if (module_file) imports.push(module_file);
+    }
+
+    return imports;
+}
+
+// Hashes a python file and all local modules it (transitively) imports.
+// Also includes poetry.lock, for non-local dependencies.
+function module_graph_hash(file_path_in: string): string {
+    const visited = new Set<string>(["poetry.lock"]);
+    const pending = [file_path_in];
+    while (pending.length > 0) {
+        const file_path = path.normalize(pending.pop()!);
+        if (visited.has(file_path)) continue;
+        visited.add(file_path);
+        pending.push(...local_imports(file_path));
+    }
+
+    const hash = crypto.createHash('sha256');
+    for (const file_path of [...visited].sort())
+        hash.update(file_path).update(fs.readFileSync(file_path));
+    return hash.digest('hex');
+}
+
+export async function test_single(dir: string, contract_name: string, capture_output: boolean = false,
+    test_cache: { [test_path: string]: string } = {}, use_cache: boolean = true): Promise<TestResult> {
     if (config.smartpy.exclude_tests.has(contract_name)) {
         console.log(kleur.blue(`- Skipping tests for contract '${contract_name}' (excluded in user.config)`));
         return "skipped";
     }
 
+    const contract_in = `${dir}/${contract_name}_tests.py`
+
+    // Skip if nothing changed since the last successful run.
+    const hash = module_graph_hash(contract_in);
+    if (use_cache && test_cache[contract_in] === hash) {
+        console.log(kleur.blue(`- Skipping tests for contract '${contract_name}' (unchanged since last success)`));
+        return "cached";
+    }
+
     console.log(kleur.yellow(`Running tests for contract '${contract_name}' ...`));
 
     try {
-        // Build artifact directory.
-        const contract_in = `${dir}/${contract_name}_tests.py`
-
-        child.execSync(smartPyCli("test", `test ${contract_in} ${test_out_dir} --html`), {stdio: 'inherit'})
+        await new Promise<void>((resolve, reject) => {
+            let output = "";
+            const proc = child.spawn(smartPyCli("test", `test ${contract_in} ${test_out_dir} --html`),
+                {shell: true, stdio: capture_output ? 'pipe' : 'inherit'});
+            proc.stdout?.on('data', data => output += data);
+            proc.stderr?.on('data', data => output += data);
+            proc.on('error', reject);
+            proc.on('close', code => {
+                if (capture_output) process.stdout.write(output);
+                if (code === 0) resolve();
+                else reject(new Error(`Command failed with exit code ${code}`));
+            });
+        });
 
         console.log(kleur.green(`${CHECK_MARK} Tests for '${contract_name}' succeeded`))
 
+        test_cache[contract_in] = hash;
         return "success"
     } catch(err) {
         console.log(kleur.red(`${CROSS_MARK} Tests for '${contract_name}' failed: ${err}`))
+
+        delete test_cache[contract_in];
         return "failed"
     }
 }
 
+/**
+ * Contract size reports
+ */
+type SizeReport = {
+    code_size: number;
+    storage_size: number;
+    big_map_count: number;
+    lazy_entrypoints: { [ep_name: string]: number };
+}
+
+// Where the size report baselines are stored.
+const size_report_baseline_dir = "./size_reports"
+
+// Size of a zarith encoded int.
+function zarithSize(value: string): number {
+    const bits = BigInt(value.replace('-', '')).toString(2).length;
+    // First byte holds sign and 6 bits, all following bytes hold 7 bits.
+    return bits <= 6 ? 1 : 1 + Math.ceil((bits - 6) / 7);
+}
+
+// Returns the size of micheline json in the binary encoding.
+export function michelsonSize(expr: any): number {
+    if (Array.isArray(expr))
+        return 1 + 4 + expr.reduce((acc: number, e: any) => acc + michelsonSize(e), 0);
+    if (expr.int !== undefined) return 1 + zarithSize(expr.int);
+    if (expr.string !== undefined) return 1 + 4 + Buffer.byteLength(expr.string, 'utf8');
+    if (expr.bytes !== undefined) return 1 + 4 + expr.bytes.length / 2;
+
+    // Prims: tag, prim and args, followed by annots, if any.
+    const args: any[] = expr.args || [];
+    const annots: string[] = expr.annots || [];
+    const annots_size = annots.length > 0 ? 4 + Buffer.byteLength(annots.join(' '), 'utf8') : 0;
+    const args_size = args.reduce((acc: number, e: any) => acc + michelsonSize(e), 0);
+    // More than two args are encoded as a sequence and always have an annots length.
+    if (args.length > 2) return 1 + 1 + 4 + args_size + 4 + Buffer.byteLength(annots.join(' '), 'utf8');
+    return 1 + 1 + args_size + annots_size;
+}
+
+function countBigMaps(type_expr: any): number {
+    if (Array.isArray(type_expr)) return type_expr.reduce((acc: number, e: any) => acc + countBigMaps(e), 0);
+    return (type_expr.prim === "big_map" ? 1 : 0) + (type_expr.args ? countBigMaps(type_expr.args) : 0);
+}
+
+// Flattens right combs of pairs, types and values alike.
+function flattenPair(expr: any, prim: string): any[] {
+    if (Array.isArray(expr)) return expr;
+    if (expr.prim !== prim) return [expr];
+    return [...expr.args.slice(0, -1), ...flattenPair(expr.args[expr.args.length - 1], prim)];
+}
+
+// Returns the elements of the lazy entrypoint map in the storage, if any.
+// It's the big_map from nat to lambda. Looks at the storage type,
+// not at the position in storage. If there are several, takes the last one.
+function findLazyEntrypoints(storage_type: any, storage: any): any[] | undefined {
+    if (storage_type.prim === "big_map" && storage_type.args[0].prim === "nat" && storage_type.args[1].prim === "lambda")
+        return Array.isArray(storage) ? storage : undefined;
+
+    if (storage_type.prim === "pair") {
+        const types = flattenPair(storage_type, "pair");
+        const values = flattenPair(storage, "Pair");
+        if (types.length !== values.length) return undefined;
+
+        let found: any[] | undefined;
+        for (let i = 0; i < types.length; ++i)
+            found = findLazyEntrypoints(types[i], values[i]) || found;
+        return found;
+    }
+
+    return undefined;
+}
+
+function makeSizeReport(code: any, storage: any, ep_names: Map<number, string>): SizeReport {
+    const storage_type = code.find((e: any) => e.prim === "storage").args[0];
+
+    // Lazy entrypoints without a name are keyed by their id.
+    const lazy_entrypoints: { [ep_name: string]: number } = {};
+    for (const lazy_ep of findLazyEntrypoints(storage_type, storage) || []) {
+        const ep_id = parseInt(lazy_ep.args[0].int);
+        lazy_entrypoints[ep_names.get(ep_id) || `#${ep_id}`] = michelsonSize(lazy_ep.args[1]);
+    }
+
+    return {
+        code_size: michelsonSize(code),
+        storage_size: michelsonSize(storage),
+        big_map_count: countBigMaps(storage_type),
+        lazy_entrypoints: lazy_entrypoints
+    };
+}
+
+function printSizeDiff(name: string, base: number, current: number, warn_threshold?: number) {
+    const diff = current - base;
+    const str = `${(name + ":").padEnd(24)}${current} Bytes (${diff > 0 ? "+" : ""}${diff})`;
+    if (warn_threshold !== undefined && diff > warn_threshold)
+        console.log(kleur.red(`${str} WARNING: grew by more than ${warn_threshold} Bytes!`));
+    else if (diff > 0) console.log(kleur.yellow(str));
+    else if (diff < 0) console.log(kleur.green(str));
+    else console.log(str);
+}
+
+// Writes the size report for the target and compares it to the
+// stored baseline. Only stores the baseline if update_baseline is set.
+export function size_report(target_out_dir: string, target_name: string, contract_path: string, storage_path: string,
+    ep_names: Map<number, string>, update_baseline: boolean = false): SizeReport {
+    const report = makeSizeReport(
+        JSON.parse(fs.readFileSync(contract_path, "utf-8")),
+        JSON.parse(fs.readFileSync(storage_path, "utf-8")),
+        ep_names);
+
+    const report_out = `${target_name}_size_report.json`
+    fs.writeFileSync(`${target_out_dir}/${report_out}`, JSON.stringify(report, null, 4));
+    console.log(kleur.green(`Size report: ${report_out}`))
+
+    const baseline_path = `${size_report_baseline_dir}/${target_name}.json`
+    if (!fs.existsSync(baseline_path) && !update_baseline) {
+        console.log(kleur.yellow(`No size baseline for '${target_name}' (use --update-baseline to store one).`))
+        return report;
+    }
+
+    if (fs.existsSync(baseline_path)) {
+        const baseline: SizeReport = JSON.parse(fs.readFileSync(baseline_path, "utf-8"));
+
+        printSizeDiff("Code", baseline.code_size, report.code_size);
+        printSizeDiff("Storage", baseline.storage_size, report.storage_size);
+        printSizeDiff("Big map originations", baseline.big_map_count, report.big_map_count);
+        for (const [ep_name, ep_size] of Object.entries(report.lazy_entrypoints))
+            printSizeDiff(`Lazy entrypoint ${ep_name}`, baseline.lazy_entrypoints[ep_name] || 0, ep_size, config.smartpy.ep_size_warn_threshold);
+    }
+
+    if (update_baseline) {
+        if (!fs.existsSync(size_report_baseline_dir)) fs.mkdirSync(size_report_baseline_dir, { recursive: true });
+        fs.writeFileSync(baseline_path, JSON.stringify(report, null, 4));
+        console.log(kleur.yellow(`Stored size baseline for '${target_name}' in ${baseline_path}`))
+    }
+
+    return report;
+}
+
 function optimise(target_name: string, file_in: string, file_out: string): string {
     if (false) {
         console.log(`Optimising ${target_name}`)
@@ -74,6 +309,74 @@ function optimise(target_name: string, file_in: string, file_out: string): strin
     return file_in;
 }
 
+/**
+ * Compilation cache
+ */
+const compile_cache_dir = "./build/compile_cache"
+
+// Identifies the SmartPy install, for the cache key. Uses the reported
+// version, falls back to a hash of the install dir's path and files.
+// Returns null if neither can be determined.
+let smartpy_version: string | null | undefined;
+function get_smartpy_version(): string | null {
+    if (smartpy_version !== undefined) return smartpy_version;
+
+    try {
+        const version = child.execSync(smartPyCli("compile", "--version"), {encoding: 'utf-8', stdio: 'pipe'}).trim();
+        if (version) return smartpy_version = `version:${version}`;
+    } catch { /* fall back to hashing the install */ }
+
+    if (fs.existsSync(SMART_PY_INSTALL_DIR)) {
+        const hash = crypto.createHash('sha256').update(path.resolve(SMART_PY_INSTALL_DIR));
+        for (const file of fs.readdirSync(SMART_PY_INSTALL_DIR).sort()) {
+            const file_path = `${SMART_PY_INSTALL_DIR}/${file}`;
+            if (fs.lstatSync(file_path).isFile()) hash.update(file).update(fs.readFileSync(file_path));
+        }
+        return smartpy_version = `install:${hash.digest('hex')}`;
+    }
+
+    console.log(kleur.yellow("Couldn't determine SmartPy version, compilation outputs won't be cached."));
+    return smartpy_version = null;
+}
+
+// Compiles the target with the SmartPy CLI, unless the outputs are cached.
+// The cache key is the hash of the target, which includes class name and
+// target args, the contract's module graph and the SmartPy version.
+// Doesn't cache if the SmartPy version can't be determined.
+function cached_compile(tmp_out_dir: string, target_path: string, file_name: string, outputs: string[], command: string) {
+    // Delete tmp out dir if exists
+    if (fs.existsSync(tmp_out_dir)) fs.rmSync(tmp_out_dir, {recursive: true})
+
+    const version = get_smartpy_version();
+    if (version === null) {
+        child.execSync(smartPyCli("compile", command), {stdio: 'inherit'})
+        return;
+    }
+
+    const cache_key = crypto.createHash('sha256')
+        .update(fs.readFileSync(target_path))
+        .update(module_graph_hash(`./contracts/${file_name}.py`))
+        .update(version)
+        .digest('hex');
+    const cache_path = `${compile_cache_dir}/${cache_key}`;
+
+    if (outputs.every((_, i) => fs.existsSync(`${cache_path}/${i}`))) {
+        outputs.forEach((output, i) => {
+            fs.mkdirSync(path.dirname(output), { recursive: true });
+            fs.copyFileSync(`${cache_path}/${i}`, output);
+        });
+        console.log(kleur.blue(`Using cached compilation output for ${path.basename(target_path)}`));
+        return;
+    }
+
+    child.execSync(smartPyCli("compile", command), {stdio: 'inherit'})
+
+    fs.mkdirSync(cache_path, { recursive: true });
+    outputs.forEach((output, i) => {
+        if (fs.existsSync(output)) fs.copyFileSync(output, `${cache_path}/${i}`);
+    });
+}
+
 // Returns path to metadata.
 export function compile_metadata_substep(target_out_dir: string, target_name: string, file_name: string, contract_name: string, target_args: string[]): string {
     const tmp_out_dir = "./build/tmp_contract_build"
@@ -86,14 +389,12 @@ sp.add_compilation_target("${target_name}", ${target_name}_contract.${contract_n
     ${target_args.join(', ')}
     ))`)
 
-    // Delete tmp out dir if exists
-    if (fs.existsSync(tmp_out_dir)) fs.rmSync(tmp_out_dir, {recursive: true})
-
-    child.execSync(smartPyCli("compile", `compile ${metadata_target_path} ${tmp_out_dir}`), {stdio: 'inherit'})
-
     // TODO: function for extracting metadata.
     const metadata_compiled_path = `${tmp_out_dir}/${target_name}/step_000_cont_0_metadata.metadata_base.json`
 
+    cached_compile(tmp_out_dir, metadata_target_path, file_name, [metadata_compiled_path],
+        `compile ${metadata_target_path} ${tmp_out_dir}`);
+
     const metadata_out = `${target_name}_metadata.json`
     const metadata_out_path = `${target_out_dir}/${metadata_out}`
 
@@ -107,7 +408,9 @@ sp.add_compilation_target("${target_name}", ${target_name}_contract.${contract_n
 }
 
 // Returns path to code and storage.
-export function compile_code_substep(target_out_dir: string, target_name: string, file_name: string, contract_name: string, target_args: string[]): [string, string] {
+// The size report needs an extra compile for lazy entrypoint names, so it's opt-in.
+export function compile_code_substep(target_out_dir: string, target_name: string, file_name: string, contract_name: string, target_args: string[],
+    report_size: boolean = false, update_size_baseline: boolean = false): [string, string] {
     const tmp_out_dir = "./build/tmp_contract_build"
     const code_target_path = `${target_out_dir}/${target_name}_code_target.py`
 
@@ -118,17 +421,16 @@ sp.add_compilation_target("${target_name}", ${target_name}_contract.${contract_n
     ${target_args.join(', ')}
     ))`)
 
-    // Delete tmp out dir if exists
-    if (fs.existsSync(tmp_out_dir)) fs.rmSync(tmp_out_dir, {recursive: true})
-
-    child.execSync(smartPyCli("compile", `compile ${code_target_path} ${tmp_out_dir}`), {stdio: 'inherit'})
-
     const contract_compiled = `${target_name}/step_000_cont_0_contract.json`
     //const contract_optimized = `${target_name}/step_000_cont_0_contract_opt.tz`
     //const final_contract = optimise(target_name, contract_compiled, contract_optimized);
 
     const storage_compiled = `${target_name}/step_000_cont_0_storage.json`
 
+    cached_compile(tmp_out_dir, code_target_path, file_name,
+        [`${tmp_out_dir}/${contract_compiled}`, `${tmp_out_dir}/${storage_compiled}`],
+        `compile ${code_target_path} ${tmp_out_dir}`);
+
     const contract_out = `${target_name}.json`
     const contract_out_path = `${target_out_dir}/${contract_out}`
     const storage_out = `${target_name}_storage.json`
@@ -140,11 +442,24 @@ sp.add_compilation_target("${target_name}", ${target_name}_contract.${contract_n
     fs.copyFileSync(`${tmp_out_dir}/${storage_compiled}`, storage_out_path)
     console.log(kleur.green(`Compiled storage: ${storage_out}`))
 
+    if (report_size) {
+        // Only look up lazy entrypoint names if there are any.
+        const contract_code = JSON.parse(fs.readFileSync(contract_out_path, "utf-8"));
+        const ep_names = new Map<number, string>();
+        if (findLazyEntrypoints(contract_code.find((e: any) => e.prim === "storage").args[0], JSON.parse(fs.readFileSync(storage_out_path, "utf-8")))) {
+            const [ep_map] = compile_ep_map(target_out_dir, target_name, file_name, contract_name, target_args);
+            for (const [ep_name, ep_id] of Object.entries(ep_map)) ep_names.set(ep_id, ep_name);
+        }
+
+        size_report(target_out_dir, target_name, contract_out_path, storage_out_path, ep_names, update_size_baseline);
+    }
+
     return [contract_out_path, storage_out_path];
 }
 
-// Returns ep code map and metadata path.
-export function compile_upgrade(target_out_dir: string, target_name: string, file_name: string, contract_name: string, target_args: string[], entrypoints: string[]): [Map<string, [number, string]>, string] {
+// Compiles the upgrade target. Returns the map from lazy entrypoint
+// names to ids, the compiled storage and the metadata path.
+function compile_ep_map(target_out_dir: string, target_name: string, file_name: string, contract_name: string, target_args: string[]): [{ [ep_name: string]: number }, any, string] {
     const tmp_out_dir = "./build/tmp_contract_build"
     const upgrade_target_path = `${target_out_dir}/${target_name}_upgrade_target.py`
 
@@ -168,21 +483,28 @@ def upgrade():
     # Build a map from upgradeable_entrypoints, names to id
     # and output the expression.
     scenario.show({
-        **{entrypoint: sp.contract_entrypoint_id(instance, entrypoint) for entrypoint in instance.upgradeable_entrypoints}},
+        **{entrypoint: sp.contract_entrypoint_id(instance, entrypoint) for entrypoint in getattr(instance, "upgradeable_entrypoints", [])}},
         html=True, compile=True)`)
 
-    // Delete tmp out dir if exists
-    if (fs.existsSync(tmp_out_dir)) fs.rmSync(tmp_out_dir, {recursive: true})
-
-    child.execSync(smartPyCli("compile", `kind upgrade ${upgrade_target_path} ${tmp_out_dir} --html`), {stdio: 'inherit'})
-
     // We can just parse the python expression for the ep map as json.
     const ep_map_compiled = `${tmp_out_dir}/${target_name}/step_001_expression.py`;
-    let ep_map = JSON.parse(fs.readFileSync(ep_map_compiled, "utf-8").replace(/'/g, '"'));
+    const storage_compiled = `${tmp_out_dir}/${target_name}/step_000_cont_0_storage.json`
+    const metadata_compiled_path = `${tmp_out_dir}/${target_name}/step_000_cont_0_metadata.metadata_base.json`
+
+    cached_compile(tmp_out_dir, upgrade_target_path, file_name, [ep_map_compiled, storage_compiled, metadata_compiled_path],
+        `kind upgrade ${upgrade_target_path} ${tmp_out_dir} --html`);
+
+    const ep_map = JSON.parse(fs.readFileSync(ep_map_compiled, "utf-8").replace(/'/g, '"'));
 
     // Parse the compiled contracts storage to extract eps from.
-    const storage_compiled = `${tmp_out_dir}/${target_name}/step_000_cont_0_storage.json`
-    let storage = JSON.parse(fs.readFileSync(storage_compiled, "utf-8"));
+    const storage = JSON.parse(fs.readFileSync(storage_compiled, "utf-8"));
+
+    return [ep_map, storage, metadata_compiled_path];
+}
+
+// Returns ep code map and metadata path.
+export function compile_upgrade(target_out_dir: string, target_name: string, file_name: string, contract_name: string, target_args: string[], entrypoints: string[]): [Map<string, [number, string]>, string] {
+    const [ep_map, storage, metadata_compiled_path] = compile_ep_map(target_out_dir, target_name, file_name, contract_name, target_args);
 
     const code_map = new Map<string, [number, string]>();
 
@@ -210,8 +532,6 @@ def upgrade():
     }
 
     // TODO: function for extracting metadata.
-    const metadata_compiled_path = `${tmp_out_dir}/${target_name}/step_000_cont_0_metadata.metadata_base.json`
-
     const metadata_out = `${target_name}_metadata.json`
     const metadata_out_path = `${target_out_dir}/${metadata_out}`
 
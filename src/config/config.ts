@@ -53,6 +53,9 @@ export type SandboxConfig = {
 export type SmartPyConfig = {
     exclude_tests: Set<string>;
     test_dirs: Set<string>;
+    // Warn if a lazy entrypoint grows by more than this many bytes
+    // compared to the size report baseline.
+    ep_size_warn_threshold: number;
 }
 
 export type SmartpyNodeDevConfig = {
@@ -111,6 +111,60 @@ export default class MarketplacePostDeploy extends PostDeployBase {
         next_swap_id = next_swap_id.plus(1)
         await swapCollect("swap & collect again", 1, next_swap_id);
 
+        // swap collect_count items and collect them in a single batch.
+        const swapCollectBatch = async (gas_results: GasResultsTable, collect_count: number, token_id: number, swap_id: BigNumber) => {
+            const swap_key = {
+                id: swap_id,
+                owner: this.accountAddress!,
+                partial: {
+                    fa2: contracts.get("items_v2_FA2_contract")!.address,
+                    token_id: token_id,
+                    rate: 12345678,
+                    primary: false
+                }
+            };
+
+            await this.runTaskAndAddGasResults(gas_results, `swap items (${collect_count})`, () => {
+                assert(this.tezos)
+                return this.tezos.wallet.batch().with([{
+                        kind: OpKind.TRANSACTION,
+                        ...contracts.get("items_v2_FA2_contract")!.methodsObject.update_adhoc_operators({ add_adhoc_operators: [{
+                            operator: Marketplace_contract.address,
+                            token_id: token_id
+                        }] }).toTransferParams()
+                    },
+                    {
+                        kind: OpKind.TRANSACTION,
+                        ...Marketplace_contract.methodsObject.swap({
+                            swap_key_partial: swap_key.partial,
+                            token_amount: collect_count,
+                        }).toTransferParams()
+                    }
+                ]).send();
+            });
+
+            await this.runTaskAndAddGasResults(gas_results, `collect items (${collect_count}, batch)`, () => {
+                assert(this.tezos)
+                const batch = this.tezos.wallet.batch();
+                for (let n = 0; n < collect_count; n++)
+                    batch.with([{
+                        kind: OpKind.TRANSACTION,
+                        ...Marketplace_contract.methodsObject.collect({
+                            swap_key: swap_key
+                        }).toTransferParams({amount: 12345678, mutez: true})
+                    }]);
+                return batch.send();
+            });
+        }
+
+        {
+            const gas_results = this.addGasResultsTable(gas_results_tables, { name: "swap & collect batches", rows: {} });
+            for (const collect_count of [1, 10]) {
+                next_swap_id = next_swap_id.plus(1)
+                await swapCollectBatch(gas_results, collect_count, 0, next_swap_id);
+            }
+        }
+
         const offer = async (row_name: string, token_id: number) => {
             let gas_results = this.addGasResultsTable(gas_results_tables, { name: row_name, rows: {} });
 
@@ -198,6 +252,6 @@ export default class MarketplacePostDeploy extends PostDeployBase {
         next_offer_id = next_offer_id.plus(1)
         await offer("offer", 1)
 
-        this.printGasResults(gas_results_tables);
+        await this.reportGasResults("marketplace", gas_results_tables, contracts);
     }
 }
\ No newline at end of file
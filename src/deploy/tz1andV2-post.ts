@@ -8,7 +8,7 @@ import { Schema } from '@taquito/michelson-encoder';
 import { char2Bytes } from '@taquito/utils'
 import kleur from "kleur";
 import config from "../user.config";
-import { sleep } from "../commands/DeployBase";
+import { DeployContractBatch, sleep } from "../commands/DeployBase";
 import { SHA3 } from 'sha3';
 import WorldUtils from "../commands/WorldUtils";
 
@@ -296,11 +296,11 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             const update_three_items = new MichelsonMap<number, MichelsonMap<any, unknown>>()
             const update_three_items_issuer = MichelsonMap.fromLiteral({
                 [this.accountAddress!]: {
-                    [contracts.get("items_FA2_contract")!.address]: [
+                    [contracts.get("items_FA2_contract")!.address]: { items: [
                         { item_id: 0, data: "01800041b1be48a779c9c244023dd5"},
                         { item_id: 1, data: "01800041b1be48a779c9c244023dd5"},
                         { item_id: 3, data: "01800041b1be48a779c9c244023dd5"}
-                    ]
+                    ] }
                 }
             })
             update_three_items.set(0, update_three_items_issuer)
@@ -313,13 +313,13 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             const update_five_items = new MichelsonMap<number, MichelsonMap<any, unknown>>()
             const update_five_items_issuer = MichelsonMap.fromLiteral({
                 [this.accountAddress!]: {
-                    [contracts.get("items_FA2_contract")!.address]: [
+                    [contracts.get("items_FA2_contract")!.address]: { items: [
                         { item_id: 2, data: "01800041b1be48a779c9c244023dd5"},
                         { item_id: 3, data: "01800041b1be48a779c9c244023dd5"},
                         { item_id: 5, data: "01800041b1be48a779c9c244023dd5"},
                         { item_id: 7, data: "01800041b1be48a779c9c244023dd5"},
                         { item_id: 8, data: "01800041b1be48a779c9c244023dd5"}
-                    ]
+                    ] }
                 }
             })
             update_five_items.set(0, update_five_items_issuer)
@@ -445,6 +445,9 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             this.mintNewPlaces([await WorldUtils.prepareNewPlace(0, [0, 0, 0], [[10, 0, 10], [10, 0, -10], [-10, 0, -10], [-10, 0, 10]], this.accountAddress!, this.isSandboxNet)], mint_batch, contracts.get("places_v2_FA2_contract")!);
             this.mintNewPlaces([await WorldUtils.prepareNewPlace(1, [0, 0, 0], [[10, 0, 10], [10, 0, -10], [-10, 0, -10], [-10, 0, 10]], this.accountAddress!, this.isSandboxNet)], mint_batch, contracts.get("places_v2_FA2_contract")!);
             this.mintNewPlaces([await WorldUtils.prepareNewPlace(2, [0, 0, 0], [[10, 0, 10], [10, 0, -10], [-10, 0, -10], [-10, 0, 10]], this.accountAddress!, this.isSandboxNet)], mint_batch, contracts.get("places_v2_FA2_contract")!);
+            // Places for the batch size tests.
+            this.mintNewPlaces([await WorldUtils.prepareNewPlace(3, [0, 0, 0], [[10, 0, 10], [10, 0, -10], [-10, 0, -10], [-10, 0, 10]], this.accountAddress!, this.isSandboxNet)], mint_batch, contracts.get("places_v2_FA2_contract")!);
+            this.mintNewPlaces([await WorldUtils.prepareNewPlace(4, [0, 0, 0], [[10, 0, 10], [10, 0, -10], [-10, 0, -10], [-10, 0, 10]], this.accountAddress!, this.isSandboxNet)], mint_batch, contracts.get("places_v2_FA2_contract")!);
             // TODO: TEMP: FIXME: Mint some places in old place contract
             this.mintNewPlaces([await WorldUtils.prepareNewPlace(0, [0, 0, 0], [[10, 0, 10], [10, 0, -10], [-10, 0, -10], [-10, 0, 10]], this.accountAddress!, this.isSandboxNet)], mint_batch, contracts.get("places_FA2_contract")!);
             this.mintNewPlaces([await WorldUtils.prepareNewPlace(1, [0, 0, 0], [[10, 0, 10], [10, 0, -10], [-10, 0, -10], [-10, 0, 10]], this.accountAddress!, this.isSandboxNet)], mint_batch, contracts.get("places_FA2_contract")!);
@@ -477,6 +480,91 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             }]).send()
         });
 
+        // token transfers (v2)
+        for (const tx_count of [1, 10, 100]) {
+            await this.runTaskAndAddGasResults(gas_results, `transfer (v2, ${tx_count} txs)`, () => {
+                return contracts.get("items_v2_FA2_contract")!.methodsObject.transfer([{
+                    from_: this.accountAddress,
+                    txs: [...Array(tx_count).keys()].map(() => {
+                        return { to_: contracts.get("Minter_v2_contract")!.address, amount: 1, token_id: 0 };
+                    })
+                }]).send();
+            });
+        }
+
+        /**
+         * FA2 ledger backends
+         */
+        gas_results = this.addGasResultsTable(gas_results_tables, { name: "FA2 ledger backends", rows: {} });
+
+        // Deploy a collection for each fungible ledger backend.
+        // NOTE: the collection proxy parents aren't proxied, admin can mint directly.
+        let collection_fungible: ContractAbstraction<Wallet>;
+        let collection_fungible_grouped: ContractAbstraction<Wallet>;
+        {
+            const backends_batch = new DeployContractBatch(this);
+
+            await backends_batch.addToBatch("FA2_Collection_Fungible", "Tokens", "ItemCollectionProxyParent", [
+                `admin = sp.address("${this.accountAddress}")`,
+                `parent = sp.address("${this.accountAddress}")`,
+                `blacklist = sp.address("${contracts.get("Blacklist_contract")!.address}")`
+            ]);
+
+            await backends_batch.addToBatch("FA2_Collection_FungibleGrouped", "Tokens", "ItemCollectionGroupedProxyParent", [
+                `admin = sp.address("${this.accountAddress}")`,
+                `parent = sp.address("${this.accountAddress}")`,
+                `blacklist = sp.address("${contracts.get("Blacklist_contract")!.address}")`
+            ]);
+
+            [collection_fungible, collection_fungible_grouped] = await backends_batch.deployBatch();
+        }
+
+        const backend_token_metadata = { "": char2Bytes("ipfs://QmbKq6LCbBFYMaBdsXDgdKFHyYGB8HJDWYYKtNbCDSRgSz") };
+        for (const [backend_name, collection] of [["Fungible", collection_fungible], ["FungibleGrouped", collection_fungible_grouped]] as [string, ContractAbstraction<Wallet>][]) {
+            // mint a new token
+            await this.runTaskAndAddGasResults(gas_results, `mint new (${backend_name})`, () => {
+                return collection.methodsObject.mint([{
+                    to_: this.accountAddress, amount: 10000,
+                    token: { new: { metadata: backend_token_metadata, royalties: {} } }
+                }]).send();
+            });
+
+            // transfer to a new holder, then again to the now existing holder
+            for (const row_name of ["new holder", "existing holder"]) {
+                await this.runTaskAndAddGasResults(gas_results, `transfer to ${row_name} (${backend_name})`, () => {
+                    return collection.methodsObject.transfer([{
+                        from_: this.accountAddress,
+                        txs: [{ to_: contracts.get("Minter_v2_contract")!.address, amount: 1, token_id: 0 }]
+                    }]).send();
+                });
+            }
+
+            // transfer to several new holders of the same token
+            await this.runTaskAndAddGasResults(gas_results, `transfer to new holders (${backend_name}, 4 txs)`, () => {
+                return collection.methodsObject.transfer([{
+                    from_: this.accountAddress,
+                    txs: ["World_v2_contract", "Dutch_v2_contract", "Factory_contract", "Registry_contract"].map((name) => {
+                        return { to_: contracts.get(name)!.address, amount: 1, token_id: 0 };
+                    })
+                }]).send();
+            });
+
+            // transfer to an existing holder, with more holders of the token
+            await this.runTaskAndAddGasResults(gas_results, `transfer to existing holder (${backend_name}, 5 holders)`, () => {
+                return collection.methodsObject.transfer([{
+                    from_: this.accountAddress,
+                    txs: [{ to_: contracts.get("Minter_v2_contract")!.address, amount: 1, token_id: 0 }]
+                }]).send();
+            });
+
+            // burn
+            await this.runTaskAndAddGasResults(gas_results, `burn (${backend_name})`, () => {
+                return collection.methodsObject.burn([{
+                    from_: this.accountAddress, amount: 1, token_id: 0
+                }]).send();
+            });
+        }
+
         const placeKey0 = { fa2: contracts.get("places_v2_FA2_contract")!.address, id: 0 };
         //const placeKey0Chunk0 = { place_key: placeKey0, chunk_id: 0 };
         const placeKey1 = { fa2: contracts.get("places_v2_FA2_contract")!.address, id: 1 };
@@ -637,9 +725,9 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             const map_update_one_item = new MichelsonMap<number, unknown>()
             const map_update_one_item_issuer = MichelsonMap.fromLiteral({
                 [this.accountAddress!]: {
-                    [contracts.get("items_FA2_contract")!.address]: [
+                    [contracts.get("items_FA2_contract")!.address]: { items: [
                         { item_id: 0, data: "01800041b1be48a779c9c244023dd5" }
-                    ]
+                    ] }
                 }
             });
             map_update_one_item.set(0, map_update_one_item_issuer)
@@ -653,7 +741,7 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             const map_update_ten_items = new MichelsonMap<number, unknown>()
             const map_update_ten_items_issuer = MichelsonMap.fromLiteral({
                 [this.accountAddress!]: {
-                    [contracts.get("items_FA2_contract")!.address]: [
+                    [contracts.get("items_FA2_contract")!.address]: { items: [
                         { item_id: 1, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 2, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 3, data: "01800041b1be48a779c9c244023dd5" },
@@ -664,7 +752,7 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
                         { item_id: 8, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 9, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 10, data: "01800041b1be48a779c9c244023dd5" }
-                    ]
+                    ] }
                 }
             });
             map_update_ten_items.set(0, map_update_ten_items_issuer)
@@ -678,9 +766,9 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             const map_update_one_item = new MichelsonMap<number, unknown>()
             const map_update_one_item_issuer = MichelsonMap.fromLiteral({
                 [this.accountAddress!]: {
-                    [contracts.get("items_FA2_contract")!.address]: [
+                    [contracts.get("items_FA2_contract")!.address]: { items: [
                         { item_id: 0, data: "01800041b1be48a779c9c244023dd5" }
-                    ]
+                    ] }
                 }
             });
             map_update_one_item.set(0, map_update_one_item_issuer)
@@ -695,7 +783,7 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             const map_update_ten_items = new MichelsonMap<number, unknown>()
             const map_update_ten_items_issuer = MichelsonMap.fromLiteral({
                 [this.accountAddress!]: {
-                    [contracts.get("items_FA2_contract")!.address]: [
+                    [contracts.get("items_FA2_contract")!.address]: { items: [
                         { item_id: 1, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 2, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 3, data: "01800041b1be48a779c9c244023dd5" },
@@ -706,7 +794,7 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
                         { item_id: 8, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 9, data: "01800041b1be48a779c9c244023dd5" },
                         { item_id: 10, data: "01800041b1be48a779c9c244023dd5" }
-                    ]
+                    ] }
                 }
             });
             map_update_ten_items.set(0, map_update_ten_items_issuer)
@@ -800,6 +888,18 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             }]).send();
         });
 
+        // set_permissions (wildcard)
+        await this.runTaskAndAddGasResults(gas_results, "set_permissions (wildcard)", () => {
+            return contracts.get("World_v2_contract")!.methods.set_permissions([{
+                add_wildcard: {
+                    fa2: contracts.get("places_v2_FA2_contract")!.address,
+                    owner: this.accountAddress,
+                    permittee: contracts.get("Dutch_v2_contract")!.address,
+                    perm: 7
+                }
+            }]).send();
+        });
+
         // get item (v1)
         await this.runTaskAndAddGasResults(gas_results, "get_item (v1)", () => {
             return contracts.get("World_v2_contract")!.methodsObject.get_item({
@@ -814,6 +914,195 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             }).send({ mutez: true, amount: 1000000 });
         });
 
+        /**
+         * World batch sizes
+         */
+        const placeKey3 = { fa2: contracts.get("places_v2_FA2_contract")!.address, id: 3 };
+        const placeKey4 = { fa2: contracts.get("places_v2_FA2_contract")!.address, id: 4 };
+
+        // Returns a place_item_map with count items in each of the chunks.
+        const placeItemMap = (chunk_ids: number[], count: number, amount: number = 1) => {
+            const item_map = new MichelsonMap<number, MichelsonMap<any, unknown>>()
+            const item_map_issuer = new MichelsonMap<boolean, MichelsonMap<any, unknown>>()
+            item_map_issuer.set(false, MichelsonMap.fromLiteral({
+                [contracts.get("items_FA2_contract")!.address]: [...Array(count).keys()].map(() => {
+                    return { item: { token_id: 0, amount: amount, rate: defaultRate, data: "01800040520000baa6c9c2460a4000", primary: false } };
+                })
+            }));
+            for (const chunk_id of chunk_ids) item_map.set(chunk_id, item_map_issuer);
+            return item_map;
+        }
+
+        // Returns a remove or get map with the item ids in each of the chunks.
+        const itemIdsMap = (chunk_ids: number[], item_ids: number[], value?: number) => {
+            const item_map = new MichelsonMap<number, unknown>()
+            const item_map_issuer = MichelsonMap.fromLiteral({
+                [this.accountAddress!]: {
+                    [contracts.get("items_FA2_contract")!.address]: value === undefined ? item_ids :
+                        MichelsonMap.fromLiteral(Object.fromEntries(item_ids.map(id => [id, value])))
+                }
+            });
+            for (const chunk_id of chunk_ids) item_map.set(chunk_id, item_map_issuer);
+            return item_map;
+        }
+
+        const range = (from: number, to: number) => [...Array(to - from).keys()].map(n => n + from);
+
+        gas_results = this.addGasResultsTable(gas_results_tables, { name: "World batch sizes", rows: {} });
+
+        await this.runTaskAndAddGasResults(gas_results, "place_items (1, empty chunk)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.place_items({
+                place_key: placeKey3, place_item_map: placeItemMap([0], 1)
+            }).send();
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "place_items (10, empty chunk)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.place_items({
+                place_key: placeKey3, place_item_map: placeItemMap([1], 10)
+            }).send();
+        });
+
+        // NOTE: chunk_item_limit is 64, so 100 items need two chunks.
+        await this.runTaskAndAddGasResults(gas_results, "place_items (100, empty chunks)", () => {
+            const item_map = placeItemMap([0], 63);
+            item_map.set(1, placeItemMap([1], 37).get(1)!);
+            return contracts.get("World_v2_contract")!.methodsObject.place_items({
+                place_key: placeKey4, place_item_map: item_map
+            }).send();
+        });
+
+        // Fills chunk 0 up to the chunk_item_limit.
+        await this.runTaskAndAddGasResults(gas_results, "place_items (1, filling chunk)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.place_items({
+                place_key: placeKey4, place_item_map: placeItemMap([0], 1)
+            }).send();
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "set_item_data (1, full chunk)", () => {
+            const map_update_one_item = new MichelsonMap<number, unknown>()
+            map_update_one_item.set(0, MichelsonMap.fromLiteral({
+                [this.accountAddress!]: {
+                    [contracts.get("items_FA2_contract")!.address]: { items: [ { item_id: 0, data: "01800040520000baa6c9c2460a4000" } ] }
+                }
+            }));
+            return contracts.get("World_v2_contract")!.methodsObject.set_item_data({
+                place_key: placeKey4, update_map: map_update_one_item
+            }).send();
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "set_item_data batch (64 + 37)", () => {
+            // Only send the positions, euler angles and scale are shared.
+            const batchUpdate = (item_ids: number[]) => MichelsonMap.fromLiteral({
+                [this.accountAddress!]: {
+                    [contracts.get("items_FA2_contract")!.address]: { batch: {
+                        item_ids: item_ids,
+                        template: "01800040520000baa6c9c2460a4000",
+                        offset: 7,
+                        deltas: item_ids.map(n => "baa6c9c2" + n.toString(16).padStart(4, '0')).join('')
+                    } }
+                }
+            });
+            const map_update_batch = new MichelsonMap<number, unknown>()
+            map_update_batch.set(0, batchUpdate(range(0, 64)))
+            map_update_batch.set(1, batchUpdate(range(0, 37)))
+            return contracts.get("World_v2_contract")!.methodsObject.set_item_data({
+                place_key: placeKey4, update_map: map_update_batch
+            }).send();
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "get_items (1)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.get_items({
+                place_key: placeKey3, item_map: itemIdsMap([0], [0], 1)
+            }).send({ mutez: true, amount: defaultRate });
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "get_items (10)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.get_items({
+                place_key: placeKey3, item_map: itemIdsMap([1], range(0, 10), 1)
+            }).send({ mutez: true, amount: defaultRate * 10 });
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "remove_items (1, full chunk)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.remove_items({
+                place_key: placeKey4, remove_map: itemIdsMap([0], [63])
+            }).send();
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "remove_items (100)", () => {
+            const remove_map = itemIdsMap([0], range(0, 63));
+            remove_map.set(1, itemIdsMap([1], range(0, 37)).get(1)!);
+            return contracts.get("World_v2_contract")!.methodsObject.remove_items({
+                place_key: placeKey4, remove_map: remove_map
+            }).send();
+        });
+
+        // Getting one of an item with amount > 1 doesn't change the store's item count,
+        // so it isn't written back. Compare chunks with 10 and 64 items.
+        await this.run_op_task("Place 10 and 64 items in Place #4", () => {
+            const item_map = placeItemMap([0], 10, 2);
+            item_map.set(1, placeItemMap([1], 64, 2).get(1)!);
+            return contracts.get("World_v2_contract")!.methodsObject.place_items({
+                place_key: placeKey4, place_item_map: item_map
+            }).send();
+        });
+
+        // Chunks were emptied by remove_items, item ids continue at 64 and 37.
+        await this.runTaskAndAddGasResults(gas_results, "get_items (1 of 2, 10 items in chunk)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.get_items({
+                place_key: placeKey4, item_map: itemIdsMap([0], [64], 1)
+            }).send({ mutez: true, amount: defaultRate });
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "get_items (1 of 2, full chunk)", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.get_items({
+                place_key: placeKey4, item_map: itemIdsMap([1], [37], 1)
+            }).send({ mutez: true, amount: defaultRate });
+        });
+
+        // Chunks of Place #3 were emptied by get_items, item ids continue at 1 and 10.
+        await this.run_op_task("Place 100 items in Place #3", () => {
+            const item_map = placeItemMap([0], 63);
+            item_map.set(1, placeItemMap([1], 37).get(1)!);
+            return contracts.get("World_v2_contract")!.methodsObject.place_items({
+                place_key: placeKey3, place_item_map: item_map
+            }).send();
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "get_items (100)", () => {
+            const item_map = itemIdsMap([0], range(1, 64), 1);
+            item_map.set(1, itemIdsMap([1], range(10, 47), 1).get(1)!);
+            return contracts.get("World_v2_contract")!.methodsObject.get_items({
+                place_key: placeKey3, item_map: item_map
+            }).send({ mutez: true, amount: defaultRate * 100 });
+        });
+
+        // Issuer and place owned items going to different recipients.
+        // Transfers are merged per (to_, token_id).
+        await this.run_op_task("Set items_to on Place #3", () => {
+            return contracts.get("World_v2_contract")!.methodsObject.update_place({
+                place_key: placeKey3, update: { owner_props: [{ items_to: contracts.get("Dutch_v2_contract")!.address }] }
+            }).send();
+        });
+
+        await this.run_op_task("Place 10 issuer and 10 place owned items in Place #3", () => {
+            const item_map = placeItemMap([0], 10);
+            item_map.get(0)!.set(true, item_map.get(0)!.get(false));
+            return contracts.get("World_v2_contract")!.methodsObject.place_items({
+                place_key: placeKey3, place_item_map: item_map
+            }).send();
+        });
+
+        await this.runTaskAndAddGasResults(gas_results, "remove_items (2x10, mixed owners)", () => {
+            // Chunk 0 was emptied by get_items, item ids continue at 64.
+            const remove_map = itemIdsMap([0], range(64, 74));
+            (remove_map.get(0) as MichelsonMap<any, unknown>).set(null, MichelsonMap.fromLiteral({
+                [contracts.get("items_FA2_contract")!.address]: range(74, 84)
+            }));
+            return contracts.get("World_v2_contract")!.methodsObject.remove_items({
+                place_key: placeKey3, remove_map: remove_map
+            }).send();
+        });
+
         gas_results = this.addGasResultsTable(gas_results_tables, { name: "Auctions", rows: {} });
 
         /**
@@ -917,6 +1206,56 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             }).send();
         });
 
+        // create and cancel auctions for places 1 to auction_count in a batch.
+        for (const auction_count of [1, 4]) {
+            const auction_keys = range(1, auction_count + 1).map(token_id => {
+                return { fa2: contracts.get("places_v2_FA2_contract")!.address, token_id: token_id, owner: this.accountAddress };
+            });
+
+            await this.runTaskAndAddGasResults(gas_results, `create_auction (${auction_count}, batch)`, () => {
+                const current_time = Math.floor(Date.now() / 1000) + config.sandbox.blockTime;
+                const batch = this.tezos!.wallet.batch();
+                for (const auction_key of auction_keys)
+                    batch.with([
+                        {
+                            kind: OpKind.TRANSACTION,
+                            ...contracts.get("places_v2_FA2_contract")!.methods.update_operators([{
+                                add_operator: {
+                                    owner: this.accountAddress,
+                                    operator: contracts.get("Dutch_v2_contract")!.address,
+                                    token_id: auction_key.token_id
+                                }
+                            }]).toTransferParams()
+                        },
+                        {
+                            kind: OpKind.TRANSACTION,
+                            ...contracts.get("Dutch_v2_contract")!.methodsObject.create({
+                                auction_key: auction_key,
+                                auction: {
+                                    start_price: 200000,
+                                    end_price: 100000,
+                                    start_time: current_time.toString(),
+                                    end_time: (current_time + 2000).toString()
+                                }
+                            }).toTransferParams()
+                        }
+                    ]);
+                return batch.send();
+            });
+
+            await this.runTaskAndAddGasResults(gas_results, `cancel (${auction_count}, batch)`, () => {
+                const batch = this.tezos!.wallet.batch();
+                for (const auction_key of auction_keys)
+                    batch.with([{
+                        kind: OpKind.TRANSACTION,
+                        ...contracts.get("Dutch_v2_contract")!.methodsObject.cancel({
+                            auction_key: auction_key
+                        }).toTransferParams()
+                    }]);
+                return batch.send();
+            });
+        }
+
         gas_results = this.addGasResultsTable(gas_results_tables, { name: "Adhoc Operators", rows: {} });
 
         /**
@@ -1029,6 +1368,47 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             return item_adhoc_max_op.send()
         });
 
+        // batch mint in the public collection.
+        for (const mint_count of [1, 10]) {
+            await this.runTaskAndAddGasResults(gas_results, `mint_public_batch (${mint_count})`, async () => {
+                const item_metadata_url = await ipfs.upload_item_metadata(contracts.get("Minter_v2_contract")!.address, 'assets/Duck.glb', 4212, this.isSandboxNet);
+                const mint_token = {
+                    to_: this.accountAddress,
+                    amount: 10000,
+                    royalties: { [this.accountAddress!]: 250 },
+                    metadata: Buffer.from(item_metadata_url, 'utf8').toString('hex')
+                };
+
+                return contracts.get("Minter_v2_contract")!.methodsObject.mint_public_batch(
+                    MichelsonMap.fromLiteral({ [contracts.get("items_v2_FA2_contract")!.address]: Array(mint_count).fill(mint_token) })
+                ).send();
+            });
+        }
+
+        gas_results = this.addGasResultsTable(gas_results_tables, { name: "Registry", rows: {} });
+
+        /**
+         * Registry
+         */
+        // add and remove public collections. The contracts aren't
+        // collections, but they aren't registered either.
+        for (const collection_count of [1, 4]) {
+            const collections = ["World_v2_contract", "Dutch_v2_contract", "Factory_contract", "Blacklist_contract"]
+                .slice(0, collection_count).map(name => contracts.get(name)!.address);
+
+            await this.runTaskAndAddGasResults(gas_results, `manage_collections add_public (${collection_count})`, () => {
+                return contracts.get("Registry_contract")!.methodsObject.manage_collections([{
+                    add_public: MichelsonMap.fromLiteral(Object.fromEntries(collections.map(address => [address, 1])))
+                }]).send();
+            });
+
+            await this.runTaskAndAddGasResults(gas_results, `manage_collections remove (${collection_count})`, () => {
+                return contracts.get("Registry_contract")!.methodsObject.manage_collections([{
+                    remove: collections
+                }]).send();
+            });
+        }
+
         gas_results = this.addGasResultsTable(gas_results_tables, { name: "Factory", rows: {} });
 
         /**
@@ -1071,6 +1451,21 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             return mint_batch2.send();
         });
 
+        // batch mint with created token.
+        await this.runTaskAndAddGasResults(gas_results, "mint_private_batch (2)", async () => {
+            const item_metadata_url = await ipfs.upload_item_metadata(contracts.get("Minter_v2_contract")!.address, 'assets/Duck.glb', 4212, this.isSandboxNet);
+            const mint_token = {
+                to_: this.accountAddress,
+                amount: 10000,
+                royalties: { [this.accountAddress!]: 250 },
+                metadata: Buffer.from(item_metadata_url, 'utf8').toString('hex')
+            };
+
+            return contracts.get("Minter_v2_contract")!.methodsObject.mint_private_batch(
+                MichelsonMap.fromLiteral({ [originatedTokenContract.address]: [mint_token, mint_token] })
+            ).send();
+        });
+
         // transfer with created token
         await this.runTaskAndAddGasResults(gas_results, "transfer", () => {
             return originatedTokenContract.methodsObject.transfer([{
@@ -1083,7 +1478,7 @@ export default class tz1andV2PostDeploy extends PostDeployBase {
             }]).send();
         });
 
-        this.printGasResults(gas_results_tables);
+        await this.reportGasResults("tz1andV2", gas_results_tables, contracts);
     }
 
     private async mintAndPlace(contracts: PostDeployContracts, per_batch: number = 100, batches: number = 30, token_id: number = 0) {
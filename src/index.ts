@@ -1,4 +1,4 @@
-import { program } from 'commander';
+import { program, InvalidArgumentError } from 'commander';
 import * as sandbox from './commands/sandbox';
 import * as smartpy from './commands/smartpy';
 import { readFileSync } from 'fs';
@@ -67,14 +67,22 @@ sandbox_command
 // SmartPy stuff
 //
 
+function parsePositiveInt(value: string): number {
+    if (!/^\d+$/.test(value) || parseInt(value) < 1)
+        throw new InvalidArgumentError('Must be a positive integer.');
+    return parseInt(value);
+}
+
 program
     .command('test')
     .alias('t')
     .description('Runs tests.')
     .option('-d, --dir [dir]', 'dir to run tests in (optional)')
+    .option('-j, --jobs <jobs>', 'number of tests to run in parallel (optional)', parsePositiveInt, 1)
+    .option('-f, --force', 'Run tests even if unchanged since last success. Named tests always run.')
     .argument('[contract_names...]', 'names of contracts (optional)')
-    .action((contract_names, options) => {
-        smartpy.test(contract_names, options.dir);
+    .action(async (contract_names, options) => {
+        await smartpy.test(contract_names, options.dir, options.jobs, !options.force);
     });
 
 //
@@ -86,6 +94,8 @@ program
     .alias('d')
     .description('Run the deploy script.')
     .option('-n, --network [network]', 'the network to deploy to (optional)')
+    .option('--size-report', 'Report contract sizes and compare them against the baselines.')
+    .option('--update-baseline', 'Store the contract size reports and gas test results as the new baselines. Implies --size-report.')
     .argument('deploy_script', 'the name of the deploy script to run')
     .action(async (deploy_script, options) => {
         // TODO: how to type abstract class?
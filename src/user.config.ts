@@ -48,7 +48,8 @@ const config: SmartpyNodeDevConfig = {
     },
     smartpy: {
         exclude_tests: new Set(["DistrictDAO"]),
-        test_dirs: new Set(['./tests/utils', './tests/legacy', './tests/legacy/mixins', './tests/mixins', './tests/upgrades', './tests'])
+        test_dirs: new Set(['./tests/utils', './tests/legacy', './tests/legacy/mixins', './tests/mixins', './tests/upgrades', './tests']),
+        ep_size_warn_threshold: 100
     }
 }
 export default config;
\ No newline at end of file
@@ -61,6 +61,27 @@ if "templates" not in __name__:
             FA2.OnchainviewCountTokens.__init__(self)
             Administrable.__init__(self, admin.address)
 
+    class FungibleGroupedTest(
+        Administrable,
+        FA2.ChangeMetadata,
+        FA2.WithdrawMutez,
+        FA2.MintFungible,
+        FA2.BurnFungible,
+        FA2.OffchainviewBalanceOf,
+        FA2.OffchainviewTokenMetadata,
+        FA2.OnchainviewCountTokens,
+        FA2.Fa2FungibleGrouped,
+    ):
+        """Grouped fungible contract with all optional features."""
+
+        def __init__(self, policy=None):
+            FA2.Fa2FungibleGrouped.__init__(
+                self, sp.utils.metadata_of_url("ipfs://example"), policy=policy
+            )
+            FA2.MintFungible.__init__(self)
+            FA2.OnchainviewCountTokens.__init__(self)
+            Administrable.__init__(self, admin.address)
+
     class SingleAssetTest(
         Administrable,
         FA2.ChangeMetadata,
@@ -119,6 +140,25 @@ if "templates" not in __name__:
     TESTS.test_owner_transfer("fungible", fungible_test(policy=FA2.OwnerTransfer()))
     TESTS.test_owner_or_operator_transfer("fungible", fungible_test())
 
+    # Fa2FungibleGrouped
+
+    def fungible_grouped_test(policy=None):
+        return FA2.Fa2FungibleGrouped(
+            metadata=sp.utils.metadata_of_url("ipfs://example"),
+            token_metadata=TOKEN_METADATA,
+            ledger={
+                (alice.address, 0): 42,
+                (alice.address, 1): 42,
+                (alice.address, 2): 42,
+            },
+            policy=policy,
+        )
+
+    TESTS.test_core_interfaces("fungible_grouped", fungible_grouped_test())
+    TESTS.test_transfers("fungible_grouped", fungible_grouped_test())
+    TESTS.test_balance_of("fungible_grouped", fungible_grouped_test())
+    TESTS.test_owner_or_operator_transfer("fungible_grouped", fungible_grouped_test())
+
     # Fa2SingleAsset
 
     TOKEN_METADATA = [tok0_md]
@@ -143,9 +183,37 @@ if "templates" not in __name__:
     TESTS.test_optional_features(
         nft_contract=NftTest(), fungible_contract=FungibleTest(), single_asset_contract=SingleAssetTest()
     )
+    TESTS.test_optional_features(
+        nft_contract=NftTest(), fungible_contract=FungibleGroupedTest(), single_asset_contract=SingleAssetTest(),
+        test_name="FA2_optional_interfaces_fungible_grouped"
+    )
     TESTS.test_pause(NftTest(FA2.PauseTransfer()), FungibleTest(FA2.PauseTransfer()), SingleAssetTest(FA2.PauseTransfer()))
     TESTS.test_adhoc_operators(NftTest(FA2.OwnerOrOperatorAdhocTransfer()), FungibleTest(FA2.OwnerOrOperatorAdhocTransfer()), SingleAssetTest(FA2.OwnerOrOperatorAdhocTransfer()))
 
+    # Blacklist
+
+    class CheckTxTransfer:
+        """Calls the per-tx transfer permission check without the batch check."""
+
+        @sp.entry_point
+        def check_tx_transfer(self, params):
+            sp.set_type(params, sp.TRecord(from_=sp.TAddress, to_=sp.TAddress, token_id=sp.TNat))
+            self.policy.check_tx_transfer_permissions(self, params.from_, params.to_, params.token_id)
+
+    class NftBlacklistTest(CheckTxTransfer, NftTest):
+        pass
+
+    class FungibleBlacklistTest(CheckTxTransfer, FungibleTest):
+        pass
+
+    class SingleAssetBlacklistTest(CheckTxTransfer, SingleAssetTest):
+        pass
+
+    TESTS.test_blacklist(
+        lambda blacklist: NftBlacklistTest(FA2.BlacklistTransfer(blacklist)),
+        lambda blacklist: FungibleBlacklistTest(FA2.BlacklistTransfer(blacklist)),
+        lambda blacklist: SingleAssetBlacklistTest(FA2.BlacklistTransfer(blacklist)))
+
     # Royalties
 
     class NftRoyaltiesTest(
@@ -199,3 +267,30 @@ if "templates" not in __name__:
             Administrable.__init__(self, admin.address)
     
     TESTS.test_nonstandard_transfer(NftNonstandardTransferTest()) # only test it on NFT. Should all be the same
+
+    # Compressed token metadata
+
+    class FungibleCompressedMetadataTest(
+        Administrable,
+        FA2.MintFungible,
+        FA2.CompressedTokenMetadata,
+        FA2.Fa2Fungible,
+    ):
+        """Fungible contract for testing compressed token metadata."""
+
+        def __init__(self, policy=None, token_metadata=[]):
+            FA2.Fa2Fungible.__init__(
+                self, sp.utils.metadata_of_url("ipfs://example"), policy=policy, token_metadata=token_metadata
+            )
+            FA2.MintFungible.__init__(self)
+            Administrable.__init__(self, admin.address)
+
+    TESTS.test_compressed_token_metadata(FungibleCompressedMetadataTest())
+
+    # Tokens minted before the origination wouldn't be compressed.
+    premint_rejected = False
+    try:
+        FungibleCompressedMetadataTest(token_metadata=[tok0_md])
+    except Exception:
+        premint_rejected = True
+    assert premint_rejected, "CompressedTokenMetadata must reject token_metadata at origination"
@@ -114,6 +114,29 @@ def test():
         metadata = sp.utils.bytes_of_string("test_metadata")).run(sender = alice, valid = False)
 
     minter.update_settings([sp.variant("paused", False)]).run(sender = admin)
+
+    scenario.h3("mint_public_batch")
+
+    batch_tokens = [sp.record(
+        to_ = bob.address,
+        amount = 2,
+        royalties = { bob.address: sp.nat(250) },
+        metadata = sp.utils.bytes_of_string("test_metadata")) for n in range(3)]
+
+    minter.mint_public_batch({minter.address: batch_tokens}).run(sender = bob, valid = False, exception = ErrorMessages.invalid_collection())
+
+    minter.mint_public_batch({items_tokens.address: [sp.record(
+        to_ = bob.address,
+        amount = 0,
+        royalties = { bob.address: sp.nat(250) },
+        metadata = sp.utils.bytes_of_string("test_metadata"))]}).run(sender = bob, valid = False, exception = ErrorMessages.parameter_error())
+
+    last_token_id = scenario.compute(items_tokens.data.last_token_id)
+    minter.mint_public_batch({items_tokens.address: batch_tokens}).run(sender = bob)
+    scenario.verify(items_tokens.data.last_token_id == last_token_id + 3)
+    for n in range(3):
+        scenario.verify(items_tokens.get_balance(sp.record(owner = bob.address, token_id = last_token_id + n)) == 2)
+
     registry.manage_collections([sp.variant("remove", sp.set([items_tokens.address]))]).run(sender = admin)
 
 
@@ -165,6 +188,15 @@ def test():
         metadata = sp.utils.bytes_of_string("test_metadata")).run(sender = alice, valid = False)
 
     minter.update_settings([sp.variant("paused", False)]).run(sender = admin)
+
+    scenario.h3("mint_private_batch")
+
+    minter.mint_private_batch({items_tokens.address: batch_tokens}).run(sender = alice, valid = False, exception = ErrorMessages.not_owner_or_collaborator())
+
+    last_token_id = scenario.compute(items_tokens.data.last_token_id)
+    minter.mint_private_batch({items_tokens.address: batch_tokens}).run(sender = bob)
+    scenario.verify(items_tokens.data.last_token_id == last_token_id + 3)
+
     registry.manage_collections([sp.variant("remove", sp.set([items_tokens.address]))]).run(sender = admin)
 
     scenario.h3("update_private_metadata")
@@ -247,7 +279,7 @@ def test():
         sp.record(operator=registry.address, token_id=3),
     ]))).run(sender = alice)
 
-    scenario.verify(sp.len(items_tokens.data.adhoc_operators) == 4)
+    scenario.verify(sp.len(items_tokens.data.adhoc_operators[sp.record(level=items_tokens.data.adhoc_operators_level, owner=alice.address)]) == 4)
 
     # Invalid for anyone but admin.
     for acc in [alice, bob, admin]:
@@ -258,7 +290,8 @@ def test():
             valid = (True if acc is admin else False),
             exception = (None if acc is admin else "ONLY_ADMIN"))
 
-    scenario.verify(sp.len(items_tokens.data.adhoc_operators) == 0)
+    scenario.verify(~items_tokens.data.adhoc_operators.contains(sp.record(level=items_tokens.data.adhoc_operators_level, owner=alice.address)))
+    scenario.verify(~items_tokens.data.adhoc_operators_owners.contains(items_tokens.data.adhoc_operators_level))
 
 
     #
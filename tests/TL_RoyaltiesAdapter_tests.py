@@ -15,6 +15,12 @@ class RoyaltiesAdapterTest(sp.Contract):
         royalties = sp.compute(TL_RoyaltiesAdapter.getRoyalties(self.data.adapter, token_key).open_some())
         sp.verify_equal(royalties, expected.open_some("unexpected result"))
 
+    @sp.entry_point
+    def testRoyaltiesBatch(self, token_keys, expected):
+        sp.set_type(token_keys, sp.TSet(TL_LegacyRoyalties.t_token_key))
+        royalties = sp.compute(TL_RoyaltiesAdapter.getRoyaltiesBatch(self.data.adapter, token_keys).open_some())
+        sp.verify_equal(royalties, expected.open_some("unexpected result"))
+
 
 @sp.add_test(name = "TL_RoyaltiesAdapter_tests", profile = True)
 def test():
@@ -186,4 +192,26 @@ def test():
         adapter_test.testRoyalties(token_key=token_keys[key], expected=sp.some(valid_royalties1)).run(sender=admin)
 
     for key in ["legacy1", "items1"]:
-        adapter_test.testRoyalties(token_key=token_keys[key], expected=sp.some(valid_royalties2)).run(sender=admin)
\ No newline at end of file
+        adapter_test.testRoyalties(token_key=token_keys[key], expected=sp.some(valid_royalties2)).run(sender=admin)
+
+    scenario.h2("Batch royalties")
+
+    # Batch should fail if any of the tokens fails.
+    adapter_test.testRoyaltiesBatch(token_keys=sp.set([token_keys["items0"], sp.record(fa2=items_tokens.address, id=2)]),
+        expected=sp.none).run(sender=admin, valid=False, exception="TOKEN_UNDEFINED")
+    adapter_test.testRoyaltiesBatch(token_keys=sp.set([token_keys["trusted"], sp.record(fa2=other_token.address, id=1)]),
+        expected=sp.none).run(sender=admin, valid=False, exception=ErrorMessages.unknown_royalties())
+
+    # Empty batch returns an empty map.
+    adapter_test.testRoyaltiesBatch(token_keys=sp.set([]), expected=sp.some({})).run(sender=admin)
+
+    # Mixed batch returns the same royalties as the single view.
+    adapter_test.testRoyaltiesBatch(token_keys=sp.set(list(token_keys.values())), expected=sp.some({
+        token_keys["legacy0"]: valid_royalties1,
+        token_keys["legacy1"]: valid_royalties2,
+        token_keys["items0"]: valid_royalties1,
+        token_keys["items1"]: valid_royalties2,
+        token_keys["trusted"]: valid_royalties1
+    })).run(sender=admin)
+
+    scenario.table_of_contents()
@@ -56,8 +56,9 @@ class FA2_utils(sp.Contract):
             with chunk_opt.match_cases() as arg:
                 with arg.match("Some") as chunk:
                     chunk_next_ids.value[chunk_id] = chunk.next_id
+                # Removed chunks continue from the ids mirrored in the place.
                 with arg.match("None"):
-                    chunk_next_ids.value[chunk_id] = 0
+                    chunk_next_ids.value[chunk_id] = sp.snd(world_data.place.chunk_seqs.get(chunk_id, sp.pair(sp.nat(0), sp.nat(0))))
 
         sp.result(chunk_next_ids.value)
 
@@ -96,7 +97,8 @@ class FA2_utils(sp.Contract):
         world_data = sp.compute(self.world_get_place_data(params.world, params.place_key, params.chunk_ids))
         chunk_counters = sp.local("chunk_counters", sp.map(tkey=sp.TNat, tvalue=sp.TNat))
         with sp.for_("chunk_id", params.chunk_ids.elements()) as chunk_id:
-            chunk_counters.value[chunk_id] = world_data.chunks[chunk_id].counter
+            # NOTE: use the counters mirrored in the place, chunks may have been removed.
+            chunk_counters.value[chunk_id] = sp.fst(world_data.place.chunk_seqs[chunk_id])
 
         sp.result(chunk_counters.value)
 
@@ -112,7 +114,37 @@ class FA2_utils(sp.Contract):
 
         world_data = sp.compute(self.world_get_place_data(params.world, params.place_key, chunk_id_set.value))
         with sp.for_("chunk_counter_item", params.prev_chunk_counters.items()) as chunk_counter_item:
-            sp.verify(chunk_counter_item.value + 1 == world_data.chunks[chunk_counter_item.key].counter)
+            sp.verify(chunk_counter_item.value + 1 == sp.fst(world_data.place.chunk_seqs[chunk_counter_item.key]))
+
+        sp.result(True)
+
+    @sp.onchain_view(pure=True)
+    def check_chunk_item_counts_valid(self, params):
+        sp.set_type(params.place_key, TL_World_v2.placeKeyType)
+        sp.set_type(params.chunk_ids, sp.TSet(sp.TNat))
+        sp.set_type(params.world, sp.TAddress)
+
+        # validate item_count matches the items in storage
+        world_data = sp.compute(self.world_get_place_data(params.world, params.place_key, params.chunk_ids))
+        with sp.for_("chunk", world_data.chunks.values()) as chunk:
+            chunk_item_count = sp.local("chunk_item_count", sp.nat(0))
+            with sp.for_("issuer_map", chunk.storage.values()) as issuer_map:
+                with sp.for_("token_map", issuer_map.values()) as token_map:
+                    chunk_item_count.value += sp.len(token_map)
+            sp.verify(chunk_item_count.value == chunk.item_count)
+
+        sp.result(True)
+
+    @sp.onchain_view(pure=True)
+    def check_chunk_seqs_valid(self, params):
+        sp.set_type(params.place_key, TL_World_v2.placeKeyType)
+        sp.set_type(params.chunk_ids, sp.TSet(sp.TNat))
+        sp.set_type(params.world, sp.TAddress)
+
+        # validate the chunk sequence numbers mirrored in the place match the chunks
+        world_data = sp.compute(self.world_get_place_data(params.world, params.place_key, params.chunk_ids))
+        with sp.for_("chunk_item", world_data.chunks.items()) as chunk_item:
+            sp.verify(world_data.place.chunk_seqs[chunk_item.key] == sp.pair(chunk_item.value.counter, chunk_item.value.next_id))
 
         sp.result(True)
 
@@ -493,6 +525,10 @@ def test():
 
     position = sp.bytes("0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF")
 
+    # utility function for getting an item key.
+    def item_key(chunk_key, issuer, fa2, item_id):
+        return sp.record(chunk_key = chunk_key, issuer = issuer, fa2 = fa2, item_id = item_id)
+
     # utility function for getting last placed item id.
     def last_placed_item_id(chunk_key, last_index = 1):
         return scenario.compute(sp.as_nat(world.data.chunks.get(chunk_key).next_id - last_index))
@@ -518,6 +554,9 @@ def test():
             scenario.verify(sp.pack(before_sequence_numbers) != sp.pack(world.get_place_seqnum(sp.record(place_key=place_key, chunk_ids=sp.none)).chunk_seqs))
             # check next ids
             scenario.verify(items_utils.check_chunk_next_ids_valid(sp.record(place_key = place_key, prev_next_ids = prev_next_ids, place_items_map = token_arr, world = world.address)))
+            # check item counts
+            scenario.verify(items_utils.check_chunk_item_counts_valid(sp.record(place_key = place_key, chunk_ids = sp.set(token_arr.keys()), world = world.address)))
+            scenario.verify(items_utils.check_chunk_seqs_valid(sp.record(place_key = place_key, chunk_ids = sp.set(token_arr.keys()), world = world.address)))
             # check tokens were transferred
             balances_sender_after = scenario.compute(items_utils.get_balances(sp.record(tokens = tokens_amounts, place_owner = sender.address))) # TODO: don't use sender
             balances_world_after = scenario.compute(items_utils.get_balances_other(sp.record(tokens = tokens_amounts, owner = world.address)))
@@ -528,12 +567,12 @@ def test():
     # TODO: also check item in map changed
     def get_item(chunk_key, item_id, issuer, fa2, sender: sp.TestAccount, amount, valid: bool = True, message: str = None, now = None):
         if valid == True:
-            before_sequence_number = scenario.compute(world.get_place_seqnum(sp.record(place_key=chunk_key.place_key, chunk_ids=sp.none)).chunk_seqs[chunk_key.chunk_id])
-            tokens_amounts = {sp.record(fa2 = fa2, token_id = scenario.compute(world.data.chunks[chunk_key].storage[issuer].get(fa2).get(item_id).open_variant("item").token_id), owner = sp.some(sender.address)) : sp.nat(1)}
+            before_sequence_number = scenario.compute(world.get_place_seqnum(sp.record(place_key=chunk_key.place_key, chunk_ids=sp.some(sp.set([chunk_key.chunk_id])))).chunk_seqs[chunk_key.chunk_id])
+            tokens_amounts = {sp.record(fa2 = fa2, token_id = scenario.compute(world.data.items[item_key(chunk_key, issuer, fa2, item_id)].open_variant("item").token_id), owner = sp.some(sender.address)) : sp.nat(1)}
             balances_sender_before = scenario.compute(items_utils.get_balances(sp.record(tokens = tokens_amounts, place_owner = sender.address))) # TODO: don't use sender
             balances_world_before = scenario.compute(items_utils.get_balances_other(sp.record(tokens = tokens_amounts, owner = world.address)))
 
-        prev_counter = scenario.compute(world.data.chunks.get(chunk_key, default_value=TL_World_v2.chunkStorageDefault).counter)
+        prev_counter = scenario.compute(sp.fst(world.data.places.get(chunk_key.place_key, default_value=TL_World_v2.placeStorageDefault).chunk_seqs.get(chunk_key.chunk_id, default_value=sp.pair(sp.nat(0), sp.nat(0)))))
         world.get_item(
             place_key = chunk_key.place_key,
             chunk_id = chunk_key.chunk_id,
@@ -545,9 +584,12 @@ def test():
 
         if valid == True:
             # check seqnum
-            scenario.verify(before_sequence_number != world.get_place_seqnum(sp.record(place_key=chunk_key.place_key, chunk_ids=sp.none)).chunk_seqs[chunk_key.chunk_id])
+            scenario.verify(before_sequence_number != world.get_place_seqnum(sp.record(place_key=chunk_key.place_key, chunk_ids=sp.some(sp.set([chunk_key.chunk_id])))).chunk_seqs[chunk_key.chunk_id])
             # check counter
-            scenario.verify(prev_counter + 1 == world.data.chunks[chunk_key].counter)
+            scenario.verify(prev_counter + 1 == sp.fst(world.data.places[chunk_key.place_key].chunk_seqs[chunk_key.chunk_id]))
+            # check item count
+            scenario.verify(items_utils.check_chunk_item_counts_valid(sp.record(place_key = chunk_key.place_key, chunk_ids = sp.set([chunk_key.chunk_id]), world = world.address)))
+            scenario.verify(items_utils.check_chunk_seqs_valid(sp.record(place_key = chunk_key.place_key, chunk_ids = sp.set([chunk_key.chunk_id]), world = world.address)))
             # check tokens were transferred
             balances_sender_after = scenario.compute(items_utils.get_balances(sp.record(tokens = tokens_amounts, place_owner = sender.address))) # TODO: don't use sender
             balances_world_after = scenario.compute(items_utils.get_balances_other(sp.record(tokens = tokens_amounts, owner = world.address)))
@@ -576,6 +618,9 @@ def test():
             scenario.verify(sp.pack(before_sequence_numbers) != sp.pack(world.get_place_seqnum(sp.record(place_key=place_key, chunk_ids=sp.none)).chunk_seqs))
             # check counters
             scenario.verify(items_utils.check_chunk_counters_increased(sp.record(place_key = place_key, prev_chunk_counters = prev_counters, world = world.address)))
+            # check item counts
+            scenario.verify(items_utils.check_chunk_item_counts_valid(sp.record(place_key = place_key, chunk_ids = sp.set(remove_map.keys()), world = world.address)))
+            scenario.verify(items_utils.check_chunk_seqs_valid(sp.record(place_key = place_key, chunk_ids = sp.set(remove_map.keys()), world = world.address)))
             # check tokens were transferred
             # TODO: breaks when removing tokens from multiple issuers. needs to be map of issuer to map of whatever
             balances_sender_after = scenario.compute(items_utils.get_balances(sp.record(tokens = tokens_amounts, place_owner = sender.address))) # TODO: don't use sender
@@ -633,7 +678,7 @@ def test():
         sp.variant("item", sp.record(amount = 1, token_id = item_bob, rate = sp.tez(0), data = position, primary = False))
     ]}}}, bob)
     bob_placed_item2 = last_placed_item_id(place_bob_chunk_1)
-    scenario.verify(~sp.is_failing(world.data.chunks[place_bob_chunk_1].storage[sp.some(bob.address)][items_tokens_legacy.address][bob_placed_item2].open_variant('item')))
+    scenario.verify(~sp.is_failing(world.data.items[item_key(place_bob_chunk_1, sp.some(bob.address), items_tokens_legacy.address, bob_placed_item2)].open_variant('item')))
 
     place_items(place_alice, {0: {False: {items_tokens.address: [
         sp.variant("item", sp.record(amount = 1, token_id = item_alice, rate = sp.tez(1), data = position, primary = False))
@@ -645,14 +690,14 @@ def test():
         sp.variant("item", sp.record(amount = 2, token_id = item_alice, rate = sp.tez(1), data = position, primary = True))
     ]}}}, alice)
     alice_placed_primary = last_placed_item_id(place_alice_chunk_0)
-    scenario.verify(~sp.is_failing(world.data.chunks[place_alice_chunk_0].storage[sp.some(alice.address)][items_tokens_legacy.address][alice_placed_primary].open_variant('item')))
+    scenario.verify(~sp.is_failing(world.data.items[item_key(place_alice_chunk_0, sp.some(alice.address), items_tokens_legacy.address, alice_placed_primary)].open_variant('item')))
 
     scenario.h3("send_to_place = True")
     place_items(place_alice, {0: {True: {items_tokens_legacy.address: [
         sp.variant("item", sp.record(amount = 2, token_id = item_alice, rate = sp.tez(1), data = position, primary = False))
     ]}}}, alice)
     alice_placed_item_to_place_owner = last_placed_item_id(place_alice_chunk_0)
-    scenario.verify(~sp.is_failing(world.data.chunks[place_alice_chunk_0].storage[sp.none][items_tokens_legacy.address][alice_placed_item_to_place_owner].open_variant('item')))
+    scenario.verify(~sp.is_failing(world.data.items[item_key(place_alice_chunk_0, sp.none, items_tokens_legacy.address, alice_placed_item_to_place_owner)].open_variant('item')))
 
     scenario.h3("multiple items")
     place_items(place_alice, {0: {False: {items_tokens_legacy.address: [
@@ -700,6 +745,52 @@ def test():
     scenario.h3("Missing item")
     get_item(place_alice_chunk_0, alice_placed_primary, sp.some(alice.address), items_tokens_legacy.address, sender=bob, amount=sp.tez(1), valid=False) # missing item in map
 
+    #
+    # get (buy) multiple items.
+    #
+    scenario.h2("Gettting multiple items")
+
+    place_items(place_bob, {0: {False: {items_tokens.address: [
+        sp.variant("item", sp.record(amount = 3, token_id = item_bob, rate = sp.tez(1), data = position, primary = False)),
+        sp.variant("item", sp.record(amount = 1, token_id = item_bob, rate = sp.tez(2), data = position, primary = False))
+    ]}}}, bob)
+    bob_placed_multi0 = last_placed_item_id(place_bob_chunk_0, 2)
+    bob_placed_multi1 = last_placed_item_id(place_bob_chunk_0, 1)
+
+    get_items_map = {0: {sp.some(bob.address): {items_tokens.address: {bob_placed_multi0: 2, bob_placed_multi1: 1}}}}
+
+    scenario.h3("wrong amount")
+    for amount in [sp.tez(3), sp.tez(5), sp.mutez(0)]:
+        world.get_items(place_key = place_bob, item_map = get_items_map, ext = sp.none).run(sender = alice, amount = amount, valid = False, exception = ErrorMessages.wrong_amount())
+
+    scenario.h3("invalid amounts")
+    world.get_items(place_key = place_bob, item_map = {0: {sp.some(bob.address): {items_tokens.address: {bob_placed_multi0: 0}}}},
+        ext = sp.none).run(sender = alice, amount = sp.tez(0), valid = False, exception = ErrorMessages.parameter_error())
+    world.get_items(place_key = place_bob, item_map = {0: {sp.some(bob.address): {items_tokens.address: {bob_placed_multi1: 2}}}},
+        ext = sp.none).run(sender = alice, amount = sp.tez(4), valid = False, exception = ErrorMessages.parameter_error())
+
+    scenario.h3("not for sale")
+    world.get_items(place_key = place_bob, item_map = {1: {sp.some(bob.address): {items_tokens_legacy.address: {bob_placed_item2: 1}}}},
+        ext = sp.none).run(sender = alice, amount = sp.tez(0), valid = False, exception = ErrorMessages.not_for_sale())
+
+    scenario.h3("valid")
+    balance_alice_before = scenario.compute(items_tokens.get_balance(sp.record(owner = alice.address, token_id = item_bob)))
+    prev_counter = scenario.compute(world.data.chunks[place_bob_chunk_0].counter)
+    world.get_items(place_key = place_bob, item_map = get_items_map, ext = sp.none).run(sender = alice, amount = sp.tez(4))
+    scenario.verify(items_tokens.get_balance(sp.record(owner = alice.address, token_id = item_bob)) == balance_alice_before + 3)
+    # All of the value is paid out, see "get_items payouts" for recipient balances.
+    scenario.verify(world.balance == sp.mutez(0))
+    scenario.verify(prev_counter + 1 == world.data.chunks[place_bob_chunk_0].counter)
+    scenario.verify(world.data.items[item_key(place_bob_chunk_0, sp.some(bob.address), items_tokens.address, bob_placed_multi0)].open_variant("item").amount == 1)
+    scenario.verify(~world.data.items.contains(item_key(place_bob_chunk_0, sp.some(bob.address), items_tokens.address, bob_placed_multi1)))
+    scenario.verify(items_utils.check_chunk_item_counts_valid(sp.record(place_key = place_bob, chunk_ids = sp.set([0]), world = world.address)))
+    scenario.verify(items_utils.check_chunk_seqs_valid(sp.record(place_key = place_bob, chunk_ids = sp.set([0]), world = world.address)))
+
+    scenario.h3("missing item")
+    world.get_items(place_key = place_bob, item_map = get_items_map, ext = sp.none).run(sender = alice, amount = sp.tez(4), valid = False)
+
+    get_item(place_bob_chunk_0, bob_placed_multi0, sp.some(bob.address), items_tokens.address, sender = alice, amount = sp.tez(1))
+
     #
     # remove items
     #
@@ -712,10 +803,32 @@ def test():
     scenario.h3("valid and make sure tokens are transferred") # TODO: remove this
     remove_items(place_bob, {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.set([bob_placed_item0])}}}, sender=bob)
     remove_items(place_alice, {0: {sp.some(alice.address): {items_tokens.address: sp.set([alice_placed_item0])}}}, sender=alice)
+    scenario.verify(~world.data.items.contains(item_key(place_bob_chunk_0, sp.some(bob.address), items_tokens_legacy.address, bob_placed_item0)))
+    scenario.verify(~world.data.items.contains(item_key(place_alice_chunk_0, sp.some(alice.address), items_tokens.address, alice_placed_item0)))
+    scenario.verify(~world.data.chunks[place_alice_chunk_0].stores[sp.some(alice.address)].contains(items_tokens.address))
+    scenario.verify(~world.data.chunks[place_bob_chunk_0].stores.get(sp.some(bob.address), {}).get(items_tokens_legacy.address, sp.set([])).contains(bob_placed_item0))
 
     scenario.h3("place owned")
     remove_items(place_alice, {0: {sp.none: {items_tokens_legacy.address: sp.set([alice_placed_item_to_place_owner])}}}, sender=bob, valid=False)
     remove_items(place_alice, {0: {sp.none: {items_tokens_legacy.address: sp.set([alice_placed_item_to_place_owner])}}}, sender=alice)
+    # empty item stores are removed from the chunk.
+    scenario.verify(~world.data.chunks[place_alice_chunk_0].stores.contains(sp.none))
+
+    scenario.h3("empty chunks are removed")
+    place_bob_chunk_1_seqs = scenario.compute(world.data.places[place_bob].chunk_seqs[1])
+    remove_items(place_bob, {1: {sp.some(bob.address): {items_tokens_legacy.address: sp.set([bob_placed_item2])}}}, sender=bob)
+    scenario.verify(~world.data.chunks.contains(place_bob_chunk_1))
+    scenario.verify(~world.data.places[place_bob].chunks.contains(1))
+    # sequence numbers are kept in the place
+    scenario.verify(world.data.places[place_bob].chunk_seqs[1] == sp.pair(sp.fst(place_bob_chunk_1_seqs) + 1, sp.snd(place_bob_chunk_1_seqs)))
+
+    # item ids continue where the removed chunk left off
+    place_items(place_bob, {1: {False: {items_tokens_legacy.address: [
+        sp.variant("item", sp.record(amount = 1, token_id = item_bob, rate = sp.tez(0), data = position, primary = False))
+    ]}}}, bob)
+    bob_placed_item2 = last_placed_item_id(place_bob_chunk_1)
+    scenario.verify(bob_placed_item2 == sp.snd(place_bob_chunk_1_seqs))
+    scenario.verify(world.data.places[place_bob].chunks.contains(1))
 
     #
     # test ext items
@@ -785,18 +898,80 @@ def test():
     #
     scenario.h2("Set item data")
     new_item_data = sp.bytes("0x010101010101010101010101010101")
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = bob_placed_ext1, data = new_item_data),
         sp.record(item_id = bob_placed_item_props, data = new_item_data)
-    ]}}} ).run(sender = alice, valid = False, exception = ErrorMessages.no_permission())
+    ])}}} ).run(sender = alice, valid = False, exception = ErrorMessages.no_permission())
 
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = bob_placed_ext1, data = new_item_data),
         sp.record(item_id = bob_placed_item_props, data = new_item_data)
-    ]}}} ).run(sender = bob)
-
-    scenario.verify(world.data.chunks[place_bob_chunk_0].storage[sp.some(bob.address)][items_tokens_legacy.address][bob_placed_ext1].open_variant('ext') == new_item_data)
-    scenario.verify(world.data.chunks[place_bob_chunk_0].storage[sp.some(bob.address)][items_tokens_legacy.address][bob_placed_item_props].open_variant('item').data == new_item_data)
+    ])}}} ).run(sender = bob)
+
+    scenario.verify(world.data.items[item_key(place_bob_chunk_0, sp.some(bob.address), items_tokens_legacy.address, bob_placed_ext1)].open_variant('ext') == new_item_data)
+    scenario.verify(world.data.items[item_key(place_bob_chunk_0, sp.some(bob.address), items_tokens_legacy.address, bob_placed_item_props)].open_variant('item').data == new_item_data)
+
+    scenario.h3("Batched item data")
+    batch_template = sp.bytes("0x010101010101010101010101010101")
+    def set_item_data_batch(item_ids, template, offset, deltas, valid = True, message = None):
+        world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("batch",
+            sp.record(item_ids = item_ids, template = template, offset = offset, deltas = deltas))
+        }}} ).run(sender = bob, valid = valid, exception = message)
+
+    # deltas must match the number of items, fit into the template and the result must be long enough.
+    set_item_data_batch([], batch_template, 7, sp.bytes("0x"), valid = False, message = ErrorMessages.data_length())
+    set_item_data_batch([bob_placed_ext1, bob_placed_item_props], batch_template, 7, sp.bytes("0x0202020202020303030303"), valid = False, message = ErrorMessages.data_length())
+    set_item_data_batch([bob_placed_ext1, bob_placed_item_props], batch_template, 10, sp.bytes("0x020202020202030303030303"), valid = False, message = ErrorMessages.data_length())
+    set_item_data_batch([bob_placed_ext1, bob_placed_item_props], sp.bytes("0x0101"), 0, sp.bytes("0x0202"), valid = False, message = ErrorMessages.data_length())
+
+    set_item_data_batch([bob_placed_ext1, bob_placed_item_props], batch_template, 7, sp.bytes("0x020202020202030303030303"))
+    scenario.verify(items_utils.check_chunk_seqs_valid(sp.record(place_key = place_bob, chunk_ids = sp.set([0]), world = world.address)))
+
+    scenario.verify(world.data.items[item_key(place_bob_chunk_0, sp.some(bob.address), items_tokens_legacy.address, bob_placed_ext1)].open_variant('ext') == sp.bytes("0x010101010101010202020202020101"))
+    scenario.verify(world.data.items[item_key(place_bob_chunk_0, sp.some(bob.address), items_tokens_legacy.address, bob_placed_item_props)].open_variant('item').data == sp.bytes("0x010101010101010303030303030101"))
+
+    scenario.h3("Chunk bounds")
+    chunk_bounds = sp.bytes("0x00bc00bc00bc003c003c003c")
+    def set_chunk_bounds(ext, valid = True, message = None):
+        # Keeps the item's data the same, only sets bounds.
+        world.set_item_data(place_key = place_bob, ext = ext, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("items", [
+            sp.record(item_id = bob_placed_item_props, data = sp.bytes("0x010101010101010303030303030101"))
+        ])}}} ).run(sender = bob, valid = valid, exception = message)
+
+    def chunk_bounds_ext(bounds):
+        return sp.some({"chunk_bounds": sp.pack(sp.map(bounds, tkey = sp.TNat, tvalue = sp.TBytes))})
+
+    scenario.verify(world.data.chunks[place_bob_chunk_0].bounds == sp.none)
+
+    set_chunk_bounds(chunk_bounds_ext({0: sp.bytes("0x00bc00bc00bc003c003c")}), valid = False, message = ErrorMessages.invalid_chunk_bounds())
+    set_chunk_bounds(sp.some({"chunk_bounds": sp.bytes("0x00")}), valid = False, message = ErrorMessages.invalid_chunk_bounds())
+    set_chunk_bounds(sp.some({"chunk_bounds": sp.pack(sp.map({0: sp.nat(1)}, tkey = sp.TNat, tvalue = sp.TNat))}), valid = False, message = ErrorMessages.invalid_chunk_bounds())
+    set_chunk_bounds(sp.some({"chunk_bounds": sp.pack(chunk_bounds)}), valid = False, message = ErrorMessages.invalid_chunk_bounds())
+
+    set_chunk_bounds(chunk_bounds_ext({0: chunk_bounds}))
+    scenario.verify(world.data.chunks[place_bob_chunk_0].bounds == sp.some(chunk_bounds))
+    scenario.verify(world.get_chunk_bounds(place_bob)[0] == sp.some(chunk_bounds))
+    scenario.verify(world.get_place_data(sp.record(place_key = place_bob, chunk_ids = sp.some(sp.set([0])))).chunks[0].bounds == sp.some(chunk_bounds))
+
+    # bounds for other chunks are ignored, no ext doesn't change bounds.
+    set_chunk_bounds(chunk_bounds_ext({1: sp.bytes("0x")}))
+    set_chunk_bounds(sp.none)
+    scenario.verify(world.data.chunks[place_bob_chunk_0].bounds == sp.some(chunk_bounds))
+
+    # empty bytes clear bounds.
+    set_chunk_bounds(chunk_bounds_ext({0: sp.bytes("0x")}))
+    scenario.verify(world.data.chunks[place_bob_chunk_0].bounds == sp.none)
+    scenario.verify(world.get_chunk_bounds(place_bob)[0] == sp.none)
+
+    # only callers with ModifyAll or PlaceItems permissions can set bounds.
+    set_chunk_bounds(chunk_bounds_ext({0: chunk_bounds}))
+    world.set_item_data(place_key = place_bob, ext = chunk_bounds_ext({0: sp.bytes("0x")}),
+        update_map = {0: {}}).run(sender = alice, valid = False, exception = ErrorMessages.parameter_error())
+    world.set_item_data(place_key = place_bob, ext = chunk_bounds_ext({0: sp.bytes("0x")}),
+        update_map = {0: {sp.some(alice.address): {}}}).run(sender = alice, valid = False, exception = ErrorMessages.no_permission())
+    scenario.verify(world.data.chunks[place_bob_chunk_0].bounds == sp.some(chunk_bounds))
+    set_chunk_bounds(chunk_bounds_ext({0: sp.bytes("0x")}))
+    scenario.verify(world.data.chunks[place_bob_chunk_0].bounds == sp.none)
 
     #
     # test place related views
@@ -812,6 +987,15 @@ def test():
     scenario.verify(sp.len(place_data.chunks) == 1)
     scenario.show(place_data)
 
+    scenario.h4("removed items are not returned")
+    # alice_placed_item0 was removed, alice_placed_primary was bought out and
+    # alice_placed_item_to_place_owner was removed. Their ids are below next_id.
+    scenario.verify(world.data.chunks[place_alice_chunk_0].stores[sp.some(alice.address)][items_tokens_legacy.address] == sp.set([alice_placed_item1, alice_placed_item2, alice_placed_item3]))
+    scenario.verify(sp.len(place_data.chunks[0].storage) == 1)
+    scenario.verify(sp.len(place_data.chunks[0].storage[sp.some(alice.address)]) == 1)
+    scenario.verify(sp.len(place_data.chunks[0].storage[sp.some(alice.address)][items_tokens_legacy.address]) == 3)
+    scenario.verify(~place_data.chunks[0].storage[sp.some(alice.address)][items_tokens_legacy.address].contains(alice_placed_primary))
+
     place_data = world.get_place_data(sp.record(place_key = place_alice, chunk_ids = sp.some(sp.set([0, 1]))))
     scenario.verify(place_data.place.props.get(sp.bytes("0x00")) == sp.bytes('0x82b881'))
     scenario.verify(place_data.chunks[0].storage[sp.some(alice.address)][items_tokens_legacy.address][alice_placed_item1].open_variant("item").amount == 1)
@@ -829,6 +1013,43 @@ def test():
     scenario.verify(~place_data.chunks.contains(0))
     scenario.show(place_data)
 
+    scenario.h3("Paged stored items")
+    page = scenario.compute(world.get_place_data_paged(sp.record(place_key = place_alice, chunk_id = 0,
+        issuer = sp.some(alice.address), fa2 = items_tokens_legacy.address, from_item_id = 0, limit = alice_placed_item2)))
+    scenario.verify(page.items[alice_placed_item1].open_variant("item").amount == 1)
+    scenario.verify(~page.items.contains(alice_placed_item2))
+    scenario.verify(page.cursor == sp.some(alice_placed_item2))
+
+    page = scenario.compute(world.get_place_data_paged(sp.record(place_key = place_alice, chunk_id = 0,
+        issuer = sp.some(alice.address), fa2 = items_tokens_legacy.address, from_item_id = page.cursor.open_some(), limit = 100)))
+    scenario.verify(sp.len(page.items) == 2)
+    scenario.verify(page.items[alice_placed_item2].open_variant("item").amount == 1)
+    scenario.verify(page.items[alice_placed_item3].open_variant("item").amount == 1)
+    scenario.verify(page.cursor == sp.none)
+
+    # removed items inside the range are skipped.
+    page = scenario.compute(world.get_place_data_paged(sp.record(place_key = place_alice, chunk_id = 0,
+        issuer = sp.some(alice.address), fa2 = items_tokens_legacy.address, from_item_id = alice_placed_primary, limit = 100)))
+    scenario.verify(sp.len(page.items) == 3)
+    scenario.verify(~page.items.contains(alice_placed_primary))
+    scenario.verify(page.cursor == sp.none)
+
+    # from_item_id past the chunk's next_id returns an empty page.
+    page = scenario.compute(world.get_place_data_paged(sp.record(place_key = place_alice, chunk_id = 0,
+        issuer = sp.some(alice.address), fa2 = items_tokens_legacy.address, from_item_id = 1000, limit = 100)))
+    scenario.verify(sp.len(page.items) == 0)
+    scenario.verify(page.cursor == sp.none)
+
+    page = scenario.compute(world.get_place_data_paged(sp.record(place_key = place_alice, chunk_id = 0,
+        issuer = sp.some(alice.address), fa2 = items_tokens.address, from_item_id = 0, limit = 100)))
+    scenario.verify(sp.len(page.items) == 0)
+    scenario.verify(page.cursor == sp.none)
+
+    page = scenario.compute(world.get_place_data_paged(sp.record(place_key = place_alice, chunk_id = 1,
+        issuer = sp.some(alice.address), fa2 = items_tokens_legacy.address, from_item_id = 0, limit = 100)))
+    scenario.verify(sp.len(page.items) == 0)
+    scenario.verify(page.cursor == sp.none)
+
     scenario.h3("Sequence numbers")
     sequence_number = scenario.compute(world.get_place_seqnum(sp.record(place_key=place_alice, chunk_ids=sp.none)))
     scenario.verify(sequence_number.place_seq == sp.sha3(sp.pack(sp.nat(0))))
@@ -1111,6 +1332,24 @@ def test():
 
     # alice can now place/remove items in bobs place, set props and set item data
     scenario.verify(world.get_permissions(sp.record(place_key=place_bob, permittee=alice.address)) == TL_World_v2.permissionFull)
+    scenario.verify_equal(world.get_owner_and_permissions(sp.record(place_key=place_bob, permittee=alice.address)),
+        sp.record(owner=bob.address, permissions=TL_World_v2.permissionFull))
+    scenario.verify_equal(world.get_owner_and_permissions(sp.record(place_key=place_bob, permittee=bob.address)),
+        sp.record(owner=bob.address, permissions=TL_World_v2.permissionFull))
+    scenario.verify_equal(world.get_owner_and_permissions(sp.record(place_key=place_bob, permittee=carol.address)),
+        sp.record(owner=bob.address, permissions=TL_World_v2.permissionNone))
+    scenario.verify_equal(world.get_permissions_batch([
+            sp.record(place_key=place_bob, permittee=alice.address),
+            sp.record(place_key=place_bob, permittee=carol.address),
+            sp.record(place_key=place_alice, permittee=alice.address),
+            sp.record(place_key=place_alice, permittee=bob.address)
+        ]),
+        sp.map({
+            sp.record(place_key=place_bob, permittee=alice.address): TL_World_v2.permissionFull,
+            sp.record(place_key=place_bob, permittee=carol.address): TL_World_v2.permissionNone,
+            sp.record(place_key=place_alice, permittee=alice.address): TL_World_v2.permissionFull,
+            sp.record(place_key=place_alice, permittee=bob.address): TL_World_v2.permissionNone
+        }))
 
     place_items(place_bob, {0: {False: {items_tokens_legacy.address: [
         sp.variant("item", sp.record(amount=2, token_id=item_alice, rate=sp.tez(1), data=position, primary = False))
@@ -1118,13 +1357,13 @@ def test():
 
     # verify issuer is set correctly.
     last_item = scenario.compute(sp.as_nat(world.data.chunks[place_bob_chunk_0].next_id - 1))
-    scenario.verify(~sp.is_failing(world.data.chunks[place_bob_chunk_0].storage[sp.some(alice.address)][items_tokens_legacy.address][last_item]))
+    scenario.verify(~sp.is_failing(world.data.items[item_key(place_bob_chunk_0, sp.some(alice.address), items_tokens_legacy.address, last_item)]))
 
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(alice.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(alice.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = last_item, data = new_item_data)
-    ]}}} ).run(sender = alice, valid = True)
+    ])}}} ).run(sender = alice, valid = True)
 
-    scenario.verify(world.data.chunks[place_bob_chunk_0].storage[sp.some(alice.address)][items_tokens_legacy.address][last_item].open_variant('item').data == new_item_data)
+    scenario.verify(world.data.items[item_key(place_bob_chunk_0, sp.some(alice.address), items_tokens_legacy.address, last_item)].open_variant('item').data == new_item_data)
 
     # Can set props
     world.update_place(place_key=place_bob, update=valid_place_props, ext = sp.none).run(sender=alice)
@@ -1161,12 +1400,12 @@ def test():
 
     # verify issuer is set correctly.
     last_item = scenario.compute(sp.as_nat(world.data.chunks[place_bob_chunk_0].next_id - 1))
-    scenario.verify(~sp.is_failing(world.data.chunks[place_bob_chunk_0].storage[sp.some(alice.address)][items_tokens_legacy.address][last_item]))
+    scenario.verify(~sp.is_failing(world.data.items[item_key(place_bob_chunk_0, sp.some(alice.address), items_tokens_legacy.address, last_item)]))
 
     # can modify own items
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(alice.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(alice.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = last_item, data = new_item_data)
-    ]}}} ).run(sender=alice, valid=True)
+    ])}}} ).run(sender=alice, valid=True)
 
     # can't set props
     world.update_place(place_key=place_bob, update=valid_place_props, ext = sp.none).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
@@ -1209,9 +1448,9 @@ def test():
     last_item = scenario.compute(sp.as_nat(world.data.chunks[place_bob_chunk_0].next_id - 1))
 
     # can modify all items
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = remove_bobs_item2, data = new_item_data)
-    ]}}} ).run(sender=alice, valid=True)
+    ])}}} ).run(sender=alice, valid=True)
 
     # can't set props
     world.update_place(place_key=place_bob, ext = sp.none, update=valid_place_props).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
@@ -1250,9 +1489,9 @@ def test():
     last_item = scenario.compute(sp.as_nat(world.data.chunks[place_bob_chunk_0].next_id - 1))
 
     # can't modify all items
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = remove_bobs_item3, data = new_item_data)
-    ]}}} ).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
+    ])}}} ).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
 
     # Can set props
     world.update_place(place_key=place_bob, update=valid_place_props, ext = sp.none).run(sender=alice)
@@ -1290,9 +1529,9 @@ def test():
     last_item = scenario.compute(sp.as_nat(world.data.chunks[place_bob_chunk_0].next_id - 1))
 
     # can't modify all items
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = remove_bobs_item3, data = new_item_data)
-    ]}}} ).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
+    ])}}} ).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
 
     # can't set props
     world.update_place(place_key=place_bob, update=valid_place_props, ext = sp.none).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
@@ -1329,9 +1568,9 @@ def test():
     last_item = scenario.compute(sp.as_nat(world.data.chunks[place_bob_chunk_0].next_id - 1))
 
     # can't modify all items
-    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: [
+    world.set_item_data(place_key = place_bob, ext = sp.none, update_map = {0: {sp.some(bob.address): {items_tokens_legacy.address: sp.variant("items", [
         sp.record(item_id = remove_bobs_item3, data = new_item_data)
-    ]}}} ).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
+    ])}}} ).run(sender=alice, valid=False, exception=ErrorMessages.no_permission())
 
     # Can't set props
     world.update_place(place_key=place_bob, update=valid_place_props, ext = sp.none).run(sender=alice)
@@ -1382,6 +1621,95 @@ def test():
         sp.variant("item", sp.record(amount=1, token_id=item_bob, rate=sp.tez(1), data=position, primary = False))
     ]}}}, sender=bob, valid=False, message=ErrorMessages.no_permission())
 
+    scenario.h3("Wildcard permissions")
+    scenario.verify(world.get_permissions(sp.record(place_key=place_carol, permittee=bob.address)) == TL_World_v2.permissionNone)
+
+    # carol gives bob place items permission to all her places
+    world.set_permissions([
+        sp.variant("add_wildcard", PermissionParams.make_add_wildcard(
+            owner = carol.address,
+            permittee = bob.address,
+            fa2 = places_tokens.address,
+            perm = TL_World_v2.permissionPlaceItems
+        ))
+    ]).run(sender=carol, valid=True)
+
+    scenario.verify(world.get_permissions(sp.record(place_key=place_carol, permittee=bob.address)) == TL_World_v2.permissionPlaceItems)
+    # doesn't apply to places carol doesn't own
+    scenario.verify(world.get_permissions(sp.record(place_key=place_alice, permittee=bob.address)) == TL_World_v2.permissionNone)
+
+    place_items(place_carol, {0: {False: {items_tokens_legacy.address: [
+        sp.variant("item", sp.record(amount=1, token_id=item_bob, rate=sp.tez(1), data=position, primary = False))
+    ]}}}, sender=bob, valid=True)
+
+    # can't set props
+    world.update_place(place_key=place_carol, update=valid_place_props, ext = sp.none).run(sender=bob, valid=False, exception=ErrorMessages.no_permission())
+
+    # place permissions take precedence over wildcard permissions
+    world.set_permissions([
+        sp.variant("add", PermissionParams.make_add(
+            owner = carol.address,
+            permittee = bob.address,
+            place_key = place_carol,
+            perm = TL_World_v2.permissionProps
+        ))
+    ]).run(sender=carol, valid=True)
+
+    scenario.verify(world.get_permissions(sp.record(place_key=place_carol, permittee=bob.address)) == TL_World_v2.permissionProps)
+
+    world.set_permissions([
+        sp.variant("remove", PermissionParams.make_remove(
+            owner = carol.address,
+            permittee = bob.address,
+            place_key = place_carol
+        ))
+    ]).run(sender=carol, valid=True)
+
+    scenario.verify(world.get_permissions(sp.record(place_key=place_carol, permittee=bob.address)) == TL_World_v2.permissionPlaceItems)
+
+    # invalid wildcard permissions
+    world.set_permissions([
+        sp.variant("add_wildcard", PermissionParams.make_add_wildcard(
+            owner = carol.address,
+            permittee = bob.address,
+            fa2 = places_tokens.address,
+            perm = world.data.settings.max_permission + 1
+        ))
+    ]).run(sender=carol, valid=False, exception=ErrorMessages.parameter_error())
+
+    world.set_permissions([
+        sp.variant("add_wildcard", PermissionParams.make_add_wildcard(
+            owner = carol.address,
+            permittee = bob.address,
+            fa2 = places_tokens.address,
+            perm = TL_World_v2.permissionFull
+        ))
+    ]).run(sender=bob, valid=False, exception=ErrorMessages.not_owner())
+
+    world.set_permissions([
+        sp.variant("add_wildcard", PermissionParams.make_add_wildcard(
+            owner = carol.address,
+            permittee = bob.address,
+            fa2 = items_tokens.address,
+            perm = TL_World_v2.permissionFull
+        ))
+    ]).run(sender=carol, valid=False, exception="PLACE_TOKEN_NOT_ALLOWED")
+
+    # remove wildcard permission
+    world.set_permissions([
+        sp.variant("remove_wildcard", PermissionParams.make_remove_wildcard(
+            owner = carol.address,
+            permittee = bob.address,
+            fa2 = places_tokens.address
+        ))
+    ]).run(sender=carol, valid=True)
+
+    scenario.verify(world.get_permissions(sp.record(place_key=place_carol, permittee=bob.address)) == TL_World_v2.permissionNone)
+
+    place_items(place_carol, {0: {False: {items_tokens_legacy.address: [
+        sp.variant("item", sp.record(amount=1, token_id=item_bob, rate=sp.tez(1), data=position, primary = False))
+    ]}}}, sender=bob, valid=False, message=ErrorMessages.no_permission())
+
     scenario.h3("No permission after transfer")
     # bob transfers his place to carol
     places_tokens.transfer_tokens([
@@ -1534,6 +1862,79 @@ def test():
     ).run(sender = bob, amount = sp.tez(1))
     scenario.verify(token_reciever.balance == sp.mutez(723750))
 
+    # Removing issuer and place-owned items of the same token in one call
+    # must transfer each to their own recipient.
+    place_items(place_alice, {0: {
+        False: {items_tokens_legacy.address: [
+            sp.variant("item", sp.record(amount=1, token_id=item_alice, rate=sp.tez(1), data=position, primary = False))
+        ]},
+        True: {items_tokens_legacy.address: [
+            sp.variant("item", sp.record(amount=1, token_id=item_alice, rate=sp.tez(1), data=position, primary = False))
+        ]}
+    }}, sender=alice)
+    alice_mixed_item = last_placed_item_id(place_alice_chunk_0, 2)
+    alice_mixed_place_owned_item = last_placed_item_id(place_alice_chunk_0, 1)
+
+    balance_alice_before = scenario.compute(items_tokens_legacy.get_balance(sp.record(owner=alice.address, token_id=item_alice)))
+    balance_reciever_before = scenario.compute(items_tokens_legacy.get_balance(sp.record(owner=token_reciever.address, token_id=item_alice)))
+    world.remove_items(
+        place_key = place_alice,
+        remove_map = {0: {
+            sp.some(alice.address): {items_tokens_legacy.address: sp.set([alice_mixed_item])},
+            sp.none: {items_tokens_legacy.address: sp.set([alice_mixed_place_owned_item])}
+        }},
+        ext = sp.none
+    ).run(sender = alice)
+    scenario.verify(items_tokens_legacy.get_balance(sp.record(owner=alice.address, token_id=item_alice)) == balance_alice_before + 1)
+    scenario.verify(items_tokens_legacy.get_balance(sp.record(owner=token_reciever.address, token_id=item_alice)) == balance_reciever_before + 1)
+
+    # Make sure get_items pays out value, royalties and fees.
+    # NOTE: implicit account balances can't be checked, so value_to, the royalties
+    # recipient and fees_to are all contracts.
+    scenario.h2("get_items payouts")
+    fees_reciever = TokenRecieverContract()
+    scenario += fees_reciever
+    royalties_reciever = TokenRecieverContract()
+    scenario += royalties_reciever
+
+    world.update_settings([sp.variant("fees_to", fees_reciever.address)]).run(sender = admin)
+
+    item_royalties = scenario.compute(items_tokens.data.last_token_id)
+    minter.mint_public(sp.record(
+        collection = items_tokens.address,
+        to_ = alice.address,
+        amount = 3,
+        metadata = sp.utils.bytes_of_string("test_metadata"),
+        royalties = {royalties_reciever.address: 250}
+    )).run(sender = alice)
+    items_tokens.update_operators([
+        sp.variant("add_operator", sp.record(
+            owner = alice.address,
+            operator = world.address,
+            token_id = item_royalties
+        ))
+    ]).run(sender = alice)
+
+    place_items(place_alice, {0: {True: {items_tokens.address: [
+        sp.variant("item", sp.record(amount=2, token_id=item_royalties, rate=sp.tez(1), data=position, primary = False)),
+        sp.variant("item", sp.record(amount=1, token_id=item_royalties, rate=sp.tez(2), data=position, primary = False))
+    ]}}}, sender=alice)
+    alice_payout_item0 = last_placed_item_id(place_alice_chunk_0, 2)
+    alice_payout_item1 = last_placed_item_id(place_alice_chunk_0, 1)
+
+    scenario.verify(token_reciever.balance == sp.mutez(723750))
+    scenario.verify(fees_reciever.balance == sp.mutez(0))
+    scenario.verify(royalties_reciever.balance == sp.mutez(0))
+    world.get_items(place_key = place_alice, item_map = {0: {sp.none: {items_tokens.address: {alice_payout_item0: 2, alice_payout_item1: 1}}}},
+        ext = sp.none).run(sender = bob, amount = sp.tez(4))
+    # 4 tez: 3.5% fees, 25% royalties on the rest, the remainder to value_to.
+    scenario.verify(fees_reciever.balance == sp.mutez(140000))
+    scenario.verify(royalties_reciever.balance == sp.mutez(965000))
+    scenario.verify(token_reciever.balance == sp.mutez(723750) + sp.mutez(2895000))
+    scenario.verify(world.balance == sp.mutez(0))
+
+    world.update_settings([sp.variant("fees_to", admin.address)]).run(sender = admin)
+
     #
     # Test migration
     #
@@ -1626,17 +2027,19 @@ def test():
     scenario.verify(world.data.places.get(place_carol).chunks.contains(1))
     # Check chunk 0 contents
     scenario.verify(world.data.chunks.contains(place_carol_chunk_0))
-    scenario.verify(world.data.chunks[place_carol_chunk_0].storage.contains(sp.some(bob.address)))
-    scenario.verify(world.data.chunks[place_carol_chunk_0].storage.contains(sp.some(carol.address)))
-    scenario.verify(~world.data.chunks[place_carol_chunk_0].storage.contains(sp.some(alice.address)))
-    scenario.verify(~world.data.chunks[place_carol_chunk_0].storage.contains(sp.some(admin.address)))
+    scenario.verify(world.data.chunks[place_carol_chunk_0].stores.contains(sp.some(bob.address)))
+    scenario.verify(world.data.chunks[place_carol_chunk_0].stores.contains(sp.some(carol.address)))
+    scenario.verify(~world.data.chunks[place_carol_chunk_0].stores.contains(sp.some(alice.address)))
+    scenario.verify(~world.data.chunks[place_carol_chunk_0].stores.contains(sp.some(admin.address)))
+    scenario.verify(world.data.chunks[place_carol_chunk_0].item_count == 4)
 
     # Check chunk 1 contents
     scenario.verify(world.data.chunks.contains(place_carol_chunk_1))
-    scenario.verify(~world.data.chunks[place_carol_chunk_1].storage.contains(sp.some(bob.address)))
-    scenario.verify(~world.data.chunks[place_carol_chunk_1].storage.contains(sp.some(carol.address)))
-    scenario.verify(world.data.chunks[place_carol_chunk_1].storage.contains(sp.some(alice.address)))
-    scenario.verify(world.data.chunks[place_carol_chunk_1].storage.contains(sp.some(admin.address)))
+    scenario.verify(~world.data.chunks[place_carol_chunk_1].stores.contains(sp.some(bob.address)))
+    scenario.verify(~world.data.chunks[place_carol_chunk_1].stores.contains(sp.some(carol.address)))
+    scenario.verify(world.data.chunks[place_carol_chunk_1].stores.contains(sp.some(alice.address)))
+    scenario.verify(world.data.chunks[place_carol_chunk_1].stores.contains(sp.some(admin.address)))
+    scenario.verify(world.data.chunks[place_carol_chunk_1].item_count == 4)
 
     scenario.h3("tokens in storage after migration")
     # NOTE: Migration ep doesn't actually transfer Tokens. It's expected the other side does it.
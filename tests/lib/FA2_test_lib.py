@@ -1,5 +1,7 @@
 import smartpy as sp
 
+from contracts import TL_Blacklist
+
 admin = sp.test_account("Administrator")
 admin2 = sp.test_account("Administrator2")
 alice = sp.test_account("Alice")
@@ -241,6 +243,7 @@ def test_transfers(test_name, fa2_contract):
         if c1.ledger_type == "NFT":
             sc.verify(c1.get_owner(sp.nat(0)) == alice.address)
             sc.verify(c1.get_owner(sp.nat(1)) == alice.address)
+            sc.verify_equal(c1.get_owners(sp.set([0, 1])), sp.map({0: alice.address, 1: alice.address}))
 
         # Check that the balance is interpreted as zero when the owner doesn't hold any.
         # TZIP-12: If the token owner does not hold any tokens of type token_id,
@@ -248,6 +251,9 @@ def test_transfers(test_name, fa2_contract):
         sc.verify(c1.get_balance(sp.record(owner=bob.address, token_id=0)) == 0)
         if c1.ledger_type != "SingleAsset":
             sc.verify(c1.get_balance(sp.record(owner=bob.address, token_id=1)) == 0)
+        sc.verify_equal(
+            c1.get_balances(sp.set([sp.record(owner=alice.address, token_id=0), sp.record(owner=bob.address, token_id=0)])),
+            sp.map({sp.record(owner=alice.address, token_id=0): ICO, sp.record(owner=bob.address, token_id=0): 0}))
 
         sc.h2("Zero amount transfer")
         sc.p("TZIP-12: Transfers of zero amount MUST be treated as normal transfers.")
@@ -346,6 +352,9 @@ def test_transfers(test_name, fa2_contract):
         elif c1.ledger_type == "Fungible":
             sc.verify(c1.data.ledger[(alice.address, 0)] == ICO - TX)
             sc.verify(c1.data.ledger[(bob.address, 0)] == TX)
+        elif c1.ledger_type == "FungibleGrouped":
+            sc.verify(c1.data.ledger[0][alice.address] == ICO - TX)
+            sc.verify(c1.data.ledger[0][bob.address] == TX)
         else: # SingleAsset
             sc.verify(c1.data.ledger[alice.address] == ICO - TX)
             sc.verify(c1.data.ledger[bob.address] == TX)
@@ -445,6 +454,22 @@ def test_transfers(test_name, fa2_contract):
             ]
         ).run(sender=bob, valid=False, exception="FA2_INSUFFICIENT_BALANCE")
 
+        # Repeated self-transfers aren't summed, each can transfer
+        # the whole balance.
+        c1.transfer(
+            [
+                sp.record(
+                    from_=bob.address,
+                    txs=[
+                        sp.record(to_=bob.address, amount=bob_balance, token_id=0),
+                        sp.record(to_=bob.address, amount=bob_balance, token_id=0),
+                        sp.record(to_=bob.address, amount=bob_balance, token_id=0),
+                    ],
+                ),
+            ]
+        ).run(sender=bob)
+        sc.verify(c1.get_balance(sp.record(owner=bob.address, token_id=0)) == TX)
+
         # test of FA2_TOKEN_UNDEFINED.
         sc.h2("Not defined token")
         sc.p(
@@ -475,6 +500,41 @@ def test_transfers(test_name, fa2_contract):
             ]
         ).run(sender=bob, valid=False, exception="FA2_TOKEN_UNDEFINED")
 
+        # An undefined token fails before insufficient balance, even
+        # if it comes later in the transfer.
+        c1.transfer(
+            [
+                sp.record(
+                    from_=bob.address,
+                    txs=[
+                        sp.record(to_=alice.address, amount=bob_balance + 1, token_id=0),
+                        sp.record(to_=alice.address, amount=0, token_id=4),
+                    ],
+                ),
+            ]
+        ).run(sender=bob, valid=False, exception="FA2_TOKEN_UNDEFINED")
+
+        if c1.ledger_type != "NFT":
+            sc.h2("Duplicate txs")
+            sc.p("Duplicate txs in a transfer are collapsed.")
+
+            bob_balance = sc.compute(c1.get_balance(sp.record(owner=bob.address, token_id=0)))
+            alice_balance = sc.compute(c1.get_balance(sp.record(owner=alice.address, token_id=0)))
+            c1.transfer(
+                [
+                    sp.record(
+                        from_=alice.address,
+                        txs=[
+                            sp.record(to_=bob.address, amount=1, token_id=0),
+                            sp.record(to_=bob.address, amount=2, token_id=0),
+                            sp.record(to_=bob.address, amount=0, token_id=0),
+                        ],
+                    ),
+                ]
+            ).run(sender=alice)
+            sc.verify(c1.get_balance(sp.record(owner=bob.address, token_id=0)) == bob_balance + 3)
+            sc.verify(c1.get_balance(sp.record(owner=alice.address, token_id=0)) == abs(alice_balance - 3))
+
 
 def test_balance_of(test_name, fa2_contract):
     """ " Test that balance_of entrypoint works as expected.
@@ -856,6 +916,8 @@ def test_owner_or_operator_transfer(test_name, fa2_contract):
         sc.verify(~c1.is_operator(operator_bob))
         sc.verify(c1.data.operators.contains(operator_charlie))
         sc.verify(c1.is_operator(operator_charlie))
+        sc.verify_equal(c1.are_operators(sp.set([operator_bob, operator_charlie])),
+            sp.map({operator_bob: False, operator_charlie: True}))
 
         # A removed operator lose its rights.
         sc.h2("Bob cannot transfer Alice's token 0 anymore")
@@ -933,7 +995,7 @@ def test_owner_or_operator_transfer(test_name, fa2_contract):
 # Optional features tests
 
 
-def test_optional_features(nft_contract, fungible_contract, single_asset_contract):
+def test_optional_features(nft_contract, fungible_contract, single_asset_contract, test_name="FA2_optional_interfaces"):
     """ " Test optional mixins of FA2_lib on both NFT and Fungible.
 
     Mixin tested:
@@ -947,7 +1009,6 @@ def test_optional_features(nft_contract, fungible_contract, single_asset_contrac
     - BurnNft
     - BurnFungible
     """
-    test_name = "FA2_optional_interfaces"
 
     def test_mint(sc, nft, fungible, single_asset):
         """Test `MintNft` and `MintFungible` with the `owner-or-operator-transfer` policy.
@@ -1043,6 +1104,15 @@ def test_optional_features(nft_contract, fungible_contract, single_asset_contrac
             fungible.get_balance(sp.record(owner=bob.address, token_id=1)) == 1000
         )
 
+        # Check without using get_balance because the ledger interface
+        # differs between fungible backends.
+        if fungible.ledger_type == "FungibleGrouped":
+            sc.verify(fungible.data.ledger[0][alice.address] == 2000)
+            sc.verify(sp.len(fungible.data.ledger[1]) == 2)
+        else:
+            sc.verify(fungible.data.ledger[(alice.address, 0)] == 2000)
+            sc.verify(fungible.data.ledger[(bob.address, 1)] == 1000)
+
         # Mint of a new single asset token.
         single_asset.mint(
             [
@@ -1125,6 +1195,19 @@ def test_optional_features(nft_contract, fungible_contract, single_asset_contrac
         # Check that burning doesn't remove token_metadata.
         sc.verify(fungible.data.token_metadata.contains(0))
 
+        # Burning the whole balance removes the ledger entry.
+        sc.h3("Owner burns all of his fungible tokens")
+        fungible.burn([sp.record(token_id=1, from_=bob.address, amount=1000)]).run(
+            sender=bob
+        )
+
+        sc.verify(fungible.get_balance(sp.record(owner=bob.address, token_id=1)) == 0)
+        if fungible.ledger_type == "FungibleGrouped":
+            sc.verify(~fungible.data.ledger[1].contains(bob.address))
+            sc.verify(sp.len(fungible.data.ledger[1]) == 1)
+        else:
+            sc.verify(~fungible.data.ledger.contains((bob.address, 1)))
+
         # Owner can burn NFT.
         sc.h3("Owner burns his nft tokens")
         nft.burn([sp.record(token_id=1, from_=alice.address, amount=1)]).run(
@@ -1602,6 +1685,128 @@ def test_pause(nft_contract, fungible_contract, single_asset_contract):
                 exception=("FA2_OPERATORS_UNSUPPORTED", "FA2_PAUSED"),
             )
 
+def test_blacklist(make_nft, make_fungible, make_single_asset):
+    """Test the `Blacklist` policy decorator.
+
+    Contracts are created with `make_*(blacklist_address)`, because the
+    blacklist contract has to be originated first.
+
+    - multi-transfer batches work if nobody is blacklisted.
+    - a blacklisted to_ anywhere in the batch fails the batch.
+    - a blacklisted from_ anywhere in the batch fails the batch.
+    - FA2_TOKEN_UNDEFINED is still checked before the blacklist.
+    - burn fails for a blacklisted from_.
+    - removing an address from the blacklist allows transfers again.
+    - the per-tx check falls back to checking the blacklist when no
+      batch check was done.
+    """
+    test_name = "FA2_blacklist"
+
+    @sp.add_test(name=test_name)
+    def test():
+        sc = sp.test_scenario()
+        sc.h1(test_name)
+        sc.table_of_contents()
+
+        sc.h2("Accounts")
+        sc.show([admin, alice, bob, charlie])
+
+        sc.h2("Blacklist")
+        blacklist = TL_Blacklist.TL_Blacklist(admin.address)
+        sc += blacklist
+
+        sc.h2("FA2 Contracts")
+        c1 = make_nft(blacklist.address)
+        sc += c1
+        c2 = make_fungible(blacklist.address)
+        sc += c2
+        c3 = make_single_asset(blacklist.address)
+        sc += c3
+
+        sc.h3("Mint")
+        c1.mint([sp.record(metadata=tok0_md, to_=alice.address), sp.record(metadata=tok0_md, to_=bob.address)]).run(sender=admin)
+        c2.mint(
+            [
+                sp.record(
+                    token=sp.variant("new", sp.record(metadata=tok0_md)), to_=alice.address, amount=1000
+                ),
+                sp.record(
+                    token=sp.variant("existing", 0), to_=bob.address, amount=1000
+                )
+            ]
+        ).run(sender=admin)
+        c3.mint(
+            [
+                sp.record(
+                    token=sp.variant("new", sp.record(metadata=tok0_md)), to_=alice.address, amount=1000
+                ),
+                sp.record(
+                    token=sp.variant("existing", 0), to_=bob.address, amount=1000
+                )
+            ]
+        ).run(sender=admin)
+
+        # On the nft, alice owns token 0 and bob owns token 1.
+        for contract, alice_token, bob_token, amount in [(c1, 0, 1, 1), (c2, 0, 0, 10), (c3, 0, 0, 10)]:
+            def batch(to_alice, to_bob, token_id=alice_token):
+                return [
+                    sp.record(
+                        from_=alice.address,
+                        txs=[
+                            sp.record(to_=alice.address, amount=0, token_id=alice_token),
+                            sp.record(to_=to_alice, amount=0, token_id=token_id),
+                        ],
+                    ),
+                    sp.record(
+                        from_=bob.address,
+                        txs=[
+                            sp.record(to_=bob.address, amount=0, token_id=bob_token),
+                            sp.record(to_=to_bob, amount=0, token_id=bob_token),
+                        ],
+                    ),
+                ]
+
+            sc.h2("Multi-transfer without blacklisted addresses")
+            operator_alice = sp.record(owner=bob.address, operator=alice.address, token_id=bob_token)
+            contract.update_operators([sp.variant("add_operator", operator_alice)]).run(sender=bob)
+            contract.transfer(batch(charlie.address, charlie.address)).run(sender=alice)
+            contract.transfer([
+                sp.record(from_=alice.address, txs=[sp.record(to_=charlie.address, amount=amount, token_id=alice_token)])
+            ]).run(sender=alice)
+            sc.verify(contract.get_balance(sp.record(owner=charlie.address, token_id=alice_token)) == amount)
+
+            sc.h2("Blacklist charlie")
+            blacklist.manage_blacklist([sp.variant("add", sp.set([charlie.address]))]).run(sender=admin)
+
+            sc.h3("Blacklisted to_ fails")
+            contract.transfer(batch(alice.address, charlie.address)).run(sender=alice, valid=False, exception="ADDRESS_BLACKLISTED")
+            contract.transfer(batch(charlie.address, bob.address)).run(sender=alice, valid=False, exception="ADDRESS_BLACKLISTED")
+
+            sc.h3("Blacklisted from_ fails")
+            contract.transfer([
+                sp.record(from_=alice.address, txs=[sp.record(to_=bob.address, amount=0, token_id=alice_token)]),
+                sp.record(from_=charlie.address, txs=[sp.record(to_=alice.address, amount=amount, token_id=alice_token)])
+            ]).run(sender=charlie, valid=False, exception="ADDRESS_BLACKLISTED")
+
+            sc.h3("Undefined token fails before the blacklist")
+            contract.transfer(batch(alice.address, charlie.address, token_id=5)).run(sender=alice, valid=False, exception="FA2_TOKEN_UNDEFINED")
+
+            sc.h3("Blacklisted from_ can't burn")
+            contract.burn([sp.record(token_id=alice_token, from_=charlie.address, amount=amount)]).run(sender=charlie, valid=False, exception="ADDRESS_BLACKLISTED")
+
+            sc.h3("Per-tx check without batch check")
+            contract.check_tx_transfer(sp.record(from_=alice.address, to_=charlie.address, token_id=alice_token)).run(sender=alice, valid=False, exception="ADDRESS_BLACKLISTED")
+            contract.check_tx_transfer(sp.record(from_=alice.address, to_=bob.address, token_id=alice_token)).run(sender=alice)
+
+            sc.h2("Remove charlie from blacklist")
+            blacklist.manage_blacklist([sp.variant("remove", sp.set([charlie.address]))]).run(sender=admin)
+            contract.transfer(batch(alice.address, charlie.address)).run(sender=alice)
+            contract.transfer([
+                sp.record(from_=charlie.address, txs=[sp.record(to_=alice.address, amount=amount, token_id=alice_token)])
+            ]).run(sender=charlie)
+            sc.verify(contract.get_balance(sp.record(owner=alice.address, token_id=alice_token)) == (1000 if amount == 10 else 1))
+
+
 def test_adhoc_operators(nft_contract, fungible_contract, single_asset_contract):
     """Test the `AdhocOwnerOrOperatorTransfer` policy decorator and `update_adhoc_operators`.
     """
@@ -1655,27 +1860,69 @@ def test_adhoc_operators(nft_contract, fungible_contract, single_asset_contract)
                         ),
                     ])
                 )
-            ).run(sender=alice)
+            ).run(sender=alice, level=0)
 
             # Check storage contains operators
             sc.verify(
-                contract.data.adhoc_operators.contains(contract.make_adhoc_operator_key(owner=alice.address, operator=bob.address, token_id=0))
+                contract.is_adhoc_operator(alice.address, bob.address, 0)
             )
 
             sc.verify(
-                contract.data.adhoc_operators.contains(contract.make_adhoc_operator_key(owner=alice.address, operator=admin.address, token_id=0))
+                contract.is_adhoc_operator(alice.address, admin.address, 0)
             )
 
             # Check storage doesn't containt operators in next block
             sc.verify(
-                ~sc.compute(contract.data.adhoc_operators.contains(contract.make_adhoc_operator_key(owner=alice.address, operator=bob.address, token_id=0)), level=1)
+                ~sc.compute(contract.is_adhoc_operator(alice.address, bob.address, 0), level=1)
             )
 
             sc.verify(
-                ~sc.compute(contract.data.adhoc_operators.contains(contract.make_adhoc_operator_key(owner=alice.address, operator=admin.address, token_id=0)), level=1)
+                ~sc.compute(contract.is_adhoc_operator(alice.address, admin.address, 0), level=1)
             )
 
-            sc.verify(sp.len(contract.data.adhoc_operators) == 2)
+            sc.verify(contract.data.adhoc_operators_level == 0)
+            sc.verify(sp.len(contract.data.adhoc_operators[sp.record(level=0, owner=alice.address)]) == 2)
+
+            # Other owners can add adhoc operators in the same level.
+            # The limit applies per owner.
+            contract.update_adhoc_operators(
+                sp.variant(
+                    "add_adhoc_operators",
+                    sp.set([sp.record(operator=alice.address, token_id=n) for n in range(100)])
+                )
+            ).run(sender=bob, level=0)
+
+            contract.update_adhoc_operators(
+                sp.variant(
+                    "add_adhoc_operators",
+                    sp.set([sp.record(operator=alice.address, token_id=0)])
+                )
+            ).run(sender=admin, level=0)
+
+            sc.verify(sp.len(contract.data.adhoc_operators[sp.record(level=0, owner=bob.address)]) == 100)
+            sc.verify(sp.len(contract.data.adhoc_operators[sp.record(level=0, owner=admin.address)]) == 1)
+            sc.verify(sp.len(contract.data.adhoc_operators_owners[0]) == 3)
+
+            # Only the owners bucket counts towards the limit.
+            contract.update_adhoc_operators(
+                sp.variant(
+                    "add_adhoc_operators",
+                    sp.set([sp.record(operator=alice.address, token_id=100)])
+                )
+            ).run(sender=bob, level=0, valid=False, exception="ADHOC_LIMIT")
+
+            contract.update_adhoc_operators(
+                sp.variant(
+                    "add_adhoc_operators",
+                    sp.set([sp.record(operator=bob.address, token_id=1)])
+                )
+            ).run(sender=alice, level=0)
+
+            sc.verify(sp.len(contract.data.adhoc_operators[sp.record(level=0, owner=alice.address)]) == 3)
+            sc.verify(sc.compute(contract.is_adhoc_operator(alice.address, bob.address, 0), level=0))
+            sc.verify(sc.compute(contract.is_adhoc_operator(bob.address, alice.address, 99), level=0))
+            sc.verify(sc.compute(contract.is_adhoc_operator(admin.address, alice.address, 0), level=0))
+            sc.verify(~sc.compute(contract.is_adhoc_operator(admin.address, alice.address, 1), level=0))
 
             # update adhoc operators again
             contract.update_adhoc_operators(
@@ -1697,18 +1944,25 @@ def test_adhoc_operators(nft_contract, fungible_contract, single_asset_contract)
 
             # Check storage contains operators
             sc.verify(
-                sc.compute(contract.data.adhoc_operators.contains(contract.make_adhoc_operator_key(owner=alice.address, operator=bob.address, token_id=0)), level=2)
+                sc.compute(contract.is_adhoc_operator(alice.address, bob.address, 0), level=2)
             )
 
             sc.verify(
-                sc.compute(contract.data.adhoc_operators.contains(contract.make_adhoc_operator_key(owner=alice.address, operator=alice.address, token_id=0)), level=2)
+                sc.compute(contract.is_adhoc_operator(alice.address, alice.address, 0), level=2)
             )
 
             sc.verify(
-                sc.compute(contract.data.adhoc_operators.contains(contract.make_adhoc_operator_key(owner=alice.address, operator=admin.address, token_id=0)), level=2)
+                sc.compute(contract.is_adhoc_operator(alice.address, admin.address, 0), level=2)
             )
 
-            sc.verify(sp.len(contract.data.adhoc_operators) == 3)
+            # The bucket of the previous level was removed.
+            sc.verify(contract.data.adhoc_operators_level == 2)
+            sc.verify(~contract.data.adhoc_operators.contains(sp.record(level=0, owner=alice.address)))
+            sc.verify(~contract.data.adhoc_operators.contains(sp.record(level=0, owner=bob.address)))
+            sc.verify(~contract.data.adhoc_operators.contains(sp.record(level=0, owner=admin.address)))
+            sc.verify(~contract.data.adhoc_operators_owners.contains(0))
+            sc.verify(sp.len(contract.data.adhoc_operators[sp.record(level=2, owner=alice.address)]) == 3)
+            sc.verify(sp.len(contract.data.adhoc_operators_owners[2]) == 1)
 
             # only admin can clear adhoc operators
             contract.update_adhoc_operators(
@@ -1729,7 +1983,8 @@ def test_adhoc_operators(nft_contract, fungible_contract, single_asset_contract)
                 )
             ).run(sender=admin)
 
-            sc.verify(sp.len(contract.data.adhoc_operators) == 0)
+            sc.verify(~contract.data.adhoc_operators.contains(sp.record(level=2, owner=alice.address)))
+            sc.verify(~contract.data.adhoc_operators_owners.contains(2))
 
 def test_royalties(nft_contract, fungible_contract):
     """Test the `Royalties` mixin.
@@ -1852,3 +2107,51 @@ def test_nonstandard_transfer(nft_contract):
 
         # Check storage
         # TODO: check blance in ledger
+
+def test_compressed_token_metadata(fungible_contract):
+    """Test the `CompressedTokenMetadata` mixin.
+    """
+    test_name = "FA2_compressed_token_metadata"
+
+    @sp.add_test(name=test_name)
+    def test():
+        sc = sp.test_scenario()
+        sc.h1(test_name)
+        sc.table_of_contents()
+
+        sc.h2("Accounts")
+        sc.show([admin, alice, bob])
+
+        sc.h2("FA2 Contracts")
+        c1 = fungible_contract
+        sc += c1
+
+        sc.h3("mint")
+        cid = "QmQUZJNDhYtsqGXG4pW5aJAsTAUMuWCWApUiGDTzzNAWAj"
+        c1.mint([sp.record(
+            token=sp.variant("new", sp.record(metadata={"": sp.utils.bytes_of_string("ipfs://" + cid)})),
+            to_=alice.address,
+            amount=10
+        )]).run(sender=admin)
+
+        # Only the CID is stored.
+        sc.verify(c1.data.token_metadata[0].token_info[""] == sp.utils.bytes_of_string(cid))
+
+        # The offchain view returns the full URI.
+        sc.verify_equal(
+            c1.token_metadata(0),
+            sp.record(token_id=0, token_info={"": sp.utils.bytes_of_string("ipfs://" + cid)})
+        )
+
+        sc.h3("non-ipfs metadata fails")
+        c1.mint([sp.record(
+            token=sp.variant("new", sp.record(metadata={"": sp.utils.bytes_of_string("https://example.com")})),
+            to_=alice.address,
+            amount=10
+        )]).run(sender=admin, valid=False)
+
+        c1.mint([sp.record(
+            token=sp.variant("new", sp.record(metadata={"name": sp.utils.bytes_of_string("test")})),
+            to_=alice.address,
+            amount=10
+        )]).run(sender=admin, valid=False, exception="FA2_INVALID_METADATA")
@@ -119,6 +119,41 @@ def test():
         metadata = sp.utils.bytes_of_string("test_metadata")).run(sender = alice, valid = False)
 
     minter.update_settings([sp.variant("paused", False)]).run(sender = admin)
+
+    scenario.h3("mint_public_batch")
+
+    batch_tokens = [sp.record(
+        to_ = bob.address,
+        amount = 2,
+        royalties = { bob.address: sp.nat(250) },
+        metadata = sp.utils.bytes_of_string("test_metadata")) for n in range(3)]
+
+    batch_tokens_carol = batch_tokens + [sp.record(
+        to_ = carol.address,
+        amount = 2,
+        royalties = { bob.address: sp.nat(250) },
+        metadata = sp.utils.bytes_of_string("test_metadata"))]
+
+    minter.mint_public_batch({minter.address: batch_tokens}).run(sender = bob, valid = False, exception = ErrorMessages.invalid_collection())
+
+    last_token_id = scenario.compute(items_tokens.data.last_token_id)
+    minter.mint_public_batch({items_tokens.address: batch_tokens_carol}).run(sender = bob)
+    scenario.verify(items_tokens.data.last_token_id == last_token_id + 4)
+    for n in range(3):
+        scenario.verify(items_tokens.get_balance(sp.record(owner = bob.address, token_id = last_token_id + n)) == 2)
+    scenario.verify(items_tokens.get_balance(sp.record(owner = carol.address, token_id = last_token_id + 3)) == 2)
+
+    # blacklisted recipient or sender
+    blacklist.manage_blacklist([sp.variant("add", sp.set([carol.address]))]).run(sender = admin)
+    minter.mint_public_batch({items_tokens.address: batch_tokens_carol}).run(sender = bob, valid = False, exception = "ADDRESS_BLACKLISTED")
+    minter.mint_public_batch({items_tokens.address: batch_tokens}).run(sender = carol, valid = False, exception = "ADDRESS_BLACKLISTED")
+    blacklist.manage_blacklist([sp.variant("remove", sp.set([carol.address]))]).run(sender = admin)
+
+    # paused
+    minter.update_settings([sp.variant("paused", True)]).run(sender = admin)
+    minter.mint_public_batch({items_tokens.address: batch_tokens}).run(sender = bob, valid = False, exception = "ONLY_UNPAUSED")
+    minter.update_settings([sp.variant("paused", False)]).run(sender = admin)
+
     registry.manage_collections([sp.variant("remove", sp.set([items_tokens.address]))]).run(sender = admin)
 
 
@@ -170,6 +205,28 @@ def test():
         metadata = sp.utils.bytes_of_string("test_metadata")).run(sender = alice, valid = False)
 
     minter.update_settings([sp.variant("paused", False)]).run(sender = admin)
+
+    scenario.h3("mint_private_batch")
+
+    minter.mint_private_batch({items_tokens.address: batch_tokens}).run(sender = alice, valid = False, exception = ErrorMessages.not_owner_or_collaborator())
+
+    last_token_id = scenario.compute(items_tokens.data.last_token_id)
+    minter.mint_private_batch({items_tokens.address: batch_tokens_carol}).run(sender = bob)
+    scenario.verify(items_tokens.data.last_token_id == last_token_id + 4)
+    for n in range(3):
+        scenario.verify(items_tokens.get_balance(sp.record(owner = bob.address, token_id = last_token_id + n)) == 2)
+    scenario.verify(items_tokens.get_balance(sp.record(owner = carol.address, token_id = last_token_id + 3)) == 2)
+
+    # blacklisted recipient
+    blacklist.manage_blacklist([sp.variant("add", sp.set([carol.address]))]).run(sender = admin)
+    minter.mint_private_batch({items_tokens.address: batch_tokens_carol}).run(sender = bob, valid = False, exception = "ADDRESS_BLACKLISTED")
+    blacklist.manage_blacklist([sp.variant("remove", sp.set([carol.address]))]).run(sender = admin)
+
+    # paused
+    minter.update_settings([sp.variant("paused", True)]).run(sender = admin)
+    minter.mint_private_batch({items_tokens.address: batch_tokens}).run(sender = bob, valid = False, exception = "ONLY_UNPAUSED")
+    minter.update_settings([sp.variant("paused", False)]).run(sender = admin)
+
     registry.manage_collections([sp.variant("remove", sp.set([items_tokens.address]))]).run(sender = admin)
 
     scenario.h3("update_private_metadata")
@@ -252,7 +309,7 @@ def test():
         sp.record(operator=registry.address, token_id=3),
     ]))).run(sender = alice)
 
-    scenario.verify(sp.len(items_tokens.data.adhoc_operators) == 4)
+    scenario.verify(sp.len(items_tokens.data.adhoc_operators[sp.record(level=items_tokens.data.adhoc_operators_level, owner=alice.address)]) == 4)
 
     # Invalid for anyone but admin.
     for acc in [alice, bob, admin]:
@@ -263,7 +320,8 @@ def test():
             valid = (True if acc is admin else False),
             exception = (None if acc is admin else "ONLY_ADMIN"))
 
-    scenario.verify(sp.len(items_tokens.data.adhoc_operators) == 0)
+    scenario.verify(~items_tokens.data.adhoc_operators.contains(sp.record(level=items_tokens.data.adhoc_operators_level, owner=alice.address)))
+    scenario.verify(~items_tokens.data.adhoc_operators_owners.contains(items_tokens.data.adhoc_operators_level))
 
 
     #
@@ -0,0 +1,202 @@
+import smartpy as sp
+
+from contracts import TL_Minter_v2, TL_TokenRegistry, TL_LegacyRoyalties, TL_RoyaltiesAdapter, TL_RoyaltiesAdapterLegacyAndV1, TL_World_v2, Tokens
+from contracts.upgrades import TL_World_v2_1
+
+
+class TL_World_v2_1_stale_counts(TL_World_v2_1.TL_World_v2_1):
+    """World v2.1 with an entrypoint to make item counts stale, for testing."""
+    @sp.entry_point
+    def set_item_count(self, chunk_key, item_count):
+        sp.set_type(chunk_key, TL_World_v2.chunkPlaceKeyType)
+        sp.set_type(item_count, sp.TNat)
+        self.data.chunks[chunk_key].item_count = item_count
+
+
+@sp.add_test(name = "TL_World_v2_1_tests", profile = True)
+def test():
+    admin = sp.test_account("Administrator")
+    alice = sp.test_account("Alice")
+    bob   = sp.test_account("Robert")
+    collections_key = sp.test_account("Collections")
+    scenario = sp.test_scenario()
+
+    scenario.h1("World v2.1 Tests")
+    scenario.table_of_contents()
+
+    # Let's display the accounts:
+    scenario.h1("Accounts")
+    scenario.show([admin, alice, bob])
+
+    #
+    # create all kinds of contracts for testing
+    #
+    scenario.h1("Create test env")
+    scenario.h2("Items v2")
+    items_tokens = Tokens.tz1andItems_v2(
+        metadata = sp.utils.metadata_of_url("https://example.com"),
+        admin = admin.address)
+    scenario += items_tokens
+
+    scenario.h2("Places v2")
+    places_tokens = Tokens.PlaceTokenProxyBase(
+        metadata = sp.utils.metadata_of_url("https://example.com"),
+        name="tz1and Places", description="tz1and Place FA2 Tokens (v2).",
+        blacklist = admin.address, parent = admin.address, admin = admin.address)
+    scenario += places_tokens
+
+    scenario.h2("TokenRegistry")
+    registry = TL_TokenRegistry.TL_TokenRegistry(admin.address, collections_key.public_key,
+        metadata = sp.utils.metadata_of_url("https://example.com"))
+    scenario += registry
+
+    scenario.h2("LegacyRoyalties")
+    legacy_royalties = TL_LegacyRoyalties.TL_LegacyRoyalties(admin.address,
+        metadata = sp.utils.metadata_of_url("https://example.com"))
+    scenario += legacy_royalties
+
+    scenario.h2("RoyaltiesAdapters")
+    royalties_adapter_legacy = TL_RoyaltiesAdapterLegacyAndV1.TL_RoyaltiesAdapterLegacyAndV1(
+        legacy_royalties.address)
+    scenario += royalties_adapter_legacy
+
+    royalties_adapter = TL_RoyaltiesAdapter.TL_RoyaltiesAdapter(
+        registry.address, royalties_adapter_legacy.address)
+    scenario += royalties_adapter
+
+    scenario.h2("Minter v2")
+    minter = TL_Minter_v2.TL_Minter_v2(admin.address, registry.address,
+        metadata = sp.utils.metadata_of_url("https://example.com"))
+    scenario += minter
+
+    scenario.h2("World v2.1")
+    world = TL_World_v2_1_stale_counts(admin.address, registry.address, royalties_adapter.address, False, items_tokens.address,
+        metadata = sp.utils.metadata_of_url("https://example.com"), name = "Test World", description = "A world for testing",
+        debug_asserts = True)
+    scenario += world
+
+    scenario.h2("preparation")
+    items_tokens.transfer_administrator(minter.address).run(sender = admin)
+    minter.token_administration([
+        sp.variant("accept_fa2_administrator", sp.set([items_tokens.address]))
+    ]).run(sender = admin)
+    registry.manage_collections([sp.variant("add_public", {items_tokens.address: TL_TokenRegistry.royaltiesTz1andV2})]).run(sender = admin)
+
+    world.set_allowed_place_token(sp.list([
+        sp.variant("add", {places_tokens.address: sp.record(chunk_limit = 2, chunk_item_limit = 64)})
+    ])).run(sender = admin)
+
+    minter.mint_public(sp.record(
+        collection = items_tokens.address,
+        to_ = bob.address,
+        amount = 14,
+        metadata = sp.utils.bytes_of_string("test_metadata"),
+        royalties = {bob.address: 250}
+    )).run(sender = bob)
+
+    item_bob = sp.nat(0)
+
+    places_tokens.mint([
+        sp.record(
+            to_ = bob.address,
+            metadata = {'': sp.utils.bytes_of_string("test_metadata")}
+        )
+    ]).run(sender = admin)
+
+    place_bob = sp.record(fa2 = places_tokens.address, id = sp.nat(0))
+    place_bob_chunk_0 = sp.record(place_key = place_bob, chunk_id = sp.nat(0))
+    place_bob_chunk_1 = sp.record(place_key = place_bob, chunk_id = sp.nat(1))
+
+    items_tokens.update_operators([
+        sp.variant("add_operator", sp.record(
+            owner = bob.address,
+            operator = world.address,
+            token_id = item_bob
+        ))
+    ]).run(sender = bob)
+
+    position = sp.bytes("0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF")
+
+    world.place_items(
+        place_key = place_bob,
+        place_item_map = {
+            0: {False: {items_tokens.address: [
+                sp.variant("item", sp.record(amount = 1, token_id = item_bob, rate = sp.tez(1), data = position, primary = False)) for n in range(3)
+            ]}},
+            1: {True: {items_tokens.address: [
+                sp.variant("item", sp.record(amount = 1, token_id = item_bob, rate = sp.tez(1), data = position, primary = False)) for n in range(2)
+            ]}}
+        },
+        ext = sp.none
+    ).run(sender = bob)
+
+    scenario.verify(world.data.chunks[place_bob_chunk_0].item_count == 3)
+    scenario.verify(world.data.chunks[place_bob_chunk_1].item_count == 2)
+
+    #
+    # Test recounting item counts
+    #
+    scenario.h2("recount_items")
+
+    scenario.h3("no permission")
+    for acc in [alice, bob]:
+        world.recount_items(place_bob).run(sender = acc, valid = False, exception = "ONLY_ADMIN")
+
+    scenario.h3("place must exist")
+    world.recount_items(sp.record(fa2 = places_tokens.address, id = sp.nat(1))).run(sender = admin, valid = False)
+
+    scenario.h3("stale counts are fixed")
+    world.set_item_count(chunk_key = place_bob_chunk_0, item_count = 17).run(sender = admin)
+    world.set_item_count(chunk_key = place_bob_chunk_1, item_count = 0).run(sender = admin)
+    scenario.verify(world.data.chunks[place_bob_chunk_0].item_count == 17)
+    scenario.verify(world.data.chunks[place_bob_chunk_1].item_count == 0)
+
+    prev_counter_0 = scenario.compute(world.data.chunks[place_bob_chunk_0].counter)
+    world.recount_items(place_bob).run(sender = admin)
+
+    scenario.verify(world.data.chunks[place_bob_chunk_0].item_count == 3)
+    scenario.verify(world.data.chunks[place_bob_chunk_1].item_count == 2)
+    scenario.verify(world.data.chunks[place_bob_chunk_0].counter == prev_counter_0)
+    scenario.verify(world.data.places[place_bob].chunk_seqs[0] == sp.pair(world.data.chunks[place_bob_chunk_0].counter, world.data.chunks[place_bob_chunk_0].next_id))
+    scenario.verify(world.data.places[place_bob].chunk_seqs[1] == sp.pair(world.data.chunks[place_bob_chunk_1].counter, world.data.chunks[place_bob_chunk_1].next_id))
+
+    scenario.h3("item_count stays in sync")
+    world.remove_items(
+        place_key = place_bob,
+        remove_map = {0: {sp.some(bob.address): {items_tokens.address: sp.set([0, 1])}}},
+        ext = sp.none
+    ).run(sender = bob)
+    scenario.verify(world.data.chunks[place_bob_chunk_0].item_count == 1)
+
+    world.get_item(
+        place_key = place_bob,
+        chunk_id = 1,
+        item_id = 0,
+        issuer = sp.none,
+        fa2 = items_tokens.address,
+        ext = sp.none
+    ).run(sender = alice, amount = sp.tez(1))
+    scenario.verify(world.data.chunks[place_bob_chunk_1].item_count == 1)
+
+    world.recount_items(place_bob).run(sender = admin)
+    scenario.verify(world.data.chunks[place_bob_chunk_0].item_count == 1)
+    scenario.verify(world.data.chunks[place_bob_chunk_1].item_count == 1)
+
+    #
+    # Test migration is still the v2 migration
+    #
+    scenario.h2("migration")
+
+    place_migrated = sp.record(fa2 = places_tokens.address, id = sp.nat(2))
+    migration_params = sp.record(
+        place_key = place_migrated,
+        item_map = {},
+        props = {sp.bytes("0x00"): sp.bytes("0xaabbcc")},
+        ext = sp.none)
+
+    # Not upgraded: only recieves migrations from migration_from, even for admin.
+    scenario.h3("only from migration_from")
+    world.migration(migration_params).run(sender = admin, valid = False)
+    scenario.verify(~world.data.places.contains(place_migrated))
+
+    scenario.table_of_contents()